@@ -1,33 +1,30 @@
 import os
 import random
 import string
-import requests
-import json
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "shared" / "python"))
+from nocobase_client import NocoBaseClient
+
 load_dotenv()
 
 BASE_URL = os.getenv("NOCOBASE_BASE_URL")
 API_KEY = os.getenv("NOCOBASE_API_KEY")
 
-HEADERS = {
-    "Authorization": f"Bearer {API_KEY}",
-    "Content-Type": "application/json",
-    "X-Role": "root"
-}
+CLIENT = NocoBaseClient.from_env(base_url=BASE_URL, api_key=API_KEY, role="root")
 
 def uid(length=11):
     return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
 
 def get_client(endpoint, params=None):
-    url = f"{BASE_URL}/{endpoint}".replace("//", "/")
-    resp = requests.get(url, headers=HEADERS, params=params)
+    resp = CLIENT.get(endpoint, params=params)
     resp.raise_for_status()
     return resp.json()
 
 def post_client(endpoint, data):
-    url = f"{BASE_URL}/{endpoint}".replace("//", "/")
-    resp = requests.post(url, headers=HEADERS, json=data)
+    resp = CLIENT.post(endpoint, json=data)
     if resp.status_code >= 400:
         print(f"Error POST {endpoint}: {resp.text}")
     resp.raise_for_status()
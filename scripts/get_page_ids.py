@@ -1,7 +1,11 @@
 import os
-import requests
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "shared" / "python"))
+from nocobase_client import NocoBaseClient
+
 load_dotenv()
 
 BASE_URL = os.getenv("NOCOBASE_BASE_URL")
@@ -17,14 +21,8 @@ TARGET_TITLES = [
 ]
 
 def get_routes():
-    url = f"{BASE_URL}/desktopRoutes:list?pageSize=200"
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-    resp = requests.get(url, headers=headers)
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+    with NocoBaseClient.from_env(base_url=BASE_URL, api_key=API_KEY, role="") as client:
+        return list(client.iter_records("desktopRoutes:list", page_size=200))
 
 def main():
     routes = get_routes()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Asyncio twin of ``NocoBaseClient`` for I/O-bound bulk jobs.
+
+Built on ``httpx.AsyncClient`` with the same configuration, headers and pool
+settings as the sync client (see nocobase_client.py), plus:
+  - a per-host semaphore capping in-flight requests (NOCOBASE_MAX_CONCURRENCY, default 8)
+  - the optional token-bucket rate limiter from nocobase_ratelimit.py, which can be
+    shared with other processes through NOCOBASE_RATE_LIMIT_DB
+  - the retry policy and circuit breaker from nocobase_retry.py
+  - optional per-request latency tracing from nocobase_trace.py (NOCOBASE_TRACE)
+  - optional local body validation from nocobase_validate.py (NOCOBASE_VALIDATE)
+
+Usage:
+  import asyncio
+  from nocobase_async import AsyncNocoBaseClient
+
+  async def grant_all(grants):
+      async with AsyncNocoBaseClient.from_env(role="root") as client:
+          responses = await asyncio.gather(
+              *(client.post(f"roles/{role}/resources:create", json=body) for role, body in grants)
+          )
+
+Existing sync helpers (``request_nocobase``, ``NocoBaseClient``) are unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from nocobase_client import (
+    DEFAULT_KEEPALIVE_S,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT_S,
+    encode_params,
+    env_config,
+    httpx_options,
+    list_page,
+)
+from nocobase_ratelimit import TokenBucket
+from nocobase_retry import CircuitBreaker, RetryPolicy, RetryStats
+from nocobase_trace import Tracer, tracer_from_env
+from nocobase_validate import Validator, validator_from_env
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncNocoBaseClient:
+    """Pooled asyncio client with per-host concurrency and optional rate limiting."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        role: Optional[str] = None,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        verify_ssl: bool = True,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive_s: float = DEFAULT_KEEPALIVE_S,
+        http2: bool = False,
+        extra_headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        tracer: Optional[Tracer] = None,
+        validator: Optional[Validator] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.role = role or None
+        self.timeout_s = timeout_s
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.breaker = breaker
+        self.tracer = tracer
+        self.validator = validator
+        self.stats = RetryStats()
+        if breaker is not None and breaker.stats is None:
+            breaker.stats = self.stats
+        self.max_concurrency = max(1, max_concurrency)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._http = httpx.AsyncClient(
+            **httpx_options(
+                api_key,
+                self.role,
+                extra_headers,
+                timeout_s,
+                verify_ssl,
+                max(pool_size, self.max_concurrency),
+                keepalive_s,
+                http2,
+            )
+        )
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "AsyncNocoBaseClient":
+        """Build a client from NOCOBASE_* variables; non-None keyword overrides win."""
+        config = env_config()
+        config["max_concurrency"] = int(os.getenv("NOCOBASE_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY)))
+        if "tracer" not in overrides:
+            config["tracer"] = tracer_from_env()
+        if "validator" not in overrides:
+            config["validator"] = validator_from_env(overrides.get("base_url") or config["base_url"])
+        config.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**config)
+
+    def url_for(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_concurrency)
+        return self._host_slots[host]
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> httpx.Response:
+        method = method.upper()
+        url = self.url_for(path)
+        if self.validator and json is not None and method in ("POST", "PUT", "PATCH"):
+            errors = self.validator.check(url, json)
+            if errors:
+                self.stats.record(rejected_locally=1)
+                return self.validator.rejection(method, url, errors)
+        attempt = 0
+        delay: Optional[float] = None
+        while True:
+            if self.breaker:
+                self.breaker.before_request()
+            async with self._slot(url):
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire_async()
+                self.stats.record(requests=1)
+                trace = self.tracer.start(method, url, attempt) if self.tracer else None
+                try:
+                    resp = await self._http.request(
+                        method,
+                        url,
+                        params=encode_params(params),
+                        json=json,
+                        headers=headers,
+                        timeout=timeout_s if timeout_s is not None else self.timeout_s,
+                        extensions={"trace": trace.async_hook} if trace else None,
+                    )
+                except httpx.TransportError as e:
+                    resp = None
+                    if trace:
+                        self.tracer.finish(trace, error=e)
+                    if self.breaker:
+                        self.breaker.record_failure()
+                    delay = self.retry.next_delay(attempt, delay, method, url, error=e) if self.retry else None
+                    if delay is None:
+                        raise
+            if resp is not None:
+                if trace:
+                    self.tracer.finish(trace, response=resp)
+                if self.breaker:
+                    self.breaker.record_response(resp.status_code)
+                delay = self.retry.next_delay(attempt, delay, method, url, response=resp) if self.retry else None
+                if delay is None:
+                    return resp
+                await resp.aclose()
+            # Back off outside the host slot so other requests keep flowing.
+            self.stats.record(retries=1, backoff_s=delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, json: Optional[Any] = None, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, json=json, **kwargs)
+
+    async def iter_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Async version of ``NocoBaseClient.iter_pages`` (prefetches the next page as a task)."""
+        query = {k: v for k, v in (params or {}).items() if k not in ("page", "pageSize")}
+        query["pageSize"] = page_size
+
+        async def fetch(page: int) -> Dict[str, Any]:
+            resp = await self.get(path, params={**query, "page": page})
+            resp.raise_for_status()
+            return resp.json()
+
+        upcoming: Optional[asyncio.Task] = None
+        try:
+            page = 1
+            body = await fetch(page)
+            while True:
+                data, page, has_next = list_page(body, page, page_size)
+                upcoming = asyncio.ensure_future(fetch(page + 1)) if has_next and prefetch else None
+                yield data
+                if not has_next:
+                    return
+                body = await upcoming if upcoming else await fetch(page + 1)
+                upcoming = None
+                page += 1
+        finally:
+            if upcoming is not None and not upcoming.done():
+                upcoming.cancel()
+
+    async def iter_records(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for page in self.iter_pages(path, params=params, page_size=page_size, prefetch=prefetch):
+            for record in page:
+                yield record
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+        if self.tracer:
+            self.tracer.close()
+
+    async def __aenter__(self) -> "AsyncNocoBaseClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
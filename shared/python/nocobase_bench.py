@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the Python NocoBase tooling.
+
+Runs the real tools as subprocesses against a NocoBase endpoint (the local
+stand-in from nocobase_standin.py, or a real instance) and measures each one:
+
+  configure  nocobase_configure.py on app-spec/app.yaml (all modules, collections + fields)
+  seed       nocobase_seed.py with N synthetic et_pacientes_censo rows
+  census     sync_entrega_turno.load_to_nocobase upserting the same N rows
+  export     nocobase_call.py --paginate --ndjson over et_pacientes_censo:list
+
+Per run: wall time, requests/s, records/s, p50/p95/p99 request latency (from
+the NOCOBASE_TRACE log of the subprocess), error count, peak RSS and CPU time.
+Results are appended to a JSON file keyed by git commit, so two commits can be
+compared with --compare.
+
+Usage:
+  python shared/python/nocobase_bench.py --standin --rows 1000,10000
+  python shared/python/nocobase_bench.py --standin --standin-latency-ms 5 --scenarios seed,census
+  python shared/python/nocobase_bench.py --base-url https://staging/api --api-key ... --allow-remote
+  python shared/python/nocobase_bench.py --standin --rows 1000 --compare a1b2c3d
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import yaml
+from nocobase_spec import load_ir
+from nocobase_trace import percentile
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+HERE = Path(__file__).resolve().parent
+REPO_ROOT = HERE.parent.parent
+SCENARIOS = ("configure", "seed", "census", "export")
+DEFAULT_RESULTS = REPO_ROOT / ".bench" / "nocobase-bench.json"
+CENSUS_COLLECTION = "et_pacientes_censo"
+
+SALAS = ["MQ1-A", "MQ1-B", "MQ2-A", "MQ2-B", "UCI", "UTI", "PED-A", "GIN-B"]
+ESPECIALIDADES = ["Medicina Interna", "Cirugia General", "Traumatologia", "Pediatria", "Ginecologia"]
+NOMBRES = ["Juan", "Maria", "Pedro", "Ana", "Luis", "Carmen", "Jose", "Rosa", "Diego", "Elena"]
+APELLIDOS = ["Perez", "Gonzalez", "Rodriguez", "Soto", "Munoz", "Rojas", "Diaz", "Castro", "Lopez", "Silva"]
+
+
+def census_rows(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """N deterministic ALMA-shaped census rows (the input of sync_entrega_turno.transform_paciente)."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    rows = []
+    for i in range(n):
+        sala = rng.choice(SALAS)
+        rows.append({
+            "id_episodio": f"BENCH-{i:07d}",
+            "rut": f"{rng.randint(5_000_000, 25_000_000)}-{rng.choice('0123456789K')}",
+            "nro_ficha": f"F-{i:07d}",
+            "nombre": f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+            "edad": rng.randint(0, 99),
+            "sexo": rng.choice("MF"),
+            "sala": sala,
+            "cama": str(rng.randint(100, 399)),
+            "medico_tratante": f"Dr. {rng.choice(NOMBRES)} {rng.choice(APELLIDOS)}",
+            "especialidad": rng.choice(ESPECIALIDADES),
+            "f_ingreso": (start + timedelta(minutes=rng.randint(0, 60 * 24 * 60))).isoformat(),
+            "dx_principal": "Diagnostico de prueba",
+            "servicio_codigo": sala.split("-")[0],
+        })
+    return rows
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_standin(args: argparse.Namespace) -> subprocess.Popen:
+    port = free_port()
+    cmd = [
+        sys.executable, str(HERE / "nocobase_standin.py"), "--port", str(port),
+        "--latency-ms", str(args.standin_latency_ms), "--error-rate", str(args.standin_error_rate),
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    args.base_url = f"http://127.0.0.1:{port}/api"
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/__standin/stats", timeout=1)
+            return proc
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("stand-in server did not start")
+
+
+def watch_hwm(pid: int, peak_kb: List[int]) -> None:
+    """Poll VmHWM of a running process (Linux).
+
+    ru_maxrss from wait4 is not used on Linux because a forked child inherits the
+    parent's high-water mark, which would charge the harness's memory to the tool.
+    """
+    status_path = f"/proc/{pid}/status"
+    while True:
+        try:
+            with open(status_path, "r", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        peak_kb[0] = max(peak_kb[0], int(line.split()[1]))
+                        break
+                else:
+                    return  # zombie: memory already released
+        except (OSError, ValueError):
+            return
+        time.sleep(0.05)
+
+
+def rusage_rss_mb(usage: Any) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_measured(cmd: List[str], env: Dict[str, str], trace_log: Path) -> Dict[str, Any]:
+    """Run one scenario subprocess; return wall/CPU/RSS plus latency figures from its trace log."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    peak_kb = [0]
+    watcher = threading.Thread(target=watch_hwm, args=(proc.pid, peak_kb), daemon=True)
+    watcher.start()
+    stderr_tail = b""
+    assert proc.stderr is not None
+    for chunk in iter(lambda: proc.stderr.read(65536), b""):
+        stderr_tail = (stderr_tail + chunk)[-4000:]
+    _, status, usage = os.wait4(proc.pid, 0)
+    watcher.join()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall_s = time.perf_counter() - started
+
+    latencies: List[float] = []
+    errors = 0
+    if trace_log.exists():
+        with open(trace_log, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                latencies.append(record["total_ms"])
+                if "error" in record or (record.get("status") or 0) >= 400:
+                    errors += 1
+    latencies.sort()
+    result: Dict[str, Any] = {
+        "exit_code": proc.returncode,
+        "wall_s": round(wall_s, 3),
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / wall_s, 1) if wall_s > 0 else None,
+        "errors": errors,
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 3),
+        "peak_rss_mb": round(peak_kb[0] / 1024, 1) if peak_kb[0] else rusage_rss_mb(usage),
+    }
+    for pct in (50, 95, 99):
+        result[f"p{pct}_ms"] = round(percentile(latencies, pct), 2) if latencies else None
+    if proc.returncode != 0:
+        result["stderr_tail"] = stderr_tail.decode("utf-8", "replace")
+    return result
+
+
+def scenario_command(name: str, args: argparse.Namespace, rows: int, workdir: Path) -> tuple:
+    """(argv, records processed) for one scenario."""
+    if name == "configure":
+        collections = load_ir(str(REPO_ROOT / "app-spec" / "app.yaml"))["collections"].values()
+        records = sum(1 + len(c["fields"]) for c in collections)
+        # --full: the stand-in is reset between runs, so the deploy state must not skip anything
+        return [sys.executable, str(HERE / "nocobase_configure.py"), "--full"], records
+    if name == "seed":
+        spec = workdir / "seed.yaml"
+        if not spec.exists():
+            subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), "--worker", "seed-spec", "--rows", str(rows),
+                 "--spec-out", str(spec)],
+                check=True,
+            )
+        return [sys.executable, str(HERE / "nocobase_seed.py"), "--spec", str(spec)], rows
+    if name == "census":
+        return [sys.executable, str(Path(__file__).resolve()), "--worker", "census", "--rows", str(rows)], rows
+    if name == "export":
+        base = args.base_url.rstrip("/")
+        root = base[: -len("/api")] if base.endswith("/api") else base
+        return [
+            sys.executable, str(HERE / "nocobase_call.py"), "--base-url", root, "--method", "GET",
+            "--path", f"/api/{CENSUS_COLLECTION}:list", "--paginate", "--ndjson",
+            "--page-size", str(args.page_size), "--output", os.devnull,
+        ], rows
+    raise ValueError(name)
+
+
+def seed_spec_worker(rows: int, out: str) -> int:
+    """Write the seed scenario's spec: the census rows as sync_entrega_turno would load them."""
+    sys.path.insert(0, str(REPO_ROOT / "shared" / "scripts"))
+    from sync_entrega_turno import transform_paciente
+
+    with open(out, "w", encoding="utf-8") as f:
+        yaml.safe_dump({"seed": {CENSUS_COLLECTION: [transform_paciente(r) for r in census_rows(rows)]}}, f)
+    return 0
+
+
+def census_worker(rows: int) -> int:
+    """Subprocess body of the census scenario: the production upsert path on synthetic rows."""
+    sys.path.insert(0, str(REPO_ROOT / "shared" / "scripts"))
+    import sync_entrega_turno as sync
+
+    client = sync.NocoBaseClient(os.environ["NOCOBASE_BASE_URL"], os.environ["NOCOBASE_API_KEY"])
+    try:
+        pacientes = [sync.transform_paciente(r) for r in census_rows(rows)]
+        _, _, errors = sync.load_to_nocobase(client, pacientes)
+    finally:
+        client.close()
+    return 0 if errors == 0 else 1
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def print_table(runs: List[Dict[str, Any]], baseline: Optional[Dict[tuple, Dict[str, Any]]] = None) -> None:
+    header = f"{'scenario':<10} {'rows':>7} {'wall_s':>8} {'req/s':>8} {'rec/s':>9} {'p95_ms':>8} {'rss_mb':>7} {'cpu_s':>7} {'err':>4}"
+    if baseline is not None:
+        header += f" {'rec/s vs base':>14} {'p95 vs base':>12}"
+    print(header)
+    print("-" * len(header))
+    for run in runs:
+        line = (
+            f"{run['scenario']:<10} {run['rows']:>7} {run['wall_s']:>8.2f} {run['requests_per_s'] or 0:>8.1f} "
+            f"{run['records_per_s'] or 0:>9.1f} {run['p95_ms'] or 0:>8.2f} {run['peak_rss_mb']:>7.1f} "
+            f"{run['cpu_s']:>7.2f} {run['errors']:>4}"
+        )
+        if baseline is not None:
+            base = baseline.get((run["scenario"], run["rows"]))
+            if base and base.get("records_per_s") and run.get("records_per_s"):
+                line += f" {run['records_per_s'] / base['records_per_s']:>13.2f}x"
+            else:
+                line += f" {'-':>14}"
+            if base and base.get("p95_ms") and run.get("p95_ms"):
+                line += f" {run['p95_ms'] / base['p95_ms']:>11.2f}x"
+            else:
+                line += f" {'-':>12}"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Python NocoBase tooling")
+    parser.add_argument("--base-url", default=os.getenv("NOCOBASE_BASE_URL", "").strip(), help="e.g. https://my-nocobase/api")
+    parser.add_argument("--api-key", default=os.getenv("NOCOBASE_API_KEY", "").strip())
+    parser.add_argument("--standin", action="store_true", help="Start a local stand-in server and benchmark against it")
+    parser.add_argument("--standin-latency-ms", type=float, default=0.0)
+    parser.add_argument("--standin-error-rate", type=float, default=0.0)
+    parser.add_argument("--allow-remote", action="store_true", help="Allow writing benchmark data to --base-url")
+    parser.add_argument("--rows", default="1000", help="Comma-separated census dataset sizes, e.g. 1000,10000,100000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--page-size", type=int, default=200, help="Page size for the export scenario")
+    parser.add_argument("--results", default=str(DEFAULT_RESULTS), help="JSON file of results keyed by git commit")
+    parser.add_argument("--compare", metavar="COMMIT", help="Show ratios against the last run stored for COMMIT")
+    parser.add_argument("--worker", choices=["census", "seed-spec"], help=argparse.SUPPRESS)
+    parser.add_argument("--spec-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.rows.split(",") if s.strip()]
+    if args.worker == "census":
+        return census_worker(sizes[0])
+    if args.worker == "seed-spec":
+        return seed_spec_worker(sizes[0], args.spec_out)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        print(f"ERROR: unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if not args.standin:
+        if not args.base_url:
+            print("ERROR: missing --base-url (or NOCOBASE_BASE_URL), or use --standin.", file=sys.stderr)
+            return 2
+        if not args.allow_remote:
+            print(f"ERROR: refusing to write benchmark data to {args.base_url} without --allow-remote.", file=sys.stderr)
+            return 2
+
+    results_path = Path(args.results)
+    results = load_results(results_path)
+    baseline: Optional[Dict[tuple, Dict[str, Any]]] = None
+    if args.compare:
+        matches = [k for k in results if k == args.compare or k.startswith(args.compare)]
+        if not matches:
+            print(f"ERROR: no stored results for {args.compare} in {results_path}", file=sys.stderr)
+            return 2
+        baseline = {(r["scenario"], r["rows"]): r for r in results[matches[0]]["runs"]}
+
+    standin = start_standin(args) if args.standin else None
+    commit = git_commit()
+    runs: List[Dict[str, Any]] = []
+    try:
+        for rows in sizes:
+            if standin is not None:
+                httpx.post(args.base_url[: -len("/api")] + "/__standin/reset", timeout=30)
+            with tempfile.TemporaryDirectory(prefix="nocobase-bench-") as tmp:
+                workdir = Path(tmp)
+                for name in scenarios:
+                    cmd, records = scenario_command(name, args, rows, workdir)
+                    trace_log = workdir / f"{name}.trace.log"
+                    env = {
+                        **os.environ,
+                        "NOCOBASE_BASE_URL": args.base_url,
+                        "NOCOBASE_API_KEY": args.api_key or "bench",
+                        "NOCOBASE_TRACE": "true",
+                        "NOCOBASE_TRACE_LOG": str(trace_log),
+                        "NOCOBASE_TRACE_REPORT": str(workdir / f"{name}.report.json"),
+                        "NOCOBASE_CACHE_DB": "",
+                    }
+                    print(f">> {name} ({rows} rows)...", file=sys.stderr)
+                    run = {"scenario": name, "rows": rows, "records": records, **run_measured(cmd, env, trace_log)}
+                    run["records_per_s"] = round(records / run["wall_s"], 1) if run["wall_s"] > 0 else None
+                    if run["exit_code"] != 0:
+                        print(f"   exit code {run['exit_code']}:\n{run.get('stderr_tail', '')}", file=sys.stderr)
+                    runs.append(run)
+    finally:
+        if standin is not None:
+            standin.terminate()
+            standin.wait()
+
+    print_table(runs, baseline)
+    entry = results.setdefault(commit, {"runs": []})
+    entry["runs"] = [r for r in entry["runs"] if (r["scenario"], r["rows"]) not in {(x["scenario"], x["rows"]) for x in runs}]
+    entry["runs"].extend(runs)
+    entry["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    entry["target"] = "standin" if args.standin else args.base_url
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults for {commit} saved to {results_path}", file=sys.stderr)
+    return 0 if all(r["exit_code"] == 0 for r in runs) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Opt-in on-disk response cache for read-only NocoBase metadata calls.
+
+Only GET requests to slowly-changing metadata endpoints are cached:
+  collections:list, collections/{name}/fields:list, desktopRoutes:list,
+  uiSchemas:getProperties/{uid}, uiSchemas:getJsonSchema/{uid},
+  roles/{role}/resources:list, swagger:get
+
+Entries are keyed by method, URL, role and query params, and stored in SQLite with
+a per-endpoint TTL. When the server sent ETag/Last-Modified, a stale entry is
+revalidated with If-None-Match/If-Modified-Since and a 304 refreshes it without
+re-downloading. The cache is trimmed least-recently-used first once it grows past
+its size limit. A successful write (create/update/destroy/...) through the same
+client drops cached entries for that resource.
+
+Configuration (read by ``cache_from_env``):
+  NOCOBASE_CACHE_DB      SQLite file; caching is off when unset
+  NOCOBASE_CACHE_MAX_MB  Size limit before LRU eviction (default 64)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+# (pattern on the URL path, TTL seconds); first match wins
+DEFAULT_TTLS: List[Tuple[str, float]] = [
+    (r"/swagger:get$", 3600),
+    (r"/uiSchemas:(getProperties|getJsonSchema)/[^/]+$", 600),
+    (r"/collections:list$", 300),
+    (r"/collections/[^/]+/fields:list$", 300),
+    (r"/desktopRoutes:list$", 300),
+    (r"/roles/[^/]+/resources:list$", 300),
+]
+READ_ACTIONS = {"list", "get", "getProperties", "getJsonSchema"}
+
+
+def resource_root(url: str) -> str:
+    """First path segment of the Resource:Action part, e.g. 'collections' for '/api/collections/x/fields:create'."""
+    path = urlsplit(url).path
+    resource = path.rsplit(":", 1)[0] if ":" in path else path
+    segments = [s for s in resource.split("/") if s and s != "api"]
+    return segments[0] if segments else ""
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Optional[List[Tuple[str, float]]] = None,
+        refresh: bool = False,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(p), ttl) for p, ttl in (ttls if ttls is not None else DEFAULT_TTLS)]
+        # refresh=True skips cached reads but still stores fresh responses
+        self.refresh = refresh
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL, body BLOB NOT NULL, etag TEXT, last_modified TEXT,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def ttl_for(self, method: str, url: str) -> Optional[float]:
+        if method != "GET":
+            return None
+        path = urlsplit(url).path
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return None
+
+    @staticmethod
+    def key_for(method: str, url: str, role: Optional[str], params: Optional[Dict[str, Any]]) -> str:
+        material = json.dumps([method, url, role or "", sorted((params or {}).items())], default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        url, status, headers, body, etag, last_modified, expires_at = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": time.time() < expires_at,
+        }
+
+    def store(self, key: str, resp: httpx.Response, ttl: float) -> None:
+        body = resp.content
+        headers = {k: v for k, v in resp.headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, status, headers, body, etag, last_modified, expires_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    str(resp.request.url),
+                    resp.status_code,
+                    json.dumps(headers),
+                    body,
+                    resp.headers.get("ETag"),
+                    resp.headers.get("Last-Modified"),
+                    now + ttl,
+                    now,
+                    len(body),
+                ),
+            )
+            self._evict()
+
+    def touch(self, key: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?", (now + ttl, now, key)
+            )
+
+    def invalidate(self, url: str) -> None:
+        root = resource_root(url)
+        if not root:
+            return
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM responses WHERE url LIKE ? OR url LIKE ?", (f"%/{root}:%", f"%/{root}/%")
+            )
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def summary(self) -> str:
+        return f"cache {self.hits} hit(s), {self.revalidated} revalidated, {self.misses} miss(es)"
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def cached_response(entry: Dict[str, Any], method: str, label: str) -> httpx.Response:
+    """Rebuild an httpx.Response from a cache entry, tagged with an X-Cache header."""
+    headers = dict(entry["headers"])
+    headers["X-Cache"] = label
+    return httpx.Response(
+        entry["status"],
+        headers=headers,
+        content=entry["body"],
+        request=httpx.Request(method, entry["url"]),
+    )
+
+
+def cache_from_env() -> Optional[ResponseCache]:
+    path = os.getenv("NOCOBASE_CACHE_DB", "").strip()
+    if not path:
+        return None
+    max_mb = float(os.getenv("NOCOBASE_CACHE_MAX_MB", "64"))
+    return ResponseCache(path, max_bytes=int(max_mb * 1024 * 1024))
@@ -13,6 +13,40 @@ Optional:
   X-Role: <roleName>
 
 This script is intentionally generic: pass the API path (starting with /api/...).
+
+Batch mode:
+  --batch FILE|-  reads one JSON request descriptor per line
+                  {"method": "GET", "path": "/api/todos:list", "params": {...},
+                   "body": {...}, "headers": {...}, "id": "optional-tag"}
+  and writes one JSON result line per request
+                  {"line": 1, "id": ..., "method": ..., "path": ..., "status": 200,
+                   "ok": true, "latency_ms": 12.3, "body": {...}}
+  Requests share one connection pool and run --concurrency at a time.
+  Results are written in input order, or as they complete with --unordered.
+
+Pagination:
+  --paginate follows meta.page/totalPage on a :list path and streams every record;
+  with --ndjson each record is written as one JSON line (otherwise as a JSON array).
+  Memory use stays constant regardless of collection size.
+
+Caching:
+  With NOCOBASE_CACHE_DB set, read-only metadata GETs (collections:list,
+  desktopRoutes:list, uiSchemas:getProperties, roles/*/resources:list, swagger:get)
+  are served from a local SQLite cache (see nocobase_cache.py).
+  --no-cache bypasses it, --refresh re-fetches and overwrites cached entries.
+
+Streaming output:
+  Single responses are streamed: records of the `data` array are decoded and
+  written one at a time, so peak memory does not grow with the response size.
+  --ndjson   one record per line
+  --raw      copy the response bytes unchanged
+  --output   write to FILE (chunked) instead of stdout; the status line goes to stderr
+
+Tracing:
+  --trace [REPORT] times every request (DNS, connect, TLS, TTFB, download, sizes),
+  appends one JSON line per request to .claude/logs/nocobase-trace-YYYYMMDD.log
+  and prints p50/p95/p99 and throughput per endpoint as JSON to stderr, or writes
+  it to REPORT (see nocobase_trace.py).
 """
 
 from __future__ import annotations
@@ -21,9 +55,16 @@ import argparse
 import json
 import os
 import sys
-from typing import Any, Dict, Optional, Tuple
-from urllib.parse import urlencode, urljoin
-import requests
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlencode
+
+from nocobase_client import DEFAULT_PAGE_SIZE, DEFAULT_POOL_SIZE, NocoBaseClient, encode_params
+from nocobase_stream import iter_data_records, iter_events, write_pretty
+from nocobase_trace import tracer_from_env
 
 try:
     from dotenv import load_dotenv
@@ -31,6 +72,8 @@ try:
 except ImportError:
     pass
 
+STREAM_CHUNK_BYTES = 64 * 1024
+
 
 def str_to_bool(s: str) -> bool:
     return s.strip().lower() in ("1", "true", "yes", "y", "on")
@@ -81,6 +124,12 @@ def build_headers(api_key: str, role: Optional[str] = None, extra: Optional[Dict
     return headers
 
 
+@lru_cache(maxsize=None)
+def _pooled_client(verify_ssl: bool) -> NocoBaseClient:
+    # Headers are passed per call, so one pool per SSL mode serves every caller.
+    return NocoBaseClient.from_env(base_url="", api_key="", role="", verify_ssl=verify_ssl)
+
+
 def request_nocobase(
     method: str,
     url: str,
@@ -88,15 +137,10 @@ def request_nocobase(
     body: Optional[Any],
     timeout_s: int,
     verify_ssl: bool,
+    client: Optional[NocoBaseClient] = None,
 ) -> Tuple[int, str, Dict[str, Any]]:
-    resp = requests.request(
-        method=method.upper(),
-        url=url,
-        headers=headers,
-        json=body,
-        timeout=timeout_s,
-        verify=verify_ssl,
-    )
+    client = client or _pooled_client(verify_ssl)
+    resp = client.request(method, url, headers=headers, json=body, timeout_s=timeout_s)
     content_type = resp.headers.get("Content-Type", "")
     parsed: Dict[str, Any] = {}
     if "application/json" in content_type:
@@ -109,13 +153,253 @@ def request_nocobase(
     return resp.status_code, content_type, parsed
 
 
+def read_batch_lines(stream: IO[str]) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, text) for every non-blank line of a JSONL stream."""
+    for lineno, line in enumerate(stream, start=1):
+        if line.strip():
+            yield lineno, line
+
+
+def execute_descriptor(
+    client: NocoBaseClient,
+    base_url: str,
+    api_key: str,
+    role: Optional[str],
+    timeout_s: int,
+    verify_ssl: bool,
+    lineno: int,
+    text: str,
+) -> Dict[str, Any]:
+    """Run one batch descriptor line and build its JSONL result record."""
+    result: Dict[str, Any] = {"line": lineno}
+    started = time.perf_counter()
+    try:
+        desc = json.loads(text)
+        if not isinstance(desc, dict) or not desc.get("path"):
+            raise ValueError("descriptor must be an object with at least a 'path'")
+        method = str(desc.get("method", "GET")).upper()
+        result.update({"id": desc.get("id"), "method": method, "path": desc["path"]})
+        url = build_url(base_url, desc["path"], encode_params(desc.get("params")) or {})
+        headers = build_headers(api_key=api_key, role=role, extra=desc.get("headers"))
+        status, _, parsed = request_nocobase(
+            method=method,
+            url=url,
+            headers=headers,
+            body=desc.get("body"),
+            timeout_s=timeout_s,
+            verify_ssl=verify_ssl,
+            client=client,
+        )
+        result.update({"status": status, "ok": 200 <= status < 300, "body": parsed})
+    except Exception as e:
+        result.update({"status": None, "ok": False, "error": str(e)})
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def run_batch(
+    execute: Callable[[int, str], Dict[str, Any]],
+    lines: Iterable[Tuple[int, str]],
+    concurrency: int,
+    ordered: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Run descriptors on a bounded worker pool, yielding results as they become emittable.
+
+    At most ``4 * concurrency`` descriptors are in flight or buffered at once, so
+    memory stays flat for arbitrarily long inputs. In ordered mode a slow request
+    holds back later results (up to that window) but never reorders them.
+    """
+    window = max(1, concurrency) * 4
+    source = enumerate(lines)
+    pending: set = set()
+    ready: Dict[int, Dict[str, Any]] = {}
+    next_out = 0
+    exhausted = False
+
+    def task(seq: int, lineno: int, text: str) -> Tuple[int, Dict[str, Any]]:
+        return seq, execute(lineno, text)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        while True:
+            while not exhausted and len(pending) + len(ready) < window:
+                item = next(source, None)
+                if item is None:
+                    exhausted = True
+                    break
+                seq, (lineno, text) = item
+                pending.add(pool.submit(task, seq, lineno, text))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                seq, result = fut.result()
+                if ordered:
+                    ready[seq] = result
+                else:
+                    yield result
+            while next_out in ready:
+                yield ready.pop(next_out)
+                next_out += 1
+
+
+def open_client(args: argparse.Namespace, role: Optional[str], verify_ssl: bool, **overrides: Any) -> NocoBaseClient:
+    """Pooled client for this invocation, honoring --no-cache/--refresh/--trace."""
+    if args.no_cache:
+        overrides["cache"] = None
+    if args.trace:
+        overrides["tracer"] = tracer_from_env(force=True, report_path=args.trace)
+    client = NocoBaseClient.from_env(
+        base_url=args.base_url, api_key=args.api_key, role=role, verify_ssl=verify_ssl, **overrides
+    )
+    if client.cache and args.refresh:
+        client.cache.refresh = True
+    return client
+
+
+@contextmanager
+def open_input(path: str) -> Iterator[IO[str]]:
+    """stdin for "-", else FILE opened as UTF-8 text."""
+    if path == "-":
+        yield sys.stdin
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield f
+
+
+def main_batch(args: argparse.Namespace, role: Optional[str], verify_ssl: bool) -> int:
+    with open_input(args.batch) as stream:
+        if args.dry_run:
+            for lineno, text in read_batch_lines(stream):
+                try:
+                    desc = json.loads(text)
+                    url = build_url(args.base_url, desc["path"], encode_params(desc.get("params")) or {})
+                    print(json.dumps({"line": lineno, "method": str(desc.get("method", "GET")).upper(), "url": url}))
+                except Exception as e:
+                    print(json.dumps({"line": lineno, "error": str(e)}))
+            return 0
+
+        pool_size = max(args.concurrency, int(os.getenv("NOCOBASE_POOL_SIZE", str(DEFAULT_POOL_SIZE))))
+        failures = 0
+        with open_client(args, role, verify_ssl, pool_size=pool_size) as client:
+
+            def execute(lineno: int, text: str) -> Dict[str, Any]:
+                return execute_descriptor(
+                    client, args.base_url, args.api_key, role, args.timeout, verify_ssl, lineno, text
+                )
+
+            for result in run_batch(execute, read_batch_lines(stream), args.concurrency, ordered=not args.unordered):
+                if not result["ok"]:
+                    failures += 1
+                sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+        print(f"HTTP: {client.stats.summary()}", file=sys.stderr)
+        return 0 if failures == 0 else 1
+
+
+def write_records(records: Iterable[Dict[str, Any]], ndjson: bool, out: IO[str]) -> int:
+    """Stream records as NDJSON or as a JSON array without materializing them; returns the count."""
+    count = 0
+    if not ndjson:
+        out.write("[")
+    for record in records:
+        line = json.dumps(record, ensure_ascii=False)
+        if ndjson:
+            out.write(line + "\n")
+        else:
+            out.write(("\n  " if count == 0 else ",\n  ") + line)
+        count += 1
+    if not ndjson:
+        out.write("\n]\n" if count else "]\n")
+    out.flush()
+    return count
+
+
+@contextmanager
+def open_output(path: Optional[str], binary: bool = False) -> Iterator[IO[Any]]:
+    """stdout, or FILE opened with a chunk-sized write buffer."""
+    if not path or path == "-":
+        out = sys.stdout.buffer if binary else sys.stdout
+        yield out
+        out.flush()
+        return
+    if binary:
+        with open(path, "wb", buffering=STREAM_CHUNK_BYTES) as f:
+            yield f
+    else:
+        with open(path, "w", encoding="utf-8", buffering=STREAM_CHUNK_BYTES) as f:
+            yield f
+
+
+def main_single(
+    args: argparse.Namespace,
+    url: str,
+    headers: Dict[str, str],
+    body: Optional[Any],
+    role: Optional[str],
+    verify_ssl: bool,
+) -> int:
+    """One request whose response is written as it arrives, never held whole in memory."""
+    with open_client(args, role, verify_ssl) as client, client.stream(
+        args.method, url, headers=headers, json=body, timeout_s=args.timeout
+    ) as resp:
+        status = resp.status_code
+        content_type = resp.headers.get("Content-Type", "")
+        status_line = f"HTTP {status} ({content_type})"
+        # The status line goes to stdout only in the default, human-readable mode.
+        print(status_line, file=sys.stderr if args.raw or args.ndjson or args.output else sys.stdout)
+        try:
+            if args.raw:
+                with open_output(args.output, binary=True) as out:
+                    for chunk in resp.iter_bytes(STREAM_CHUNK_BYTES):
+                        out.write(chunk)
+            elif "application/json" not in content_type:
+                with open_output(args.output) as out:
+                    resp.read()
+                    out.write(json.dumps({"_raw": resp.text}, indent=2) + "\n")
+            else:
+                events = iter_events(resp.iter_text(STREAM_CHUNK_BYTES))
+                with open_output(args.output) as out:
+                    if args.ndjson:
+                        write_records(iter_data_records(events), ndjson=True, out=out)
+                    else:
+                        write_pretty(events, out)
+        except ValueError as e:
+            print(f"ERROR: could not decode response body: {e}", file=sys.stderr)
+            return 1
+
+    if client.cache:
+        print(client.cache.summary(), file=sys.stderr)
+    return 0 if 200 <= status < 300 else 1
+
+
+def main_paginate(
+    args: argparse.Namespace,
+    params: Dict[str, str],
+    extra_headers: Dict[str, str],
+    role: Optional[str],
+    verify_ssl: bool,
+) -> int:
+    with open_client(args, role, verify_ssl, timeout_s=args.timeout, extra_headers=extra_headers) as client:
+        url = build_url(args.base_url, args.path, {})
+        try:
+            with open_output(args.output) as out:
+                count = write_records(
+                    client.iter_records(url, params=params, page_size=args.page_size), args.ndjson, out
+                )
+        except Exception as e:
+            print(f"ERROR: pagination stopped: {e}", file=sys.stderr)
+            return 1
+    print(f"{count} record(s); HTTP: {client.stats.summary()}", file=sys.stderr)
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--base-url", default=os.getenv("NOCOBASE_BASE_URL", "").strip(), help="e.g., https://my-nocobase")
     parser.add_argument("--api-key", default=os.getenv("NOCOBASE_API_KEY", "").strip(), help="API key (Bearer token)")
     parser.add_argument("--role", default=os.getenv("NOCOBASE_ROLE", "").strip(), help="Optional X-Role header value")
-    parser.add_argument("--method", required=True, help="GET|POST|PUT|PATCH|DELETE")
-    parser.add_argument("--path", required=True, help="API path, e.g. /api/todos:list")
+    parser.add_argument("--method", help="GET|POST|PUT|PATCH|DELETE")
+    parser.add_argument("--path", help="API path, e.g. /api/todos:list")
     parser.add_argument("--param", action="append", help="Query param as key=value (repeatable)")
     parser.add_argument("--header", action="append", help="Extra header as key=value (repeatable)")
     parser.add_argument("--json", dest="json_inline", help="Inline JSON string body")
@@ -123,6 +407,20 @@ def main() -> int:
     parser.add_argument("--timeout", type=int, default=int(os.getenv("NOCOBASE_TIMEOUT_SECONDS", "30")), help="Request timeout seconds")
     parser.add_argument("--verify-ssl", default=os.getenv("NOCOBASE_VERIFY_SSL", "true"))
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--batch", help="JSONL file of request descriptors ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max in-flight requests in --batch mode")
+    parser.add_argument("--unordered", action="store_true", help="In --batch mode, emit results as they complete")
+    parser.add_argument("--paginate", action="store_true", help="Follow meta.totalPage on a :list path and stream all records")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Page size for --paginate")
+    parser.add_argument("--ndjson", action="store_true", help="Write records as one JSON object per line")
+    parser.add_argument("--raw", action="store_true", help="Copy the response body to the output byte for byte")
+    parser.add_argument("--output", metavar="FILE", help="Write the response to FILE instead of stdout")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the metadata response cache (NOCOBASE_CACHE_DB)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached metadata but store the fresh responses")
+    parser.add_argument(
+        "--trace", nargs="?", const="-", metavar="REPORT",
+        help="Time every request and print per-endpoint percentiles as JSON (to stderr, or to REPORT)",
+    )
     args = parser.parse_args()
 
     if not args.base_url:
@@ -132,6 +430,12 @@ def main() -> int:
         print("ERROR: missing --api-key (or NOCOBASE_API_KEY).", file=sys.stderr)
         return 2
 
+    if args.batch:
+        return main_batch(args, role=args.role or None, verify_ssl=str_to_bool(args.verify_ssl))
+    if not args.method or not args.path:
+        print("ERROR: --method and --path are required (or use --batch).", file=sys.stderr)
+        return 2
+
     params = parse_kv_list(args.param)
     extra_headers = parse_kv_list(args.header)
     body = load_json_arg(args.json_inline, args.json_file)
@@ -146,18 +450,10 @@ def main() -> int:
         print(json.dumps({"method": args.method.upper(), "url": url, "headers": headers, "body": body}, indent=2))
         return 0
 
-    status, content_type, parsed = request_nocobase(
-        method=args.method,
-        url=url,
-        headers=headers,
-        body=body,
-        timeout_s=args.timeout,
-        verify_ssl=verify_ssl,
-    )
+    if args.paginate:
+        return main_paginate(args, params, extra_headers, role, verify_ssl)
 
-    print(f"HTTP {status} ({content_type})")
-    print(json.dumps(parsed, indent=2))
-    return 0 if 200 <= status < 300 else 1
+    return main_single(args, url, headers, body, role, verify_ssl)
 
 
 if __name__ == "__main__":
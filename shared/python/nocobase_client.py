@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""Shared, connection-pooled HTTP client for the NocoBase Resource:Action API.
+
+Every Python tool that talks to NocoBase goes through ``NocoBaseClient`` so a
+process reuses a small pool of keep-alive connections instead of paying a new
+TCP+TLS handshake for each call.
+
+Usage:
+  from nocobase_client import NocoBaseClient
+
+  with NocoBaseClient.from_env(role="root") as client:
+      resp = client.get("collections:list", params={"paginate": "false"})
+      resp = client.post("collections:create", json={"name": "todos"})
+
+Paths are resolved against the base URL; absolute http(s) URLs are used as-is.
+
+`:list` endpoints can be streamed record by record across every page:
+
+  for record in client.iter_records("et_pacientes_censo:list", page_size=500):
+      ...
+
+The next page is fetched in the background while the current one is consumed,
+so at most two pages are held in memory.
+
+Large single responses can be consumed without buffering the body:
+
+  with client.stream("GET", "uiSchemas:list") as resp:
+      for chunk in resp.iter_bytes():
+          ...
+
+Configuration (read by ``NocoBaseClient.from_env``):
+  NOCOBASE_BASE_URL           e.g. https://my-nocobase/api
+  NOCOBASE_API_KEY            API key (Bearer token)
+  NOCOBASE_ROLE               Optional X-Role header value
+  NOCOBASE_TIMEOUT_SECONDS    Request timeout (default 30)
+  NOCOBASE_VERIFY_SSL         true|false (default true)
+  NOCOBASE_POOL_SIZE          Max open connections per client (default 10)
+  NOCOBASE_KEEPALIVE_SECONDS  Idle keep-alive expiry (default 30)
+  NOCOBASE_HTTP2              true|false (default false, needs httpx[http2])
+  NOCOBASE_RATE_LIMIT*        Optional shared token bucket, see nocobase_ratelimit.py
+  NOCOBASE_RETRIES, ...       Retry/backoff and circuit breaker, see nocobase_retry.py
+  NOCOBASE_CACHE_DB           Opt-in metadata response cache, see nocobase_cache.py
+  NOCOBASE_TRACE              Per-request latency tracing, see nocobase_trace.py
+  NOCOBASE_VALIDATE           Opt-in local body validation, see nocobase_validate.py
+
+Retry counts and time spent backing off are accumulated in ``client.stats``
+(``client.stats.summary()`` for run reports).
+
+The asyncio twin, ``AsyncNocoBaseClient``, lives in nocobase_async.py.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from nocobase_cache import READ_ACTIONS, ResponseCache, cache_from_env, cached_response
+from nocobase_ratelimit import TokenBucket, limiter_from_env
+from nocobase_retry import (
+    CircuitBreaker,
+    RetryPolicy,
+    RetryStats,
+    action_of,
+    breaker_from_env,
+    retry_from_env,
+)
+from nocobase_trace import Tracer, tracer_from_env
+from nocobase_validate import Validator, validator_from_env
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+DEFAULT_TIMEOUT_S = 30
+DEFAULT_POOL_SIZE = 10
+DEFAULT_KEEPALIVE_S = 30.0
+DEFAULT_PAGE_SIZE = 200
+
+
+def str_to_bool(s: str) -> bool:
+    return s.strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def http2_available() -> bool:
+    """HTTP/2 in httpx needs the optional ``h2`` package."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """NocoBase expects structured query params (filter, sort objects) as JSON strings."""
+    if not params:
+        return params
+    return {k: json.dumps(v) if isinstance(v, dict) else v for k, v in params.items()}
+
+
+def env_config() -> Dict[str, Any]:
+    """Client keyword arguments described by NOCOBASE_* variables."""
+    return {
+        "base_url": os.getenv("NOCOBASE_BASE_URL", "").strip(),
+        "api_key": os.getenv("NOCOBASE_API_KEY", "").strip(),
+        "role": os.getenv("NOCOBASE_ROLE", "").strip() or None,
+        "timeout_s": float(os.getenv("NOCOBASE_TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT_S))),
+        "verify_ssl": str_to_bool(os.getenv("NOCOBASE_VERIFY_SSL", "true")),
+        "pool_size": int(os.getenv("NOCOBASE_POOL_SIZE", str(DEFAULT_POOL_SIZE))),
+        "keepalive_s": float(os.getenv("NOCOBASE_KEEPALIVE_SECONDS", str(DEFAULT_KEEPALIVE_S))),
+        "http2": str_to_bool(os.getenv("NOCOBASE_HTTP2", "false")),
+        "rate_limiter": limiter_from_env(),
+        "retry": retry_from_env(),
+        "breaker": breaker_from_env(),
+    }
+
+
+def httpx_options(
+    api_key: str,
+    role: Optional[str],
+    extra_headers: Optional[Dict[str, str]],
+    timeout_s: float,
+    verify_ssl: bool,
+    pool_size: int,
+    keepalive_s: float,
+    http2: bool,
+) -> Dict[str, Any]:
+    """Keyword arguments for httpx.Client / httpx.AsyncClient shared by both clients."""
+    if http2 and not http2_available():
+        print("WARNING: NOCOBASE_HTTP2 requested but 'h2' is not installed; using HTTP/1.1.", file=sys.stderr)
+        http2 = False
+
+    headers: Dict[str, str] = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    if role:
+        headers["X-Role"] = role
+    if extra_headers:
+        headers.update(extra_headers)
+
+    return {
+        "headers": headers,
+        "timeout": timeout_s,
+        "verify": verify_ssl,
+        "http2": http2,
+        "limits": httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_s,
+        ),
+    }
+
+
+def list_page(body: Dict[str, Any], page: int, page_size: int) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Split a `:list` response into (records, current page, has next page).
+
+    Responses without ``meta`` (non-paginated endpoints) are treated as a single page.
+    """
+    data = body.get("data") or []
+    if not isinstance(data, list):
+        data = [data]
+    meta = body.get("meta")
+    if not isinstance(meta, dict):
+        return data, page, False
+    page = int(meta.get("page", page))
+    total_page = meta.get("totalPage")
+    has_next = bool(data) and (page < int(total_page) if total_page is not None else len(data) >= page_size)
+    return data, page, has_next
+
+
+class NocoBaseClient:
+    """Pooled, keep-alive client bound to one NocoBase instance and API key."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        role: Optional[str] = None,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+        verify_ssl: bool = True,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive_s: float = DEFAULT_KEEPALIVE_S,
+        http2: bool = False,
+        extra_headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[ResponseCache] = None,
+        tracer: Optional[Tracer] = None,
+        validator: Optional[Validator] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.role = role or None
+        self.timeout_s = timeout_s
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.breaker = breaker
+        self.cache = cache
+        self.tracer = tracer
+        self.validator = validator
+        self.stats = RetryStats()
+        if breaker is not None and breaker.stats is None:
+            breaker.stats = self.stats
+        self._http = httpx.Client(
+            **httpx_options(api_key, self.role, extra_headers, timeout_s, verify_ssl, pool_size, keepalive_s, http2)
+        )
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "NocoBaseClient":
+        """Build a client from NOCOBASE_* variables; non-None keyword overrides win."""
+        config = env_config()
+        if "cache" not in overrides:
+            config["cache"] = cache_from_env()
+        if "tracer" not in overrides:
+            config["tracer"] = tracer_from_env()
+        if "validator" not in overrides:
+            config["validator"] = validator_from_env(overrides.get("base_url") or config["base_url"])
+        config.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**config)
+
+    def url_for(self, path: str) -> str:
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> httpx.Response:
+        method = method.upper()
+        url = self.url_for(path)
+        if self.validator and json is not None and method in ("POST", "PUT", "PATCH"):
+            errors = self.validator.check(url, json)
+            if errors:
+                self.stats.record(rejected_locally=1)
+                return self.validator.rejection(method, url, errors)
+        ttl = self.cache.ttl_for(method, url) if self.cache else None
+        if ttl is None:
+            resp = self._send(method, url, params, json, headers, timeout_s)
+            if self.cache and resp.is_success and action_of(url) not in READ_ACTIONS:
+                self.cache.invalidate(url)
+            return resp
+
+        role = (headers or {}).get("X-Role", self.role)
+        key = self.cache.key_for(method, url, role, encode_params(params))
+        entry = None if self.cache.refresh else self.cache.lookup(key)
+        if entry and entry["fresh"]:
+            self.cache.hits += 1
+            return cached_response(entry, method, "HIT")
+
+        conditional = dict(headers or {})
+        if entry and entry["etag"]:
+            conditional["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            conditional["If-Modified-Since"] = entry["last_modified"]
+        resp = self._send(method, url, params, json, conditional, timeout_s)
+        if entry and resp.status_code == 304:
+            self.cache.revalidated += 1
+            self.cache.touch(key, ttl)
+            return cached_response(entry, method, "REVALIDATED")
+        self.cache.misses += 1
+        if resp.status_code == 200:
+            self.cache.store(key, resp, ttl)
+        return resp
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Any],
+        headers: Optional[Dict[str, str]],
+        timeout_s: Optional[float],
+        stream: bool = False,
+    ) -> httpx.Response:
+        """One logical request: breaker check, rate limit and retries with backoff.
+
+        With ``stream=True`` the returned response body is not read yet.
+        """
+        attempt = 0
+        delay: Optional[float] = None
+        while True:
+            if self.breaker:
+                self.breaker.before_request()
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            self.stats.record(requests=1)
+            trace = self.tracer.start(method, url, attempt) if self.tracer else None
+            try:
+                request = self._http.build_request(
+                    method,
+                    url,
+                    params=encode_params(params),
+                    json=json,
+                    headers=headers,
+                    timeout=timeout_s if timeout_s is not None else self.timeout_s,
+                    extensions={"trace": trace.hook} if trace else None,
+                )
+                resp = self._http.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if trace:
+                    self.tracer.finish(trace, error=e)
+                if self.breaker:
+                    self.breaker.record_failure()
+                delay = self.retry.next_delay(attempt, delay, method, url, error=e) if self.retry else None
+                if delay is None:
+                    raise
+            else:
+                if trace:
+                    self.tracer.finish(trace, response=resp)
+                if self.breaker:
+                    self.breaker.record_response(resp.status_code)
+                delay = self.retry.next_delay(attempt, delay, method, url, response=resp) if self.retry else None
+                if delay is None:
+                    return resp
+                resp.close()
+            self.stats.record(retries=1, backoff_s=delay)
+            time.sleep(delay)
+            attempt += 1
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Iterator[httpx.Response]:
+        """Like ``request`` but the body is left unread, for ``resp.iter_bytes()``/``iter_text()``.
+
+        Retries and the breaker still apply (they only look at the status line).
+        Cacheable metadata calls go through ``request`` so the cache keeps working;
+        they are small. Traced streaming requests are timed up to the response
+        headers only.
+        """
+        method = method.upper()
+        url = self.url_for(path)
+        if self.cache and self.cache.ttl_for(method, url) is not None:
+            resp = self.request(method, url, params=params, json=json, headers=headers, timeout_s=timeout_s)
+        else:
+            resp = self._send(method, url, params, json, headers, timeout_s, stream=True)
+            if self.cache and resp.is_success and action_of(url) not in READ_ACTIONS:
+                self.cache.invalidate(url)
+        try:
+            yield resp
+        finally:
+            resp.close()
+
+    def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, json: Optional[Any] = None, **kwargs: Any) -> httpx.Response:
+        return self.request("POST", path, json=json, **kwargs)
+
+    def iter_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield each page of a `:list` endpoint, following ``meta.page``/``meta.totalPage``.
+
+        Raises ``httpx.HTTPStatusError`` on a non-2xx page.
+        """
+        query = {k: v for k, v in (params or {}).items() if k not in ("page", "pageSize")}
+        query["pageSize"] = page_size
+
+        def fetch(page: int) -> Dict[str, Any]:
+            resp = self.get(path, params={**query, "page": page})
+            resp.raise_for_status()
+            return resp.json()
+
+        with ThreadPoolExecutor(max_workers=1) as ahead:
+            page = 1
+            body = fetch(page)
+            while True:
+                data, page, has_next = list_page(body, page, page_size)
+                upcoming = ahead.submit(fetch, page + 1) if has_next and prefetch else None
+                yield data
+                if not has_next:
+                    return
+                body = upcoming.result() if upcoming else fetch(page + 1)
+                page += 1
+
+    def iter_records(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every record of a `:list` endpoint, one at a time, across all pages."""
+        for page in self.iter_pages(path, params=params, page_size=page_size, prefetch=prefetch):
+            yield from page
+
+    def close(self) -> None:
+        self._http.close()
+        if self.cache:
+            self.cache.close()
+        if self.tracer:
+            self.tracer.close()
+
+    def __enter__(self) -> "NocoBaseClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -2,13 +2,49 @@
 """
 NocoBase Blueprint Configurator
 Reads app-spec/app.yaml and creates collections + fields via API
+
+The live schema is read once (collections:list with fields appended) and
+diffed against the blueprint; only missing or changed collections/fields are
+sent. Re-applying an unchanged blueprint costs a single request.
+
+Operations run in dependency order (collection -> its fields; belongsTo ->
+target collection and foreign key field), independent ones concurrently.
+
+Every module section of the blueprint that declares collections (data_model,
+entrega, agenda, ...) goes into one combined plan against one schema fetch.
+
+The blueprint is loaded through the compiled IR (nocobase_spec.py). Collections
+whose content hash matches the last successful deploy to the same instance
+(.nocobase/deploy-state.json) are skipped without asking NocoBase; --full
+re-checks everything against the live schema.
+
+Usage:
+  python nocobase_configure.py                          # plan + apply all modules
+  python nocobase_configure.py --plan-only              # print the plan, change nothing
+  python nocobase_configure.py --jobs 1                 # apply serially
+  python nocobase_configure.py --modules entrega,agenda # only these sections
+  python nocobase_configure.py --full                   # ignore the deploy state
+  python nocobase_configure.py --resume                 # continue an interrupted deploy
+  python nocobase_configure.py --bulk                   # new collections + plain fields in one request
+                                                        # (relations stay one request per field)
+
+Each deploy writes a write-ahead journal (nocobase_journal.py) with the plan and
+every completed operation; --resume applies only what the journal has not
+committed, without re-planning.
 """
 
+import argparse
 import os
+import re
 import sys
-import yaml
-import requests
-from typing import Dict, List, Any
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from nocobase_client import NocoBaseClient
+from nocobase_journal import DEFAULT_JOURNAL_DIR, DeployJournal, JournalReplay, journal_path, request_hash
+from nocobase_spec import DeployState, SpecError, build_field_payload, build_collection_payload, load_ir
 
 try:
     from dotenv import load_dotenv
@@ -16,142 +52,453 @@ try:
 except ImportError:
     pass
 
+DEFAULT_JOBS = 8
+RELATION_TYPES = ('belongsTo', 'hasOne', 'hasMany', 'belongsToMany')
 
-def build_field_payload(field_def: Dict[str, Any]) -> Dict[str, Any]:
-    """Translate YAML field definition to NocoBase API payload"""
-    
-    field_type = field_def.get('type', 'string')
-    field_name = field_def['name']
-    
-    # Base payload
-    payload = {
-        'name': field_name,
-        'type': field_type,
-    }
-    
-    # Map common types to NocoBase interface
-    type_mapping = {
-        'string': {'type': 'string', 'interface': None},
-        'integer': {'type': 'integer', 'interface': 'integer'},
-        'boolean': {'type': 'boolean', 'interface': 'checkbox'},
-        'date': {'type': 'date', 'interface': 'date'},
-        'datetime': {'type': 'datetime', 'interface': 'datetime'},
-        'text': {'type': 'text', 'interface': 'textarea'},
-        'belongsTo': {'type': 'belongsTo', 'interface': 'm2o'},
-    }
-    
-    if field_type in type_mapping:
-        payload.update(type_mapping[field_type])
-    
-    # Handle belongsTo relationships
-    if field_type == 'belongsTo':
-        payload['target'] = field_def.get('target')
-        payload['foreignKey'] = field_def.get('foreignKey')
-        if not payload.get('target'):
-            print(f"  [WARN] belongsTo field {field_name} missing 'target'")
-        if not payload.get('foreignKey'):
-            print(f"  [WARN] belongsTo field {field_name} missing 'foreignKey'")
-    
-    # Build uiSchema
-    ui_schema = field_def.get('uiSchema', {})
-    
-    # If no uiSchema provided, create basic one
-    if not ui_schema:
-        ui_schema = {
-            'title': field_def.get('title', field_name.replace('_', ' ').title())
-        }
-        
-        # Add component based on type
-        if field_type == 'string':
-            ui_schema['x-component'] = 'Input'
-        elif field_type == 'integer':
-            ui_schema['x-component'] = 'InputNumber'
-        elif field_type == 'boolean':
-            ui_schema['x-component'] = 'Checkbox'
-        elif field_type == 'date':
-            ui_schema['x-component'] = 'DatePicker'
-        elif field_type == 'datetime':
-            ui_schema['x-component'] = 'DatePicker'
-            ui_schema['showTime'] = True
-        elif field_type == 'text':
-            ui_schema['x-component'] = 'Input.TextArea'
-    
-    payload['uiSchema'] = ui_schema
-    
-    # Handle required, unique, default
-    if field_def.get('required'):
-        payload['required'] = True
-    if field_def.get('unique'):
-        payload['unique'] = True
-    if 'default' in field_def:
-        payload['defaultValue'] = field_def['default']
-    
-    return payload
-
-
-def create_collection(base_url: str, api_key: str, collection_def: Dict[str, Any]) -> bool:
-    """Create a collection in NocoBase"""
-    
-    url = f"{base_url.rstrip('/')}/collections:create"
-    headers = {
-        'Authorization': f'Bearer {api_key}',
-        'Content-Type': 'application/json',
-        'X-Role': 'root'
-    }
-    
-    payload = {
-        'name': collection_def['name'],
-        'title': collection_def.get('title', collection_def['name']),
-        'inherit': False,
-        'hidden': False
-    }
+
+def say(message: str) -> None:
+    """print() for messages from worker threads: one write per message, so lines never interleave"""
+    sys.stdout.write(message + '\n')
+
+
+def response_record(resp) -> Dict[str, Any]:
+    try:
+        data = resp.json().get('data')
+    except (ValueError, AttributeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def create_collection(client: NocoBaseClient, collection_def: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Create a collection in NocoBase; returns the server's record or None on failure"""
+    
+    payload = build_collection_payload(collection_def)
     
     try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=30)
+        resp = client.post('collections:create', json=payload)
         if resp.status_code == 200:
-            print(f"[OK] Created collection: {collection_def['name']}")
-            return True
-        elif resp.status_code == 400:
-            # Might already exist
-            print(f"[WARN] Collection {collection_def['name']} might already exist (400)")
-            return True
-        else:
-            print(f"[FAIL] Failed to create {collection_def['name']}: {resp.status_code}")
-            print(resp.text)
-            return False
+            say(f"[OK] Created collection: {collection_def['name']}")
+            return response_record(resp)
+        # The live schema showed it missing, so a 400 is a real rejection, not "already exists"
+        say(f"[FAIL] Failed to create {collection_def['name']}: {resp.status_code}\n{resp.text}")
+        return None
     except Exception as e:
-        print(f"[ERROR] Error creating {collection_def['name']}: {e}")
-        return False
+        say(f"[ERROR] Error creating {collection_def['name']}: {e}")
+        return None
 
 
-def create_field(base_url: str, api_key: str, collection_name: str, field_def: Dict[str, Any]) -> bool:
-    """Create a field in a NocoBase collection"""
-    
-    url = f"{base_url.rstrip('/')}/collections/{collection_name}/fields:create"
-    headers = {
-        'Authorization': f'Bearer {api_key}',
-        'Content-Type': 'application/json',
-        'X-Role': 'root'
-    }
+def create_field(client: NocoBaseClient, collection_name: str, field_def: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Create a field in a NocoBase collection; returns the server's record or None on failure"""
     
     payload = build_field_payload(field_def)
     
     try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=30)
+        resp = client.post(f'collections/{collection_name}/fields:create', json=payload)
         if resp.status_code == 200:
-            print(f"  [OK] Created field: {field_def['name']}")
-            return True
+            say(f"  [OK] Created field: {collection_name}.{field_def['name']}")
+            return response_record(resp)
         else:
-            print(f"  [FAIL] Failed to create field {field_def['name']}: {resp.status_code}")
-            print(f"     Payload: {payload}")
-            print(f"     Response: {resp.text}")
-            return False
+            say(f"  [FAIL] Failed to create field {collection_name}.{field_def['name']}: {resp.status_code}\n"
+                  f"     Payload: {payload}\n"
+                  f"     Response: {resp.text}")
+            return None
+    except Exception as e:
+        say(f"  [ERROR] Error creating field {collection_name}.{field_def['name']}: {e}")
+        return None
+
+
+def create_collection_with_fields(client: NocoBaseClient, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Create a collection and its inline ``fields`` in one collections:create request.
+
+    Errors are attributed to individual fields when the server's messages name
+    them; when the response lists the created fields, any field it lacks is
+    reported as failed too.
+    """
+    
+    name = payload['name']
+    sent = [f['name'] for f in payload.get('fields', [])]
+    try:
+        resp = client.post('collections:create', json=payload)
     except Exception as e:
-        print(f"  [ERROR] Error creating field {field_def['name']}: {e}")
-        return False
+        say(f"[ERROR] Error creating {name}: {e}")
+        return None
+    
+    if resp.status_code == 200:
+        record = response_record(resp)
+        created = record.get('fields')
+        missing = []
+        if isinstance(created, list):
+            names = {c.get('name') for c in created if isinstance(c, dict)}
+            missing = [f for f in sent if f not in names]
+        if missing:
+            say('\n'.join([f"[FAIL] Created collection {name}, but not all of its fields:"] +
+                          [f"  [FAIL] field {name}.{f}: missing from the collections:create response" for f in missing]))
+            return None
+        say(f"[OK] Created collection: {name} (+{len(sent)} fields inline)")
+        return record
+    
+    try:
+        errors = [e.get('message', str(e)) for e in resp.json().get('errors', [])]
+    except (ValueError, AttributeError):
+        errors = []
+    lines = [f"[FAIL] Failed to create {name} with {len(sent)} inline fields: {resp.status_code}"]
+    unattributed = []
+    for message in errors or [resp.text]:
+        fields = [f for f in sent if re.search(rf'\b{re.escape(f)}\b', message)]
+        if fields:
+            lines.extend(f"  [FAIL] field {name}.{f}: {message}" for f in fields)
+        else:
+            unattributed.append(message)
+    lines.extend(f"  {message}" for message in unattributed)
+    say('\n'.join(lines))
+    return None
+
+
+def update_collection(client: NocoBaseClient, name: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Update an existing NocoBase collection; returns the server's record or None on failure"""
+    
+    try:
+        resp = client.post('collections:update', params={'filterByTk': name}, json=payload)
+        if resp.status_code == 200:
+            say(f"[OK] Updated collection: {name}")
+            return response_record(resp)
+        say(f"[FAIL] Failed to update {name}: {resp.status_code}\n{resp.text}")
+        return None
+    except Exception as e:
+        say(f"[ERROR] Error updating {name}: {e}")
+        return None
+
+
+def update_field(client: NocoBaseClient, collection_name: str, field_name: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Update an existing field of a NocoBase collection; returns the server's record or None on failure"""
+    
+    try:
+        resp = client.post(
+            f'collections/{collection_name}/fields:update', params={'filterByTk': field_name}, json=payload
+        )
+        if resp.status_code == 200:
+            say(f"  [OK] Updated field: {collection_name}.{field_name}")
+            return response_record(resp)
+        say(f"  [FAIL] Failed to update field {collection_name}.{field_name}: {resp.status_code}\n"
+              f"     Payload: {payload}\n"
+              f"     Response: {resp.text}")
+        return None
+    except Exception as e:
+        say(f"  [ERROR] Error updating field {collection_name}.{field_name}: {e}")
+        return None
+
+
+# ── Plan ──────────────────────────────────────────────────────────────────────
+
+def fetch_live_schema(client: NocoBaseClient) -> Dict[str, Dict[str, Any]]:
+    """Read every collection with its fields in one call: {name: {'collection': {...}, 'fields': {name: {...}}}}"""
+    
+    resp = client.get('collections:list', params={'paginate': 'false', 'appends[]': 'fields'})
+    resp.raise_for_status()
+    live = {}
+    for coll in resp.json().get('data') or []:
+        fields = coll.get('fields') or []
+        live[coll['name']] = {
+            'collection': coll,
+            'fields': {f['name']: f for f in fields if isinstance(f, dict) and f.get('name')},
+        }
+    return live
+
+
+def diff_payload(desired: Any, live: Any, path: str = '') -> List[str]:
+    """Keys of ``desired`` whose value differs in ``live`` (None in desired means "don't care")."""
+    
+    if isinstance(desired, dict) and isinstance(live, dict):
+        changes = []
+        for key, value in desired.items():
+            if value is None:
+                continue
+            changes.extend(diff_payload(value, live.get(key), f"{path}.{key}" if path else key))
+        return changes
+    if desired != live:
+        return [f"{path}: {live!r} -> {desired!r}"]
+    return []
+
+
+def build_plan(
+    collections: List[Dict[str, Any]], live: Dict[str, Dict[str, Any]], bulk: bool = False
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Operations needed to bring ``live`` in line with the compiled collections, plus the count already in sync
+
+    With ``bulk``, a new collection is created together with its non-relational
+    fields in one request; relational fields stay one operation per field, since
+    each has to wait for its own target collection (and NocoBase has no
+    request that adds several fields to an existing collection).
+    """
+    
+    plan = []
+    in_sync = 0
+    for entry in collections:
+        coll = entry['definition']
+        name = coll['name']
+        current = live.get(name)
+        inline = set()
+        if current is None and bulk:
+            inline = {f for f, payload in entry['fields'].items() if payload.get('type') not in RELATION_TYPES}
+            fields = [entry['fields'][f['name']] for f in coll.get('fields', []) if f['name'] in inline]
+            plan.append({'op': 'create', 'kind': 'collection', 'collection': name, 'definition': coll,
+                         'payload': {**entry['payload'], 'fields': fields}})
+        elif current is None:
+            plan.append({'op': 'create', 'kind': 'collection', 'collection': name, 'definition': coll})
+        else:
+            changes = diff_payload(entry['payload'], current['collection'])
+            if changes:
+                plan.append({'op': 'update', 'kind': 'collection', 'collection': name,
+                             'payload': entry['payload'], 'changes': changes})
+            else:
+                in_sync += 1
+        
+        live_fields = current['fields'] if current else {}
+        for field in coll.get('fields', []):
+            field_name = field['name']
+            payload = entry['fields'][field_name]
+            if field_name in inline:
+                continue
+            if field_name not in live_fields:
+                plan.append({'op': 'create', 'kind': 'field', 'collection': name, 'name': field_name,
+                             'definition': field, 'payload': payload})
+                continue
+            changes = diff_payload(payload, live_fields[field_name])
+            if changes:
+                plan.append({'op': 'update', 'kind': 'field', 'collection': name, 'name': field_name,
+                             'payload': payload, 'changes': changes})
+            else:
+                in_sync += 1
+    return plan, in_sync
+
+
+def inline_fields(op: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Fields sent inside a bulk collections:create operation"""
+    if op['kind'] == 'collection' and op['op'] == 'create':
+        return (op.get('payload') or {}).get('fields') or []
+    return []
+
+
+def print_plan(plan: List[Dict[str, Any]], in_sync: int, owner: Optional[Dict[str, str]] = None) -> None:
+    """Terraform-style summary of the planned operations, grouped by blueprint module"""
+    
+    module = None
+    for op in plan:
+        if owner and owner.get(op['collection']) != module:
+            module = owner.get(op['collection'])
+            print(f"  # {module}")
+        symbol = '+' if op['op'] == 'create' else '~'
+        if op['kind'] == 'collection':
+            print(f"  {symbol} collection {op['collection']}")
+            for field in inline_fields(op):
+                print(f"      + field {op['collection']}.{field['name']} ({field['type']}, inline)")
+        else:
+            field_type = op.get('definition', {}).get('type', '') if op['op'] == 'create' else ''
+            print(f"  {symbol} field {op['collection']}.{op['name']}" + (f" ({field_type})" if field_type else ''))
+        for change in op.get('changes', []):
+            print(f"        {change}")
+    
+    to_add = sum(1 + len(inline_fields(op)) for op in plan if op['op'] == 'create')
+    to_change = sum(1 for op in plan if op['op'] == 'update')
+    print(f"\nPlan: {to_add} to add, {to_change} to change, {in_sync} up to date ({len(plan)} request(s)).")
+
+
+def op_key(op: Dict[str, Any]) -> Tuple[str, ...]:
+    if op['kind'] == 'collection':
+        return ('collection', op['collection'])
+    return ('field', op['collection'], op['name'])
+
+
+def plan_dependencies(plan: List[Dict[str, Any]]) -> Dict[Tuple[str, ...], List[Tuple[str, ...]]]:
+    """Planned operations each operation has to wait for.
+
+    A field waits for its own collection; a belongsTo field also waits for its
+    target collection and for its foreignKey field when those are being created
+    in the same run. Anything already live is no dependency at all.
+    """
+    
+    keys = {op_key(op) for op in plan}
+    deps = {}
+    for op in plan:
+        key = op_key(op)
+        needs = []
+        if op['kind'] == 'field':
+            needs.append(('collection', op['collection']))
+            payload = op['payload']
+            if payload.get('type') == 'belongsTo':
+                if payload.get('target'):
+                    needs.append(('collection', payload['target']))
+                if payload.get('foreignKey'):
+                    needs.append(('field', op['collection'], payload['foreignKey']))
+        deps[key] = [need for need in dict.fromkeys(needs) if need in keys and need != key]
+    return deps
+
+
+def topological_order(plan: List[Dict[str, Any]], deps: Dict[Tuple[str, ...], List[Tuple[str, ...]]]) -> List[Dict[str, Any]]:
+    """Kahn's algorithm, stable with respect to blueprint order. Raises ValueError on a cycle."""
+    
+    by_key = {op_key(op): op for op in plan}
+    waiting = {key: len(needs) for key, needs in deps.items()}
+    dependents = {key: [] for key in deps}
+    for key, needs in deps.items():
+        for need in needs:
+            dependents[need].append(key)
+    
+    ready = [key for key in by_key if waiting[key] == 0]
+    ordered = []
+    while ready:
+        key = ready.pop(0)
+        ordered.append(by_key[key])
+        for dependent in dependents[key]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+    if len(ordered) != len(plan):
+        cycle = sorted('.'.join(key[1:]) for key, count in waiting.items() if count)
+        raise ValueError(f"dependency cycle between: {', '.join(cycle)}")
+    return ordered
+
+
+def apply_op(client: NocoBaseClient, op: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if op['kind'] == 'collection':
+        if op['op'] == 'create' and 'fields' in (op.get('payload') or {}):
+            return create_collection_with_fields(client, op['payload'])
+        if op['op'] == 'create':
+            return create_collection(client, op['definition'])
+        return update_collection(client, op['collection'], op['payload'])
+    if op['op'] == 'create':
+        return create_field(client, op['collection'], op['definition'])
+    return update_field(client, op['collection'], op['name'], op['payload'])
+
+
+def run_op(client: NocoBaseClient, op: Dict[str, Any], journal: Optional[DeployJournal] = None) -> bool:
+    """apply_op with write-ahead journaling: 'start' before the request, 'done'/'failed' after"""
+    
+    if journal is not None:
+        journal.started(op)
+    record = apply_op(client, op)
+    if journal is not None:
+        if record is None:
+            journal.failed(op)
+        else:
+            journal.done(op, record.get('key') or record.get('id') or record.get('name'))
+    return record is not None
+
+
+def apply_plan(
+    client: NocoBaseClient,
+    plan: List[Dict[str, Any]],
+    jobs: int = 1,
+    journal: Optional[DeployJournal] = None,
+) -> Set[Tuple[str, ...]]:
+    """Run the plan in dependency order, up to ``jobs`` operations at a time. Returns the failed (or skipped) operations.
+
+    An operation starts as soon as everything it depends on has succeeded; if a
+    dependency fails, its dependents are skipped and counted as failures.
+    """
+    
+    deps = plan_dependencies(plan)
+    ordered = topological_order(plan, deps)
+    
+    print(f"\n[*] Applying {len(ordered)} operation(s), {max(1, jobs)} at a time")
+    print("=" * 60)
+    
+    done = set()
+    failed = set()
+    
+    def blocked_by(op: Dict[str, Any]) -> List[Tuple[str, ...]]:
+        return [need for need in deps[op_key(op)] if need in failed]
+    
+    def skip(op: Dict[str, Any], blockers: List[Tuple[str, ...]]) -> None:
+        label = '.'.join(op_key(op)[1:])
+        say(f"  [SKIP] {op['kind']} {label}: depends on failed {', '.join('.'.join(b[1:]) for b in blockers)}")
+        failed.add(op_key(op))
+    
+    if jobs <= 1:
+        for op in ordered:
+            blockers = blocked_by(op)
+            if blockers:
+                skip(op, blockers)
+            elif not run_op(client, op, journal):
+                failed.add(op_key(op))
+        return failed
+    
+    queue = list(ordered)
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while queue or running:
+            for op in list(queue):
+                if len(running) >= jobs:
+                    break
+                needs = deps[op_key(op)]
+                blockers = blocked_by(op)
+                if blockers:
+                    queue.remove(op)
+                    skip(op, blockers)
+                elif all(need in done for need in needs):
+                    queue.remove(op)
+                    running[pool.submit(run_op, client, op, journal)] = op
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                op = running.pop(fut)
+                ok = False
+                try:
+                    ok = fut.result()
+                except Exception as e:
+                    say(f"[ERROR] {op['kind']} {'.'.join(op_key(op)[1:])}: {e}")
+                (done if ok else failed).add(op_key(op))
+    return failed
+
+
+def settle_in_flight(
+    client: NocoBaseClient, journal: DeployJournal, plan: List[Dict[str, Any]], replay: JournalReplay
+) -> List[Dict[str, Any]]:
+    """Resolve creates that were in flight when the previous run died: journal the ones that reached the server.
+
+    Updates are simply sent again; they are idempotent.
+    """
+    
+    remaining = []
+    for op in plan:
+        if request_hash(op) not in replay.in_flight or op['op'] != 'create':
+            remaining.append(op)
+            continue
+        if op['kind'] == 'collection':
+            resp = client.get('collections:get', params={'filterByTk': op['collection']})
+        else:
+            resp = client.get(f"collections/{op['collection']}/fields:get", params={'filterByTk': op['name']})
+        record = response_record(resp) if resp.status_code == 200 else {}
+        if record:
+            print(f"  [OK] {op['kind']} {'.'.join(op_key(op)[1:])} was applied before the interruption")
+            response_id = record.get('key') or record.get('id') or record.get('name')
+            journal.done(op, response_id)
+            replay.done[request_hash(op)] = response_id
+        else:
+            remaining.append(op)
+    return remaining
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Apply the app-spec blueprint (collections + fields) to NocoBase')
+    parser.add_argument('--spec', default='app-spec/app.yaml')
+    parser.add_argument('--plan-only', action='store_true', help='Print the plan and exit without changing anything')
+    parser.add_argument('--jobs', type=int, default=int(os.getenv('NOCOBASE_CONFIGURE_JOBS', str(DEFAULT_JOBS))),
+                        help=f'Operations to run concurrently (default {DEFAULT_JOBS}; 1 = serial)')
+    parser.add_argument('--modules', default='',
+                        help='Comma-separated blueprint sections to deploy, e.g. data_model,entrega,agenda (default: all)')
+    parser.add_argument('--full', action='store_true',
+                        help='Diff every collection against NocoBase, even those unchanged since the last deploy')
+    parser.add_argument('--bulk', action='store_true',
+                        help='Create each new collection with its non-relational fields in a single request; '
+                             'relational fields are still one request per field, after their target collections exist')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted deploy from its journal instead of planning a new one')
+    parser.add_argument('--journal-dir', default=os.getenv('NOCOBASE_JOURNAL_DIR', '').strip() or str(DEFAULT_JOURNAL_DIR),
+                        help=f'Where deploy journals are kept (default {DEFAULT_JOURNAL_DIR})')
+    args = parser.parse_args()
+    
     # Load config
     base_url = os.getenv('NOCOBASE_BASE_URL', '').strip()
     api_key = os.getenv('NOCOBASE_API_KEY', '').strip()
@@ -161,48 +508,121 @@ def main():
         return 1
     
     # Load blueprint
-    spec_path = 'app-spec/app.yaml'
+    spec_path = args.spec
     if not os.path.exists(spec_path):
         print(f"ERROR: {spec_path} not found")
         return 1
     
-    with open(spec_path, 'r', encoding='utf-8') as f:
-        spec = yaml.safe_load(f)
+    try:
+        ir = load_ir(spec_path)
+    except SpecError as e:
+        print(f"ERROR: {e}")
+        return 1
     
-    collections = spec.get('data_model', {}).get('collections', [])
+    modules = [m.strip() for m in args.modules.split(',') if m.strip()] or list(ir['modules'])
+    unknown = [m for m in modules if m not in ir['modules']]
+    if unknown:
+        print(f"ERROR: unknown module(s) {', '.join(unknown)}; the blueprint has: {', '.join(ir['modules'])}")
+        return 1
+    collections = [ir['collections'][name] for m in modules for name in ir['modules'][m]['collections']]
+    owner = {entry['definition']['name']: entry['module'] for entry in collections}
     
     if not collections:
         print("No collections found in blueprint")
         return 0
     
     print(f"\n>> Starting NocoBase configuration from blueprint...")
-    print(f"   Collections to process: {len(collections)}\n")
-    
-    # Phase 1: Create all collections
-    print("[*] Phase 1: Creating Collections")
-    print("=" * 60)
+    print(f"   Modules: {', '.join(modules)}")
+    print(f"   Collections in blueprint: {len(collections)}")
+    if ir['problems']:
+        print(f"   [WARN] {len(ir['problems'])} broken reference(s) in the blueprint (details: nocobase_spec.py)")
     
-    for coll in collections:
-        create_collection(base_url, api_key, coll)
+    state = DeployState(base_url)
+    journal = DeployJournal(journal_path(Path(args.journal_dir), base_url))
     
-    # Phase 2: Create all fields
-    print("\n[*] Phase 2: Creating Fields")
-    print("=" * 60)
-    
-    for coll in collections:
-        coll_name = coll['name']
-        fields = coll.get('fields', [])
+    if args.resume:
+        replay = DeployJournal.load(journal.path)
+        if replay is None:
+            print(f"ERROR: no deploy journal at {journal.path}; nothing to resume")
+            return 1
+        if replay.meta.get('spec_sha256') != ir['source']['sha256']:
+            print("ERROR: the blueprint changed since the interrupted deploy; run without --resume to re-plan")
+            return 1
+        if replay.ended and not replay.failures:
+            print(f"\n[OK] The deploy started {replay.meta.get('started_at')} completed; nothing to resume.")
+            return 0
+        collections = [ir['collections'][name] for name in replay.meta.get('collections', {}) if name in ir['collections']]
+        owner = {entry['definition']['name']: entry['module'] for entry in collections}
+        plan = replay.remaining()
+        print(f"   Resuming the deploy started {replay.meta.get('started_at')}: "
+              f"{len(replay.done)} of {len(replay.ops)} operation(s) already applied, {len(plan)} remaining\n")
+        client = NocoBaseClient.from_env(base_url=base_url, api_key=api_key, role='root')
+        plan = settle_in_flight(client, journal, plan, replay)
+        print_plan(plan, len(replay.done), owner)
+    else:
+        if not args.full:
+            unchanged = [e for e in collections if state.unchanged(e['definition']['name'], e['hash'])]
+            collections = [e for e in collections if e not in unchanged]
+            if unchanged:
+                print(f"   Unchanged since last deploy: {len(unchanged)} (--full to re-check them)")
+        print()
+        if not collections:
+            print("[OK] Nothing to do, every collection matches the last deploy.")
+            return 0
         
-        if not fields:
-            print(f"\n{coll_name}: No fields defined, skipping")
-            continue
+        # One pooled client for the whole run: every call reuses the same keep-alive connections
+        client = NocoBaseClient.from_env(base_url=base_url, api_key=api_key, role='root')
         
-        print(f"\n{coll_name}: {len(fields)} field(s)")
+        try:
+            live = fetch_live_schema(client)
+        except Exception as e:
+            print(f"ERROR: could not read the live schema (collections:list): {e}")
+            client.close()
+            return 1
         
-        for field in fields:
-            create_field(base_url, api_key, coll_name, field)
+        plan, in_sync = build_plan(collections, live, bulk=args.bulk)
+        print_plan(plan, in_sync, owner)
+        if plan and not args.plan_only:
+            journal.begin({
+                'base_url': base_url,
+                'spec': spec_path,
+                'spec_sha256': ir['source']['sha256'],
+                'modules': modules,
+                'collections': {e['definition']['name']: e['hash'] for e in collections},
+                'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            }, plan)
     
-    print("\n[OK] Configuration complete!")
+    failed = set()
+    if plan and not args.plan_only:
+        try:
+            failed = apply_plan(client, plan, jobs=args.jobs, journal=journal)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            client.close()
+            return 1
+        journal.end(len(failed))
+    journal.close()
+    
+    client.close()
+    print(f"\nHTTP: {client.stats.summary()}")
+    if args.plan_only:
+        return 0
+    
+    # Remember what is now deployed; a collection with any failed operation is re-checked next time
+    failed_collections = {key[1] for key in failed}
+    for entry in collections:
+        if entry['definition']['name'] not in failed_collections:
+            state.record(entry['definition']['name'], entry['hash'])
+    try:
+        state.save()
+    except OSError as e:
+        print(f"[WARN] Could not write the deploy state {state.path}: {e}")
+    
+    failures = len(failed)
+    if failures:
+        print(f"\n[FAIL] Configuration finished with {failures} failed operation(s); --resume retries only those")
+        return 1
+    print("\n[OK] Configuration complete!" if plan else "\n[OK] Nothing to do, NocoBase matches the blueprint.")
     return 0
 
 
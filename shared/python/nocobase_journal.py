@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Write-ahead journal for resumable NocoBase deploys.
+
+A deploy writes one JSON line per event to ``<journal dir>/configure-<target>.jsonl``:
+  {"type": "begin", "meta": {...}, "ops": [...]}   the full plan, before any request
+  {"type": "start", "hash": ...}                   an operation is about to be sent
+  {"type": "done", "hash": ..., "response_id": ...} the server accepted it
+  {"type": "failed", "hash": ...}                  the server rejected it
+  {"type": "end", "failures": n}                   the run finished
+
+Every record is flushed and fsynced before the next request goes out, so after
+a crash (timeout, VPN drop, Ctrl+C) the journal says exactly which operations
+were committed. ``load`` replays it: operations with a ``done`` record are
+skipped on resume; ``start`` without an outcome marks an operation that was in
+flight and has to be checked against the server.
+
+Operations are identified by ``request_hash``, a content hash of what is sent,
+so a resumed run can never mistake an edited operation for a finished one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from nocobase_spec import STATE_DIR, content_hash
+
+DEFAULT_JOURNAL_DIR = STATE_DIR / "journal"
+
+
+def request_hash(op: Dict[str, Any]) -> str:
+    """Identity of a planned operation: what it does and the exact payload it sends."""
+    return content_hash({k: op.get(k) for k in ("op", "kind", "collection", "name", "payload", "definition")})
+
+
+def journal_path(journal_dir: Path, base_url: str) -> Path:
+    """One journal per NocoBase instance."""
+    tag = hashlib.sha1(base_url.rstrip("/").encode("utf-8")).hexdigest()[:12]
+    return Path(journal_dir) / f"configure-{tag}.jsonl"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+@dataclass
+class JournalReplay:
+    """What an existing journal says about its (last) run."""
+
+    meta: Dict[str, Any]
+    ops: List[Dict[str, Any]]
+    done: Dict[str, Any] = field(default_factory=dict)  # hash -> response id
+    in_flight: Set[str] = field(default_factory=set)
+    ended: bool = False
+    failures: int = 0
+
+    def remaining(self) -> List[Dict[str, Any]]:
+        return [op for op in self.ops if request_hash(op) not in self.done]
+
+
+class DeployJournal:
+    """Appends fsynced JSONL records; safe to call from worker threads."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps({**record, "at": _now()}, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Held open across calls (one fsync per record, not one open); close() releases it
+                self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def begin(self, meta: Dict[str, Any], ops: List[Dict[str, Any]]) -> None:
+        """Start a new run, replacing any previous journal for this target."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")  # noqa: SIM115 - see _write
+        self._write({"type": "begin", "meta": meta, "ops": ops})
+
+    def started(self, op: Dict[str, Any]) -> None:
+        self._write({"type": "start", "hash": request_hash(op)})
+
+    def done(self, op: Dict[str, Any], response_id: Any = None) -> None:
+        self._write({"type": "done", "hash": request_hash(op), "response_id": response_id})
+
+    def failed(self, op: Dict[str, Any]) -> None:
+        self._write({"type": "failed", "hash": request_hash(op)})
+
+    def end(self, failures: int) -> None:
+        self._write({"type": "end", "failures": failures})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def load(path: Path) -> Optional[JournalReplay]:
+        """Replay a journal; None when there is none. A torn last line (crash mid-write) is ignored."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+        replay: Optional[JournalReplay] = None
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            kind = record.get("type")
+            if kind == "begin":
+                replay = JournalReplay(meta=record.get("meta") or {}, ops=record.get("ops") or [])
+            elif replay is None:
+                continue
+            elif kind == "start":
+                replay.in_flight.add(record["hash"])
+                replay.ended = False  # a resumed run after an earlier end
+            elif kind == "done":
+                replay.in_flight.discard(record["hash"])
+                replay.done[record["hash"]] = record.get("response_id")
+            elif kind == "failed":
+                replay.in_flight.discard(record["hash"])
+            elif kind == "end":
+                replay.ended = True
+                replay.failures = int(record.get("failures") or 0)
+        return replay
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Token-bucket rate limiting for the NocoBase Python clients.
+
+Two buckets with the same interface:
+  TokenBucket        in-process, thread-safe
+  SqliteTokenBucket  shared by every process that points at the same SQLite file,
+                     so parallel cron jobs (seed, census ETL, grants) draw from one
+                     budget instead of each hitting the server at full speed
+
+Both expose ``acquire()`` (blocking) and ``acquire_async()`` (asyncio).
+
+Configuration (read by ``limiter_from_env``):
+  NOCOBASE_RATE_LIMIT     Sustained requests/second (default 0 = unlimited)
+  NOCOBASE_RATE_BURST     Bucket capacity (default = rate, at least 1)
+  NOCOBASE_RATE_LIMIT_DB  SQLite file to share the bucket across processes
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens/second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available; return 0, or the seconds to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        while True:
+            wait_s = self.try_acquire(tokens)
+            if wait_s <= 0:
+                return
+            time.sleep(wait_s)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        while True:
+            wait_s = self.try_acquire(tokens)
+            if wait_s <= 0:
+                return
+            await asyncio.sleep(wait_s)
+
+
+class SqliteTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a SQLite row, shared across processes.
+
+    Each acquisition is one short ``BEGIN IMMEDIATE`` transaction, so concurrent
+    processes serialize on the database lock rather than on a separate lock file.
+    Wall-clock time is used because monotonic clocks are not comparable between
+    processes.
+    """
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None, name: str = "nocobase") -> None:
+        super().__init__(rate, burst)
+        self.path = path
+        self.name = name
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets "
+                "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM token_buckets WHERE name = ?", (self.name,)).fetchone()
+            available = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+            wait_s = 0.0
+            if available >= tokens:
+                available -= tokens
+            else:
+                wait_s = (tokens - available) / self.rate
+            conn.execute(
+                "INSERT INTO token_buckets (name, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (self.name, available, now),
+            )
+            conn.execute("COMMIT")
+            return wait_s
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        # The reservation can wait up to the 30 s lock timeout under contention:
+        # run it on a worker thread so it never blocks the event loop.
+        while True:
+            wait_s = await asyncio.to_thread(self.try_acquire, tokens)
+            if wait_s <= 0:
+                return
+            await asyncio.sleep(wait_s)
+
+
+def limiter_from_env() -> Optional[TokenBucket]:
+    """Build the limiter described by NOCOBASE_RATE_* variables, or None when unlimited."""
+    rate = float(os.getenv("NOCOBASE_RATE_LIMIT", "0") or 0)
+    if rate <= 0:
+        return None
+    burst_env = os.getenv("NOCOBASE_RATE_BURST", "").strip()
+    burst = float(burst_env) if burst_env else None
+    db_path = os.getenv("NOCOBASE_RATE_LIMIT_DB", "").strip()
+    if db_path:
+        return SqliteTokenBucket(db_path, rate, burst)
+    return TokenBucket(rate, burst)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Retry policy, circuit breaker and retry statistics for the NocoBase clients.
+
+Retries:
+  - connection failures before the request reached the server (connect errors,
+    pool timeouts) and 429/503 responses are retried for every method
+  - read errors/timeouts and 502/504 responses are retried only for idempotent
+    calls: GET/HEAD/OPTIONS/PUT/DELETE and POST to idempotent NocoBase actions
+    (list, get, update, destroy, ...). POST ``:create`` is never blindly retried.
+  - ``Retry-After`` is honored; otherwise delays use decorrelated jitter
+    (sleep = min(cap, uniform(base, 3 * previous sleep))).
+
+Circuit breaker:
+  After NOCOBASE_BREAKER_THRESHOLD consecutive server/connection failures the
+  breaker opens and every request fails fast with ``CircuitOpenError`` for
+  NOCOBASE_BREAKER_RESET_SECONDS. Then one probe request is let through; success
+  closes the breaker, failure re-opens it.
+
+Configuration (read by ``retry_from_env`` / ``breaker_from_env``):
+  NOCOBASE_RETRIES                 Max retries per request (default 3, 0 disables)
+  NOCOBASE_BACKOFF_BASE            Minimum backoff seconds (default 0.5)
+  NOCOBASE_BACKOFF_CAP             Maximum backoff seconds (default 20)
+  NOCOBASE_BREAKER_THRESHOLD       Consecutive failures to open (default 5, 0 disables)
+  NOCOBASE_BREAKER_RESET_SECONDS   Open duration before a probe (default 30)
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+IDEMPOTENT_ACTIONS = {"list", "get", "update", "destroy", "getProperties", "getJsonSchema", "count"}
+# The server did not process the request: safe to retry whatever the method.
+RETRY_ANY_STATUSES = {429, 503}
+RETRY_IDEMPOTENT_STATUSES = {502, 504}
+BREAKER_FAILURE_STATUSES = {502, 503, 504}
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+def action_of(url: str) -> str:
+    """NocoBase action of a Resource:Action URL, e.g. 'create' for '/api/x:create'."""
+    path = urlsplit(url).path
+    if ":" not in path:
+        return ""
+    return path.rsplit(":", 1)[1].split("/", 1)[0]
+
+
+def is_idempotent(method: str, url: str) -> bool:
+    method = method.upper()
+    if method in IDEMPOTENT_METHODS:
+        return True
+    return method == "POST" and action_of(url) in IDEMPOTENT_ACTIONS
+
+
+def retry_after_seconds(resp: httpx.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryStats:
+    """Thread-safe counters surfaced in run summaries."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.backoff_s = 0.0
+        self.breaker_trips = 0
+        self.fast_failures = 0
+        self.rejected_locally = 0
+        self._lock = threading.Lock()
+
+    def record(self, *, requests: int = 0, retries: int = 0, backoff_s: float = 0.0,
+               breaker_trips: int = 0, fast_failures: int = 0, rejected_locally: int = 0) -> None:
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.backoff_s += backoff_s
+            self.breaker_trips += breaker_trips
+            self.fast_failures += fast_failures
+            self.rejected_locally += rejected_locally
+
+    def summary(self) -> str:
+        text = (
+            f"{self.requests} request(s), {self.retries} retr{'y' if self.retries == 1 else 'ies'}, "
+            f"{self.backoff_s:.1f}s backing off, {self.breaker_trips} breaker trip(s), "
+            f"{self.fast_failures} fast failure(s)"
+        )
+        if self.rejected_locally:
+            text += f", {self.rejected_locally} rejected locally"
+        return text
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 3, base_s: float = 0.5, cap_s: float = 20.0) -> None:
+        self.max_retries = max_retries
+        self.base_s = base_s
+        self.cap_s = cap_s
+
+    def next_delay(
+        self,
+        attempt: int,
+        prev_delay: Optional[float],
+        method: str,
+        url: str,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """Seconds to wait before retry number ``attempt + 1``, or None to give up."""
+        if attempt >= self.max_retries or isinstance(error, CircuitOpenError):
+            return None
+        if error is not None:
+            if not isinstance(error, httpx.TransportError):
+                return None
+            if not isinstance(error, NOT_SENT_ERRORS) and not is_idempotent(method, url):
+                return None
+        elif response is not None:
+            status = response.status_code
+            if status not in RETRY_ANY_STATUSES and not (
+                status in RETRY_IDEMPOTENT_STATUSES and is_idempotent(method, url)
+            ):
+                return None
+            server_delay = retry_after_seconds(response)
+            if server_delay is not None:
+                return min(server_delay, max(self.cap_s, 60.0))
+        else:
+            return None
+        upper = max(self.base_s, (prev_delay or self.base_s) * 3)
+        return min(self.cap_s, random.uniform(self.base_s, upper))
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int = 5, reset_s: float = 30.0, stats: Optional[RetryStats] = None) -> None:
+        self.threshold = threshold
+        self.reset_s = reset_s
+        self.stats = stats
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise ``CircuitOpenError`` if the breaker is open (or a probe is already in flight)."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if not self._probing and time.monotonic() - self._opened_at >= self.reset_s:
+                self._probing = True
+                return
+        if self.stats:
+            self.stats.record(fast_failures=1)
+        raise CircuitOpenError("NocoBase circuit breaker is open; failing fast")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                if self._opened_at is None and self.stats:
+                    self.stats.record(breaker_trips=1)
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def record_response(self, status: int) -> None:
+        if status in BREAKER_FAILURE_STATUSES:
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+def retry_from_env() -> Optional[RetryPolicy]:
+    retries = int(os.getenv("NOCOBASE_RETRIES", "3"))
+    if retries <= 0:
+        return None
+    return RetryPolicy(
+        max_retries=retries,
+        base_s=float(os.getenv("NOCOBASE_BACKOFF_BASE", "0.5")),
+        cap_s=float(os.getenv("NOCOBASE_BACKOFF_CAP", "20")),
+    )
+
+
+def breaker_from_env() -> Optional[CircuitBreaker]:
+    threshold = int(os.getenv("NOCOBASE_BREAKER_THRESHOLD", "5"))
+    if threshold <= 0:
+        return None
+    return CircuitBreaker(threshold=threshold, reset_s=float(os.getenv("NOCOBASE_BREAKER_RESET_SECONDS", "30")))
@@ -2,7 +2,42 @@
 """Seed data into NocoBase collections using:
   POST {baseURL}/api/{collection}:create
 
-Reads seed data from app-spec/app.yaml (seed: section).
+Reads the seed sections of app-spec/app.yaml (the top-level seed: and those of
+the module sections, --modules to pick), through the cached compiled
+blueprint (nocobase_spec.py).
+
+Collections are seeded in dependency order derived from the blueprint's
+belongsTo relations (et_especialidades before et_servicios, departments before
+staff), so seed blocks need no hand ordering; collections of the same level
+run concurrently, --jobs at a time. A belongsTo value written as a natural key
+(department_id: ONCO) is resolved to the parent's id from a lookup filled as
+parents are created (or read once from the server for parents seeded
+earlier). The natural key of a parent is its --upsert-key, else a unique
+string field (code/codigo/rut/name/nombre first), else the first of those it
+declares. Integer values are taken as ids.
+
+Rows are sent --chunk-size at a time as an array body (NocoBase creates them
+in one transaction), with one report line per chunk. A rejected chunk is split
+in half until the bad rows are isolated, so k bad rows cost about k*log2(chunk)
+extra requests and every good row still lands. --chunk-size 1 sends one object
+per request, as before.
+
+--upsert-key makes re-runs idempotent: the collection's existing natural keys
+are fetched once (projected :list, large pages) into a key -> record index,
+and the seed is split into creates, updates (row content differs) and no-ops.
+Re-seeding an up-to-date instance costs one index request per collection.
+A collection whose key is missing from its rows is refused before anything is
+sent, rather than silently created again.
+  --upsert-key codigo                           same key for every collection
+                                                (or its natural key, see above, when it has no codigo)
+  --upsert-key et_servicios=codigo,departments=code   per collection
+
+--from-file loads a collection from a CSV/TSV, NDJSON, XLSX or Parquet file
+instead of the spec (nocobase_sources.py). Rows stream through
+read -> map -> validate -> chunk -> send, so memory stays flat whatever the
+file size; a rows/s meter replaces the per-chunk lines.
+  --from-file et_servicios=data/servicios.csv --map "Código=codigo,Nombre=nombre"
+  --from-file pacientes=data/censo.xlsx#Hoja1 --only-mapped --map "RUT=rut"
 """
 
 from __future__ import annotations
@@ -10,26 +45,455 @@ from __future__ import annotations
 import argparse
 import os
 import sys
-from typing import Any, Dict
-from urllib.parse import urljoin
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import requests
-import yaml
+from nocobase_client import NocoBaseClient
+from nocobase_sources import (
+    Progress,
+    SourceError,
+    iter_source,
+    map_columns,
+    parse_mapping,
+    validate_rows,
+)
+from nocobase_spec import SpecError, content_hash, load_ir
+from nocobase_trace import tracer_from_env
 
 
 def str_to_bool(s: str) -> bool:
     return s.strip().lower() in ("1", "true", "yes", "y", "on")
 
 
-def build_headers(api_key: str, role: str | None) -> Dict[str, str]:
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_JOBS = 4
+INDEX_PAGE_SIZE = 1000
+NATURAL_KEYS = ("code", "codigo", "rut", "name", "nombre")
+
+Row = Tuple[int, Dict[str, Any]]
+OnCreated = Callable[[List[Dict[str, Any]]], None]
+
+
+def say(message: str) -> None:
+    """print() for messages from worker threads: one write per message, so lines never interleave"""
+    sys.stdout.write(message + "\n")
+
+
+def iter_chunks(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def error_text(resp: Any) -> str:
+    try:
+        body = resp.json()
+    except Exception:
+        return resp.text
+    errors = body.get("errors") if isinstance(body, dict) else None
+    if errors:
+        return "; ".join(str(e.get("message", e)) if isinstance(e, dict) else str(e) for e in errors)
+    return str(body)
+
+
+def span(chunk: List[Row]) -> str:
+    return f"#{chunk[0][0]}" if len(chunk) == 1 else f"#{chunk[0][0]}-{chunk[-1][0]}"
+
+
+def created_records(resp: Any) -> List[Dict[str, Any]]:
+    try:
+        data = resp.json().get("data")
+    except (ValueError, AttributeError):
+        return []
+    if isinstance(data, dict):
+        return [data]
+    return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+
+
+def send_chunk(
+    client: NocoBaseClient,
+    endpoint: str,
+    collection: str,
+    chunk: List[Row],
+    quiet: bool = False,
+    on_created: Optional[OnCreated] = None,
+) -> int:
+    """POST a chunk; on rejection bisect it down to the offending rows. Returns the number of failed rows.
+
+    ``quiet`` drops the OK lines (a progress meter reports those); failures are always printed.
+    ``on_created`` receives the records the server returns.
+    """
+    body: Any = chunk[0][1] if len(chunk) == 1 else [row for _, row in chunk]
+    try:
+        resp = client.post(endpoint, json=body)
+    except Exception as e:
+        status, detail = None, str(e)
+    else:
+        if 200 <= resp.status_code < 300:
+            if not quiet:
+                suffix = f" ({len(chunk)} rows)" if len(chunk) > 1 else ""
+                say(f"[{collection} {span(chunk)}] HTTP {resp.status_code} OK{suffix}")
+            if on_created is not None:
+                on_created(created_records(resp))
+            return 0
+        status, detail = resp.status_code, error_text(resp)
+
+    if len(chunk) == 1:
+        say(f"[{collection} {span(chunk)}] {'HTTP ' + str(status) if status else 'ERROR'} FAIL: {detail}")
+        return 1
+    say(f"[{collection} {span(chunk)}] {'HTTP ' + str(status) if status else 'ERROR'} chunk rejected, bisecting")
+    mid = len(chunk) // 2
+    return (send_chunk(client, endpoint, collection, chunk[:mid], quiet, on_created)
+            + send_chunk(client, endpoint, collection, chunk[mid:], quiet, on_created))
+
+
+def parse_upsert_keys(value: str) -> Tuple[Optional[str], Dict[str, str]]:
+    """'codigo' -> (default key, {}); 'et_servicios=codigo,departments=code' -> (None, per collection)."""
+    default: Optional[str] = None
+    per_collection: Dict[str, str] = {}
+    for item in (part.strip() for part in value.split(",")):
+        if not item:
+            continue
+        if "=" in item:
+            collection, key = (x.strip() for x in item.split("=", 1))
+            per_collection[collection] = key
+        else:
+            default = item
+    return default, per_collection
+
+
+def create_rows(
+    client: NocoBaseClient,
+    endpoint: str,
+    collection: str,
+    rows: Iterable[Row],
+    args: argparse.Namespace,
+    progress: Optional[Progress] = None,
+    quiet: bool = False,
+    on_created: Optional[OnCreated] = None,
+) -> int:
+    failures = 0
+    quiet = quiet or progress is not None
+    for chunk in iter_chunks(rows, args.chunk_size):
+        if args.dry_run:
+            if len(chunk) == 1:
+                say(f"DRY RUN: POST {endpoint} body={chunk[0][1]}")
+            else:
+                say(f"DRY RUN: POST {endpoint} [{collection} {span(chunk)}] ({len(chunk)} rows)")
+        else:
+            failures += send_chunk(client, endpoint, collection, chunk, quiet, on_created)
+        if progress is not None:
+            progress.add(len(chunk))
+    return failures
+
+
+def fetch_key_index(
+    client: NocoBaseClient, collection: str, key: str, fields: Optional[List[str]]
+) -> Dict[Any, Dict[str, Any]]:
+    """Existing records of ``collection`` by natural key, projected to ``fields`` (None: whole records)."""
+    params = {"fields": ["id", key] + [f for f in fields if f not in ("id", key)]} if fields is not None else {}
+    return {
+        record.get(key): record
+        for record in client.iter_records(f"{collection}:list", params=params, page_size=INDEX_PAGE_SIZE)
+    }
+
+
+class KeyLookup:
+    """Natural key -> id of parent records, filled as parents are created.
+
+    A parent that was not seeded in this run (or only partly) is read from the
+    server once, projected to id and its natural key, on the first miss.
+    """
+
+    def __init__(self, client: NocoBaseClient, keys: Dict[str, str]) -> None:
+        self.client = client
+        self.keys = keys
+        self._ids: Dict[str, Dict[str, Any]] = {}
+        self._fetched: set = set()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    def add(self, collection: str, records: Iterable[Dict[str, Any]]) -> None:
+        key = self.keys.get(collection)
+        if not key:
+            return
+        with self._lock:
+            ids = self._ids.setdefault(collection, {})
+            for record in records:
+                if record.get(key) is not None and record.get("id") is not None:
+                    ids[str(record[key])] = record["id"]
+
+    def resolve(self, collection: str, value: Any) -> Any:
+        """The id for ``value`` in ``collection``; None when there is no such record."""
+        key = self.keys.get(collection)
+        if not key:
+            return None
+        with self._lock:
+            ids = self._ids.setdefault(collection, {})
+            if str(value) in ids or collection in self._fetched:
+                return ids.get(str(value))
+            fetch_lock = self._fetch_locks.setdefault(collection, threading.Lock())
+        # Only lookups into this collection wait for its index; cached ones go on
+        with fetch_lock:
+            with self._lock:
+                if collection in self._fetched:
+                    return ids.get(str(value))
+            try:
+                existing = fetch_key_index(self.client, collection, key, [])
+            except Exception as e:
+                say(f"[{collection}] ERROR reading existing {key} values: {e}")
+                existing = {}
+            with self._lock:
+                for record in existing.values():
+                    if record.get(key) is not None:
+                        ids[str(record[key])] = record.get("id")
+                self._fetched.add(collection)
+                return ids.get(str(value))
+
+
+def natural_key(ir: Optional[Dict[str, Any]], collection: str, default_key: Optional[str], keys: Dict[str, str]) -> Optional[str]:
+    if collection in keys:
+        return keys[collection]
+    fields = ((ir or {}).get("collections", {}).get(collection) or {}).get("fields") or {}
+    if default_key and default_key in fields:
+        return default_key
+    unique = [name for name, f in fields.items() if f.get("unique") and f.get("type") == "string"]
+    return next(
+        (name for name in NATURAL_KEYS if name in unique),
+        unique[0] if unique else next((name for name in NATURAL_KEYS if name in fields), None),
+    )
+
+
+def reference_fields(ir: Optional[Dict[str, Any]], collection: str) -> Dict[str, str]:
+    """belongsTo fields of ``collection``: {field: target collection}"""
+    fields = ((ir or {}).get("collections", {}).get(collection) or {}).get("fields") or {}
+    return {name: f["target"] for name, f in fields.items() if f.get("type") == "belongsTo" and f.get("target")}
+
+
+def resolve_references(
+    rows: Iterable[Row],
+    collection: str,
+    refs: Dict[str, str],
+    lookup: KeyLookup,
+    counts: Dict[str, int],
+    dry_run: bool = False,
+) -> Iterator[Row]:
+    """Replace natural-key belongsTo values by ids; rows with an unknown key are reported and counted as failed."""
+    for idx, row in rows:
+        missing = []
+        for field, target in refs.items():
+            value = row.get(field)
+            if value is None or isinstance(value, (int, dict)) and not isinstance(value, bool):
+                continue
+            record_id = lookup.resolve(target, value)
+            if record_id is None and str(value).isdigit():
+                record_id = int(value)
+            if record_id is None:
+                if not dry_run:
+                    missing.append(f"{field}: no {target} with {lookup.keys.get(target) or 'a natural key'}={value!r}")
+                continue
+            row = {**row, field: record_id}
+        if missing:
+            counts["unresolved"] = counts.get("unresolved", 0) + 1
+            say(f"[{collection} #{idx}] FAIL: {'; '.join(missing)}")
+            continue
+        yield idx, row
+
+
+def seed_levels(collections: List[str], ir: Optional[Dict[str, Any]]) -> List[List[str]]:
+    """Group collections so every one comes after the collections it references; a level's members are independent."""
+    pending = list(collections)
+    deps = {
+        name: set(((ir or {}).get("collections", {}).get(name) or {}).get("depends_on") or []) & set(collections)
+        for name in collections
     }
-    if role:
-        headers["X-Role"] = role
-    return headers
+    done: set = set()
+    levels: List[List[str]] = []
+    while pending:
+        ready = [name for name in pending if deps[name] <= done]
+        if not ready:
+            print(f"WARNING: circular belongsTo references among {', '.join(pending)}; seeding them together.",
+                  file=sys.stderr)
+            ready = pending
+        levels.append(ready)
+        done.update(ready)
+        pending = [name for name in pending if name not in done]
+    return levels
+
+
+def upsert_rows(
+    client: NocoBaseClient,
+    collection: str,
+    rows: Iterable[Row],
+    key: str,
+    args: argparse.Namespace,
+    fields: Optional[List[str]],
+    progress: Optional[Progress] = None,
+    lookup: Optional[KeyLookup] = None,
+) -> int:
+    """Create missing rows, update changed ones, skip identical ones. Returns the number of failed rows.
+
+    The key index is fetched before the first row is read, so ``rows`` can be
+    a stream; only the keys seen so far are kept to catch repeats.
+    """
+    try:
+        index = fetch_key_index(client, collection, key, fields)
+    except Exception as e:
+        say(f"[{collection}] ERROR reading existing {key} values: {e}")
+        return sum(1 for _ in rows)
+    on_created = None
+    if lookup is not None:
+        lookup.add(collection, index.values())
+        on_created = lambda records: lookup.add(collection, records)  # noqa: E731
+
+    failures = created = unchanged = 0
+    updated: List[int] = []
+    seen = set()
+    create_endpoint = client.url_for(f"{collection}:create")
+    update_endpoint = client.url_for(f"{collection}:update")
+    for chunk in iter_chunks(rows, args.chunk_size):
+        creates: List[Row] = []
+        updates: List[Tuple[int, Dict[str, Any], Any]] = []
+        for idx, row in chunk:
+            if row.get(key) is None:
+                say(f"[{collection} #{idx}] FAIL: no value for upsert key {key!r}")
+                failures += 1
+                continue
+            if row[key] in seen:
+                say(f"WARNING: seed.{collection}[{idx}] repeats {key}={row[key]!r}; skipping.")
+                continue
+            seen.add(row[key])
+            existing = index.get(row[key])
+            if existing is None:
+                creates.append((idx, row))
+            elif content_hash(row) != content_hash({field: existing.get(field) for field in row}):
+                updates.append((idx, row, existing.get("id")))
+            else:
+                unchanged += 1
+
+        created += len(creates)
+        failures += create_rows(
+            client, create_endpoint, collection, creates, args, quiet=progress is not None, on_created=on_created
+        )
+        for idx, row, record_id in updates:
+            updated.append(idx)
+            if args.dry_run:
+                say(f"DRY RUN: POST {update_endpoint}?filterByTk={record_id} body={row}")
+                continue
+            try:
+                resp = client.post(update_endpoint, params={"filterByTk": record_id}, json=row)
+            except Exception as e:
+                failures += 1
+                say(f"[{collection} #{idx}] ERROR {e}")
+                continue
+            if 200 <= resp.status_code < 300:
+                if progress is None:
+                    say(f"[{collection} #{idx}] HTTP {resp.status_code} OK (updated {key}={row[key]!r})")
+            else:
+                failures += 1
+                say(f"[{collection} #{idx}] HTTP {resp.status_code} FAIL: {error_text(resp)}")
+        if progress is not None:
+            progress.add(len(chunk))
+
+    say(f"[{collection}] upsert on {key}: {created} created, {len(updated)} updated, {unchanged} unchanged")
+    return failures
+
+
+def parse_sources(items: List[str]) -> List[Tuple[str, str]]:
+    """['et_servicios=data/servicios.csv', ...] -> [(collection, path), ...]"""
+    sources = []
+    for item in items:
+        collection, sep, path = item.partition("=")
+        if not sep or not collection.strip() or not path.strip():
+            raise SourceError(f"--from-file expects COLLECTION=PATH, got {item!r}")
+        sources.append((collection.strip(), path.strip()))
+    return sources
+
+
+def seed_file(
+    client: NocoBaseClient,
+    collection: str,
+    path: str,
+    ir: Optional[Dict[str, Any]],
+    mapping: Dict[str, str],
+    key: Optional[str],
+    args: argparse.Namespace,
+    lookup: KeyLookup,
+) -> int:
+    """Stream one source file into ``collection``. Returns the number of failed rows."""
+    entry = (ir or {}).get("collections", {}).get(collection)
+    fields = entry["fields"] if entry else None
+    if ir is not None and entry is None:
+        print(f"WARNING: {collection} is not in the blueprint; rows are sent unvalidated.", file=sys.stderr)
+
+    counts: Dict[str, int] = {}
+    rows = validate_rows(map_columns(iter_source(path), mapping, args.only_mapped), collection, fields, counts)
+    rows = resolve_references(rows, collection, reference_fields(ir, collection), lookup, counts, args.dry_run)
+    progress = Progress(collection)
+    try:
+        failures = send_rows(client, collection, rows, key, args, sorted(fields) if fields else None, lookup, progress)
+    finally:
+        progress.close()
+    return failures + counts.get("invalid", 0) + counts.get("unresolved", 0)
+
+
+def send_rows(
+    client: NocoBaseClient,
+    collection: str,
+    rows: Iterable[Row],
+    key: Optional[str],
+    args: argparse.Namespace,
+    fields: Optional[List[str]],
+    lookup: KeyLookup,
+    progress: Optional[Progress] = None,
+) -> int:
+    if key:
+        return upsert_rows(client, collection, rows, key, args, fields, progress, lookup)
+    return create_rows(
+        client, client.url_for(f"{collection}:create"), collection, rows, args, progress,
+        on_created=lambda records: lookup.add(collection, records),
+    )
+
+
+def seed_spec_rows(
+    client: NocoBaseClient,
+    collection: str,
+    rows: Any,
+    ir: Optional[Dict[str, Any]],
+    key: Optional[str],
+    args: argparse.Namespace,
+    lookup: KeyLookup,
+) -> int:
+    """Seed one collection's rows from the spec. Returns the number of failed rows."""
+    if not isinstance(rows, list):
+        say(f"WARNING: seed.{collection} is not a list; skipping.")
+        return 0
+    valid: List[Row] = []
+    for idx, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            say(f"WARNING: seed.{collection}[{idx}] is not an object; skipping.")
+            continue
+        valid.append((idx, row))
+
+    counts: Dict[str, int] = {}
+    valid = list(resolve_references(valid, collection, reference_fields(ir, collection), lookup, counts, args.dry_run))
+    fields = sorted({field for _, row in valid for field in row})
+    return send_rows(client, collection, valid, key, args, fields, lookup) + counts.get("unresolved", 0)
+
+
+def upsert_key_usable(ir: Optional[Dict[str, Any]], collection: str, key: Optional[str], rows: Any) -> bool:
+    """Whether ``key`` can identify ``collection``'s rows: some spec row has it, or (for files) the blueprint field exists."""
+    if not key:
+        return False
+    if rows is not None:
+        return not isinstance(rows, list) or any(isinstance(row, dict) and key in row for row in rows)
+    fields = ((ir or {}).get("collections", {}).get(collection) or {}).get("fields")
+    return fields is None or key in fields
 
 
 def main() -> int:
@@ -41,6 +505,36 @@ def main() -> int:
     parser.add_argument("--timeout", type=int, default=int(os.getenv("NOCOBASE_TIMEOUT_SECONDS", "30")))
     parser.add_argument("--verify-ssl", default=os.getenv("NOCOBASE_VERIFY_SSL", "true"))
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--chunk-size", type=int,
+        default=int(os.getenv("NOCOBASE_SEED_CHUNK_SIZE", str(DEFAULT_CHUNK_SIZE))),
+        help=f"Rows per create request (default {DEFAULT_CHUNK_SIZE}; 1 = one request per row)",
+    )
+    parser.add_argument(
+        "--upsert-key", default="", metavar="KEY|COLLECTION=KEY,...",
+        help="Natural key to upsert on instead of always creating (e.g. codigo, or et_servicios=codigo,departments=code)",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=int(os.getenv("NOCOBASE_SEED_JOBS", str(DEFAULT_JOBS))),
+        help=f"Collections seeded concurrently within a dependency level (default {DEFAULT_JOBS}; 1 = serial)",
+    )
+    parser.add_argument(
+        "--modules", default="",
+        help="Comma-separated blueprint sections whose seed to load (default: all, e.g. data_model,entrega,agenda)",
+    )
+    parser.add_argument(
+        "--from-file", action="append", default=[], metavar="COLLECTION=PATH[#SHEET]",
+        help="Load a collection from a .csv/.tsv/.ndjson/.xlsx/.parquet file instead of the spec seed (repeatable)",
+    )
+    parser.add_argument(
+        "--map", action="append", default=[], metavar="COLUMN=FIELD,...",
+        help="Rename file columns to fields (repeatable); unmapped columns keep their name",
+    )
+    parser.add_argument("--only-mapped", action="store_true", help="Ignore file columns that are not in --map")
+    parser.add_argument(
+        "--trace", nargs="?", const="-", metavar="REPORT",
+        help="Time every request and print per-endpoint percentiles as JSON (to stderr, or to REPORT)",
+    )
     args = parser.parse_args()
 
     if not args.base_url:
@@ -52,45 +546,99 @@ def main() -> int:
 
     verify_ssl = str_to_bool(args.verify_ssl)
     role = args.role if args.role else None
-    headers = build_headers(args.api_key, role)
-
-    with open(args.spec, "r", encoding="utf-8") as f:
-        spec = yaml.safe_load(f)
+    default_key, upsert_keys = parse_upsert_keys(args.upsert_key)
+    try:
+        sources = parse_sources(args.from_file)
+        mapping = parse_mapping(args.map)
+    except SourceError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
 
-    seed = spec.get("seed", {}) if isinstance(spec, dict) else {}
-    if not seed:
+    ir: Optional[Dict[str, Any]]
+    try:
+        ir = load_ir(args.spec)
+    except (OSError, SpecError) as e:
+        if not sources:
+            print(f"ERROR: cannot load {args.spec}: {e}", file=sys.stderr)
+            return 2
+        print(f"WARNING: cannot load {args.spec} ({e}); file rows are sent unvalidated.", file=sys.stderr)
+        ir = None
+    seed: Dict[str, Any] = {}
+    if not sources:
+        modules = [m.strip() for m in args.modules.split(",") if m.strip()]
+        unknown = [m for m in modules if m not in ir["modules"]]
+        if unknown:
+            print(f"ERROR: unknown module(s) {', '.join(unknown)}; the blueprint has: {', '.join(ir['modules'])}",
+                  file=sys.stderr)
+            return 2
+        if not modules or "data_model" in modules:
+            seed.update(ir["seed"])
+        for module in modules or list(ir["modules"]):
+            seed.update(ir["modules"][module]["seed"])
+    if not seed and not sources:
         print("No seed data found in spec.")
         return 0
 
-    base = args.base_url.rstrip("/") + "/"
-    failures = 0
+    client = NocoBaseClient.from_env(
+        base_url=args.base_url,
+        api_key=args.api_key,
+        role=role,
+        timeout_s=args.timeout,
+        verify_ssl=verify_ssl,
+        tracer=tracer_from_env(force=bool(args.trace), report_path=args.trace),
+    )
+    known = set((ir or {}).get("collections", {})) | set(seed) | {collection for collection, _ in sources}
+    keys = {name: natural_key(ir, name, default_key, upsert_keys) for name in known}
+    lookup = KeyLookup(client, {name: key for name, key in keys.items() if key})
 
-    for collection, rows in seed.items():
-        if not isinstance(rows, list):
-            print(f"WARNING: seed.{collection} is not a list; skipping.")
-            continue
-
-        endpoint = urljoin(base, f"api/{collection}:create")
-        for idx, row in enumerate(rows, start=1):
-            if not isinstance(row, dict):
-                print(f"WARNING: seed.{collection}[{idx}] is not an object; skipping.")
-                continue
+    files: Dict[str, List[str]] = {}
+    for collection, path in sources:
+        files.setdefault(collection, []).append(path)
 
-            if args.dry_run:
-                print(f"DRY RUN: POST {endpoint} body={row}")
-                continue
+    # --upsert-key applies the per-collection natural key; refuse up front rather
+    # than silently fall back to plain creates, which would duplicate rows on re-run.
+    targets = list(files) if sources else list(seed)
+    upsert = {name: keys[name] if default_key or name in upsert_keys else None for name in targets}
+    unusable = [name for name in targets if (default_key or name in upsert_keys) and not upsert_key_usable(
+        ir, name, upsert[name], None if name in files else seed[name]
+    )]
+    for name in unusable:
+        print(f"ERROR: --upsert-key: {name} has no {upsert[name] or 'natural key'!r} field in "
+              f"{'the blueprint' if name in files else 'its seed rows'}; choose one with {name}=KEY.", file=sys.stderr)
+    if unusable:
+        client.close()
+        return 2
 
-            resp = requests.post(endpoint, headers=headers, json=row, timeout=args.timeout, verify=verify_ssl)
-            ok = 200 <= resp.status_code < 300
-            print(f"[{collection} #{idx}] HTTP {resp.status_code} {'OK' if ok else 'FAIL'}")
+    def seed_collection(collection: str) -> int:
+        key = upsert[collection]
+        if collection not in files:
+            return seed_spec_rows(client, collection, seed[collection], ir, key, args, lookup)
+        failed = 0
+        for path in files[collection]:
+            try:
+                failed += seed_file(client, collection, path, ir, mapping, key, args, lookup)
+            except SourceError:
+                raise
+            except (OSError, ValueError) as e:
+                raise SourceError(f"{path}: {e}") from e
+        return failed
 
-            if not ok:
-                failures += 1
-                try:
-                    print(resp.json())
-                except Exception:
-                    print(resp.text)
+    levels = seed_levels(list(files) if sources else list(seed), ir)
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for number, level in enumerate(levels, start=1):
+            if len(levels) > 1:
+                say(f"[*] Level {number}/{len(levels)}: {', '.join(level)}")
+            try:
+                failures += sum(pool.map(seed_collection, level))
+            except SourceError as e:
+                print(f"ERROR: {e}", file=sys.stderr)
+                client.close()
+                return 2
 
+    client.close()
+    if not args.dry_run:
+        print(f"HTTP: {client.stats.summary()}")
     return 0 if failures == 0 else 1
 
 
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Streaming row sources for nocobase_seed.py: CSV, XLSX, Parquet and NDJSON files.
+
+Every stage is a generator, so a file of any size flows through with memory
+bounded by one chunk:
+
+  iter_source(path)            read    dicts keyed by column header
+  map_columns(rows, mapping)   map     column names -> NocoBase field names
+  validate_rows(rows, fields)  validate/coerce against the compiled blueprint
+  (nocobase_seed chunks and sends them)
+
+Readers:
+  .csv .tsv .txt    csv module (delimiter sniffed; UTF-8 with or without BOM)
+  .ndjson .jsonl    one JSON object per line
+  .xlsx .xlsm       openpyxl in read-only mode (pip install openpyxl)
+  .parquet          pyarrow, one record batch at a time (pip install pyarrow)
+
+An XLSX sheet is picked with ``path#Sheet``; the first sheet is used otherwise.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sys
+import time
+from datetime import date, datetime
+from datetime import time as dtime
+from decimal import Decimal
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+PARQUET_BATCH_ROWS = 10_000
+TRUE_WORDS = {"1", "true", "t", "yes", "y", "si", "sí", "s", "x", "verdadero"}
+FALSE_WORDS = {"0", "false", "f", "no", "n", "falso"}
+
+Row = Tuple[int, Dict[str, Any]]
+
+
+class SourceError(ValueError):
+    """A source file cannot be read (unknown format, missing optional reader)."""
+
+
+def split_sheet(spec: str) -> Tuple[Path, Optional[str]]:
+    path, _, sheet = spec.partition("#")
+    return Path(path), sheet or None
+
+
+def _iter_csv(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(64 * 1024)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel_tab if path.suffix.lower() == ".tsv" else csv.excel
+        yield from csv.DictReader(f, dialect=dialect)
+
+
+def _iter_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise SourceError(f"{path}:{lineno}: expected a JSON object per line")
+            yield record
+
+
+def _iter_xlsx(path: Path, sheet: Optional[str]) -> Iterator[Dict[str, Any]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise SourceError("reading .xlsx needs openpyxl (pip install openpyxl)") from None
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is not None and sheet not in workbook.sheetnames:
+            raise SourceError(f"{path}: no sheet {sheet!r} (sheets: {', '.join(workbook.sheetnames)})")
+        rows = (workbook[sheet] if sheet else workbook.worksheets[0]).iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c).strip() if c is not None else "" for c in header]
+        for values in rows:
+            if values is None or all(v is None for v in values):
+                continue
+            # Short rows get None for the missing columns, like csv.DictReader; cells past the header are dropped
+            yield {column: value for column, value in zip_longest(columns, values) if column}
+    finally:
+        workbook.close()
+
+
+def _iter_parquet(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SourceError("reading .parquet needs pyarrow (pip install pyarrow)") from None
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=PARQUET_BATCH_ROWS):
+        yield from batch.to_pylist()
+
+
+def iter_source(spec: str) -> Iterator[Dict[str, Any]]:
+    """Rows of a file as dicts keyed by column name (``path`` or ``path#Sheet``)."""
+    path, sheet = split_sheet(spec)
+    if not path.exists():
+        raise SourceError(f"{path} not found")
+    suffix = path.suffix.lower()
+    if suffix in (".csv", ".tsv", ".txt"):
+        return _iter_csv(path)
+    if suffix in (".ndjson", ".jsonl"):
+        return _iter_ndjson(path)
+    if suffix in (".xlsx", ".xlsm"):
+        return _iter_xlsx(path, sheet)
+    if suffix == ".parquet":
+        return _iter_parquet(path)
+    raise SourceError(f"{path}: unsupported format {suffix or '(none)'}; use csv, tsv, ndjson, jsonl, xlsx or parquet")
+
+
+def parse_mapping(items: Iterable[str]) -> Dict[str, str]:
+    """['Código=codigo,Nombre=nombre', ...] -> {'Código': 'codigo', 'Nombre': 'nombre'}"""
+    mapping: Dict[str, str] = {}
+    for item in items:
+        for pair in (p for p in item.split(",") if p.strip()):
+            if "=" not in pair:
+                raise SourceError(f"--map expects COLUMN=FIELD, got {pair!r}")
+            column, field = (x.strip() for x in pair.split("=", 1))
+            mapping[column] = field
+    return mapping
+
+
+def map_columns(rows: Iterable[Dict[str, Any]], mapping: Dict[str, str], only_mapped: bool = False) -> Iterator[Row]:
+    """Rename columns to fields and number the rows (1-based, data rows only).
+
+    Empty cells are dropped so the server applies its defaults.
+    """
+    for idx, row in enumerate(rows, start=1):
+        out: Dict[str, Any] = {}
+        for column, value in row.items():
+            field = mapping.get(column)
+            if field is None:
+                if only_mapped:
+                    continue
+                field = column
+            if value is None or (isinstance(value, str) and not value.strip()):
+                continue
+            out[field] = value
+        yield idx, out
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (date, dtime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def coerce(value: Any, field_type: Optional[str]) -> Any:
+    """Convert a cell to what a NocoBase field of ``field_type`` stores; raises ValueError."""
+    if field_type == "integer":
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, (int, float, Decimal)):
+            if value != int(value):
+                raise ValueError(f"{value!r} is not an integer")
+            return int(value)
+        return int(float(str(value).strip()))
+    if field_type == "boolean":
+        if isinstance(value, bool):
+            return value
+        word = str(value).strip().lower()
+        if word in TRUE_WORDS:
+            return True
+        if word in FALSE_WORDS:
+            return False
+        raise ValueError(f"{value!r} is not a boolean")
+    if field_type == "date" and isinstance(value, datetime):
+        return value.date().isoformat()
+    if field_type in ("string", "text"):
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))  # spreadsheet codes like 101.0
+        return value if isinstance(value, str) else str(_jsonable(value))
+    return _jsonable(value)
+
+
+def validate_rows(
+    rows: Iterable[Row],
+    collection: str,
+    fields: Optional[Dict[str, Dict[str, Any]]],
+    counts: Dict[str, int],
+) -> Iterator[Row]:
+    """Coerce values to the declared field types; invalid rows are reported and counted in ``counts["invalid"]``.
+
+    ``fields`` are the compiled field payloads of the collection (None when the
+    collection is not in the blueprint: rows then pass through untouched apart
+    from JSON conversion). Columns that are not fields are dropped, with one
+    warning per column.
+    """
+    required = [name for name, f in (fields or {}).items() if f.get("required")]
+    unknown_seen: set = set()
+    for idx, row in rows:
+        out: Dict[str, Any] = {}
+        problems = []
+        for name, value in row.items():
+            if fields is not None and name not in fields and name != "id":
+                if name not in unknown_seen:
+                    unknown_seen.add(name)
+                    print(f"WARNING: {collection} has no field {name!r}; column ignored.", file=sys.stderr)
+                continue
+            try:
+                out[name] = coerce(value, (fields or {}).get(name, {}).get("type"))
+            except (TypeError, ValueError) as e:
+                problems.append(f"{name}: {e}")
+        problems.extend(f"{name}: required" for name in required if out.get(name) is None)
+        if problems:
+            counts["invalid"] = counts.get("invalid", 0) + 1
+            sys.stdout.write(f"[{collection} #{idx}] INVALID: {'; '.join(problems)}\n")
+            continue
+        yield idx, out
+
+
+class Progress:
+    """Rows-per-second meter on stderr, redrawn at most once a second."""
+
+    def __init__(self, label: str, stream: io.TextIOBase = sys.stderr) -> None:
+        self.label = label
+        self.stream = stream
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._drawn = self.started
+        self._tty = stream.isatty()
+
+    def add(self, count: int) -> None:
+        self.rows += count
+        now = time.perf_counter()
+        if now - self._drawn >= 1.0:
+            self._drawn = now
+            self._draw("\r" if self._tty else "", "" if self._tty else "\n")
+
+    def _draw(self, start: str, end: str) -> None:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        self.stream.write(f"{start}[{self.label}] {self.rows:,} rows, {self.rows / elapsed:,.0f} rows/s{end}")
+        self.stream.flush()
+
+    def close(self) -> None:
+        self._draw("\r" if self._tty else "", f" in {time.perf_counter() - self.started:.1f}s\n")
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Blueprint compiler: app-spec/app.yaml -> cached JSON intermediate representation.
+
+Parsing the 1,500-line blueprint with the pure-Python YAML loader costs a few
+hundred milliseconds per tool run. ``load_ir`` parses it once (with the libyaml
+C loader when PyYAML was built with it), normalizes it and caches the result as
+JSON under ``.nocobase/``; later runs reuse the cache while the file's mtime and
+size, or failing that its sha256, are unchanged.
+
+The IR holds:
+  collections  name -> module, raw definition, resolved collection payload,
+               resolved field payloads (build_field_payload), depends_on
+               (belongsTo targets) and a content hash
+  roles        name -> module, definition, hash
+  pages        key  -> module, definition, hash
+  modules      module -> collection names, seed section
+  seed         the top-level seed: section (what nocobase_seed.py loads)
+  problems     broken references found while compiling (role/page/menu ->
+               collection, page column -> field, belongsTo -> target)
+
+Hashes are sha256 over canonical JSON, so reformatting or reordering the YAML
+does not change them. ``DeployState`` remembers, per NocoBase base URL, the hash
+of every collection as of its last successful deploy so nocobase_configure.py
+can skip unchanged collections without touching the server.
+
+Usage:
+  python nocobase_spec.py                 # compile, print a summary + problems
+  python nocobase_spec.py --json          # print the whole IR
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+STATE_DIR = REPO_ROOT / ".nocobase"
+IR_VERSION = 1
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class SpecError(ValueError):
+    """The blueprint cannot be compiled (duplicate or malformed definitions)."""
+
+
+def content_hash(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """Parse a YAML blueprint (C loader when available)."""
+    with open(path, "r", encoding="utf-8") as f:
+        spec = yaml.load(f, Loader=SafeLoader)
+    return spec if isinstance(spec, dict) else {}
+
+
+# ── Payloads ──────────────────────────────────────────────────────────────────
+
+FIELD_TYPES = {
+    "string": {"type": "string", "interface": None},
+    "integer": {"type": "integer", "interface": "integer"},
+    "boolean": {"type": "boolean", "interface": "checkbox"},
+    "date": {"type": "date", "interface": "date"},
+    "datetime": {"type": "datetime", "interface": "datetime"},
+    "text": {"type": "text", "interface": "textarea"},
+    "belongsTo": {"type": "belongsTo", "interface": "m2o"},
+}
+
+FIELD_COMPONENTS = {
+    "string": {"x-component": "Input"},
+    "integer": {"x-component": "InputNumber"},
+    "boolean": {"x-component": "Checkbox"},
+    "date": {"x-component": "DatePicker"},
+    "datetime": {"x-component": "DatePicker", "showTime": True},
+    "text": {"x-component": "Input.TextArea"},
+}
+
+
+def build_field_payload(field_def: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate a YAML field definition to a NocoBase fields:create payload."""
+    field_type = field_def.get("type", "string")
+    field_name = field_def["name"]
+    payload: Dict[str, Any] = {"name": field_name, "type": field_type}
+    payload.update(FIELD_TYPES.get(field_type, {}))
+
+    if field_type == "belongsTo":
+        payload["target"] = field_def.get("target")
+        payload["foreignKey"] = field_def.get("foreignKey")
+
+    # Without an explicit uiSchema, derive a title and a component from the type
+    ui_schema = field_def.get("uiSchema", {})
+    if not ui_schema:
+        ui_schema = {"title": field_def.get("title", field_name.replace("_", " ").title())}
+        ui_schema.update(FIELD_COMPONENTS.get(field_type, {}))
+    payload["uiSchema"] = ui_schema
+
+    if field_def.get("required"):
+        payload["required"] = True
+    if field_def.get("unique"):
+        payload["unique"] = True
+    if "default" in field_def:
+        payload["defaultValue"] = field_def["default"]
+    return payload
+
+
+def build_collection_payload(collection_def: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate a YAML collection definition to a collections:create payload (without fields)."""
+    return {
+        "name": collection_def["name"],
+        "title": collection_def.get("title", collection_def["name"]),
+        "inherit": False,
+        "hidden": False,
+    }
+
+
+# ── Compiler ──────────────────────────────────────────────────────────────────
+
+def blueprint_modules(spec: Dict[str, Any]) -> List[str]:
+    """Top-level sections of app.yaml that declare collections, in file order."""
+    return [
+        name for name, section in spec.items()
+        if isinstance(section, dict) and isinstance(section.get("collections"), list)
+    ]
+
+
+def _roles_and_pages(spec: Dict[str, Any], module: str) -> Dict[str, Any]:
+    """roles/ui of a module section; data_model's live at the top level of app.yaml."""
+    section = spec if module == "data_model" else spec.get(module, {})
+    ui = section.get("ui") or {}
+    return {
+        "roles": section.get("roles") or [],
+        "pages": ui.get("pages") or [],
+        "menus": ui.get("menus") or [],
+        "seed": (spec.get("seed") if module == "data_model" else section.get("seed")) or {},
+    }
+
+
+def _menu_page_keys(menus: List[Any]) -> List[str]:
+    keys = []
+    for menu in menus:
+        if isinstance(menu, dict):
+            if menu.get("page_key"):
+                keys.append(menu["page_key"])
+            keys.extend(_menu_page_keys(menu.get("children") or []))
+    return keys
+
+
+def compile_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a parsed blueprint into the IR described in the module docstring."""
+    collections: Dict[str, Dict[str, Any]] = {}
+    roles: Dict[str, Dict[str, Any]] = {}
+    pages: Dict[str, Dict[str, Any]] = {}
+    modules: Dict[str, Dict[str, Any]] = {}
+    menu_keys: List[tuple] = []
+    problems: List[str] = []
+
+    for module in blueprint_modules(spec):
+        names = []
+        for coll in spec[module]["collections"]:
+            if not isinstance(coll, dict) or not coll.get("name"):
+                raise SpecError(f"{module}.collections: every collection needs a name")
+            name = coll["name"]
+            if name in collections:
+                raise SpecError(f"collection {name} is declared in both {collections[name]['module']} and {module}")
+            fields: Dict[str, Dict[str, Any]] = {}
+            for field in coll.get("fields") or []:
+                if not isinstance(field, dict) or not field.get("name"):
+                    raise SpecError(f"{module}.{name}: every field needs a name")
+                if field["name"] in fields:
+                    raise SpecError(f"{module}.{name}: field {field['name']} is declared twice")
+                fields[field["name"]] = build_field_payload(field)
+            payload = build_collection_payload(coll)
+            depends_on = sorted({
+                f["target"] for f in fields.values()
+                if f.get("type") == "belongsTo" and f.get("target") and f["target"] != name
+            })
+            collections[name] = {
+                "module": module,
+                "definition": coll,
+                "payload": payload,
+                "fields": fields,
+                "depends_on": depends_on,
+                "hash": content_hash({"payload": payload, "fields": fields}),
+            }
+            names.append(name)
+
+        extras = _roles_and_pages(spec, module)
+        for role in extras["roles"]:
+            if isinstance(role, dict) and role.get("name"):
+                roles[role["name"]] = {"module": module, "definition": role, "hash": content_hash(role)}
+        for page in extras["pages"]:
+            if isinstance(page, dict) and page.get("key"):
+                pages[page["key"]] = {"module": module, "definition": page, "hash": content_hash(page)}
+        menu_keys.extend((module, key) for key in _menu_page_keys(extras["menus"]))
+        modules[module] = {"collections": names, "seed": extras["seed"]}
+
+    # Reference checks
+    for name, coll in collections.items():
+        for field in coll["fields"].values():
+            if field.get("type") == "belongsTo":
+                if not field.get("target"):
+                    problems.append(f"{name}.{field['name']}: belongsTo without target")
+                elif field["target"] not in collections:
+                    problems.append(f"{name}.{field['name']}: belongsTo target {field['target']} is not declared")
+    for role_name, role in roles.items():
+        perms = (role["definition"].get("permissions") or {}).get("collections") or {}
+        for coll_name in perms:
+            if coll_name not in collections:
+                problems.append(f"role {role_name}: permission on undeclared collection {coll_name}")
+    for key, page in pages.items():
+        definition = page["definition"]
+        coll_name = definition.get("collection")
+        if coll_name and coll_name not in collections:
+            problems.append(f"page {key}: collection {coll_name} is not declared")
+            continue
+        known = set(collections[coll_name]["fields"]) if coll_name else set()
+        for column in definition.get("columns") or []:
+            if known and column not in known:
+                problems.append(f"page {key}: column {column} is not a field of {coll_name}")
+    for module, key in menu_keys:
+        if key not in pages:
+            problems.append(f"{module} menu: page_key {key} has no page")
+
+    return {
+        "version": IR_VERSION,
+        "collections": collections,
+        "roles": roles,
+        "pages": pages,
+        "modules": modules,
+        "seed": spec.get("seed") or {},
+        "problems": problems,
+    }
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+def _cache_path(spec_path: Path) -> Path:
+    tag = hashlib.sha1(str(spec_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return STATE_DIR / "ir" / f"{spec_path.stem}-{tag}.json"
+
+
+def _write_json(path: Path, value: Any) -> None:
+    """Atomic replace, so a concurrent reader never sees half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_ir(spec_path: str, use_cache: bool = True) -> Dict[str, Any]:
+    """Compiled IR of ``spec_path``, from the cache when the file has not changed."""
+    path = Path(spec_path)
+    stat = path.stat()
+    cache = _cache_path(path)
+    cached = None
+    if use_cache and cache.exists():
+        try:
+            with open(cache, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+    if cached and cached.get("version") == IR_VERSION:
+        source = cached.get("source") or {}
+        if source.get("mtime_ns") == stat.st_mtime_ns and source.get("size") == stat.st_size:
+            return cached
+
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached.get("version") == IR_VERSION and (cached.get("source") or {}).get("sha256") == digest:
+        ir = cached  # touched but not edited
+    else:
+        spec = yaml.load(raw.decode("utf-8"), Loader=SafeLoader)
+        ir = compile_spec(spec if isinstance(spec, dict) else {})
+    ir["source"] = {"path": str(path), "sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if use_cache:
+        try:
+            _write_json(cache, ir)
+        except OSError as e:
+            print(f"WARNING: could not cache the compiled blueprint at {cache}: {e}", file=sys.stderr)
+    return ir
+
+
+# ── Deploy state ──────────────────────────────────────────────────────────────
+
+class DeployState:
+    """Collection hashes as of the last successful deploy, per NocoBase instance."""
+
+    def __init__(self, base_url: str, path: Optional[Path] = None) -> None:
+        self.path = path or STATE_DIR / "deploy-state.json"
+        self.base_url = base_url.rstrip("/")
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._all = json.load(f)
+        except (OSError, ValueError):
+            self._all = {}
+        self.collections: Dict[str, str] = dict((self._all.get(self.base_url) or {}).get("collections") or {})
+
+    def unchanged(self, name: str, digest: str) -> bool:
+        return self.collections.get(name) == digest
+
+    def record(self, name: str, digest: str) -> None:
+        self.collections[name] = digest
+
+    def save(self) -> None:
+        self._all[self.base_url] = {
+            "collections": self.collections,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        _write_json(self.path, self._all)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile app.yaml into the cached JSON IR used by the Python tools")
+    parser.add_argument("--spec", default="app-spec/app.yaml")
+    parser.add_argument("--no-cache", action="store_true", help="Recompile even if the cached IR is current")
+    parser.add_argument("--json", action="store_true", help="Print the whole IR")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.spec):
+        print(f"ERROR: {args.spec} not found", file=sys.stderr)
+        return 2
+    try:
+        ir = load_ir(args.spec, use_cache=not args.no_cache)
+    except SpecError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(ir, indent=2, ensure_ascii=False))
+        return 0
+    fields = sum(len(c["fields"]) for c in ir["collections"].values())
+    print(f"{ir['source']['path']} sha256={ir['source']['sha256'][:12]}")
+    for module, info in ir["modules"].items():
+        print(f"  {module}: {len(info['collections'])} collection(s)")
+    print(f"  {len(ir['collections'])} collections, {fields} fields, {len(ir['roles'])} roles, {len(ir['pages'])} pages")
+    for problem in ir["problems"]:
+        print(f"  [WARN] {problem}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,742 @@
+#!/usr/bin/env python3
+"""Local stand-in for the NocoBase Resource:Action API, for offline tests and benchmarks.
+
+Implements the subset of the API our Python tooling calls, backed by SQLite
+(in memory by default):
+
+  {collection}:list|get|create|update|destroy|firstOrCreate|updateOrCreate
+      filter (NocoBase operators: $eq $ne $in $notIn $gt $gte $lt $lte
+      $includes $notIncludes $empty $notEmpty, $and/$or), filterByTk, sort,
+      page/pageSize, paginate=false, fields (projection); create also takes
+      an array body (all rows or none)
+  collections:create|list|get          (inline "fields" are created too;
+                                        list honours appends=fields)
+  collections/{name}/fields:create|list|...
+  roles:*, roles/{role}/resources:*    (keyed by name)
+  desktopRoutes:*
+  uiSchemas:insert|insertAdjacent/{uid}|getJsonSchema/{uid}|getProperties/{uid}|patch|remove/{uid}
+  swagger:get[?ns=collections/{name}]  (OpenAPI built from the stored collections)
+
+Unknown collections are created on first use unless --strict is given. Fields
+declared ``unique`` through collections/fields:create are enforced (HTTP 400,
+like the real server). GET responses carry an ETag and answer If-None-Match
+with 304.
+
+Fault injection, applied to every /api request:
+  --latency-ms / --jitter-ms   added delay (uniform in latency +/- jitter)
+  --error-rate                 fraction of requests answered with an error
+  --error-status               comma-separated statuses to pick from (default 503)
+
+Introspection: GET /__standin/stats (requests per endpoint), POST /__standin/reset.
+
+Usage:
+  python shared/python/nocobase_standin.py --port 13000 --latency-ms 5 --error-rate 0.01
+  NOCOBASE_BASE_URL=http://127.0.0.1:13000/api python shared/python/nocobase_configure.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+DEFAULT_PORT = 13000
+DEFAULT_PAGE_SIZE = 20
+# Resources whose filterByTk is the record name instead of its numeric id
+NAME_KEYED = {"collections", "roles", "collections.fields", "roles.resources"}
+COMPARISONS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+
+class StandInError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def json_path(field: str) -> str:
+    if not field or any(c in field for c in "\"'\\"):
+        raise StandInError(400, f"Unsupported field name in filter/sort: {field!r}")
+    return f"json_extract(data, '$.\"{field}\"')"
+
+
+def filter_sql(flt: Any, args: List[Any], fields: set) -> str:
+    """Translate a NocoBase filter object into a SQL condition over the JSON ``data`` column."""
+    if not flt:
+        return "1"
+    if not isinstance(flt, dict):
+        raise StandInError(400, "filter must be an object")
+    parts: List[str] = []
+    for key, cond in flt.items():
+        if key in ("$and", "$or"):
+            if not isinstance(cond, list):
+                raise StandInError(400, f"{key} expects a list")
+            inner = [filter_sql(c, args, fields) for c in cond] or ["1"]
+            parts.append("(" + (" AND " if key == "$and" else " OR ").join(inner) + ")")
+            continue
+        if key == "id":
+            column = "id"
+        else:
+            column = json_path(key)
+            fields.add(key)
+        if not isinstance(cond, dict):
+            cond = {"$eq": cond}
+        for op, value in cond.items():
+            if op in ("$eq", "$ne"):
+                if value is None:
+                    parts.append(f"{column} IS {'NOT ' if op == '$ne' else ''}NULL")
+                else:
+                    parts.append(f"{column} {'=' if op == '$eq' else '!='} ?")
+                    args.append(value)
+            elif op in ("$in", "$notIn"):
+                values = value if isinstance(value, list) else [value]
+                if not values:
+                    parts.append("0" if op == "$in" else "1")
+                    continue
+                parts.append(f"{column} {'IN' if op == '$in' else 'NOT IN'} ({', '.join('?' * len(values))})")
+                args.extend(values)
+            elif op in COMPARISONS:
+                parts.append(f"{column} {COMPARISONS[op]} ?")
+                args.append(value)
+            elif op in ("$includes", "$notIncludes"):
+                parts.append(f"{column} {'LIKE' if op == '$includes' else 'NOT LIKE'} ?")
+                args.append(f"%{value}%")
+            elif op in ("$empty", "$notEmpty"):
+                empty = f"({column} IS NULL OR {column} = '')"
+                parts.append(empty if op == "$empty" else f"NOT {empty}")
+            else:
+                raise StandInError(400, f"Unsupported filter operator: {op}")
+    return " AND ".join(parts) if parts else "1"
+
+
+def order_sql(sort: Any) -> str:
+    if not sort:
+        return "ORDER BY id"
+    if isinstance(sort, str):
+        sort = [s for s in sort.split(",") if s.strip()]
+    clauses = []
+    for item in sort:
+        item = item.strip()
+        desc = item.startswith("-")
+        name = item.lstrip("-")
+        clauses.append(("id" if name == "id" else json_path(name)) + (" DESC" if desc else " ASC"))
+    return "ORDER BY " + ", ".join(clauses + ["id"])
+
+
+class Store:
+    """Records of every resource in one SQLite database, one table per resource."""
+
+    def __init__(self, path: str = ":memory:", strict: bool = False) -> None:
+        self.path = path
+        self.strict = strict
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL" if path != ":memory:" else "PRAGMA journal_mode=MEMORY")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._tables: set = set()
+        self._indexes: set = set()
+        self._unique: Dict[str, List[str]] = {}
+        self._create_schema_table()
+
+    def _create_schema_table(self) -> None:
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ui_schemas (uid TEXT PRIMARY KEY, parent TEXT, sort REAL NOT NULL,"
+            " name TEXT NOT NULL, data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ui_schemas_parent ON ui_schemas (parent, sort)")
+
+    def reset(self) -> None:
+        with self._lock:
+            tables = [
+                r[0] for r in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+                if not r[0].startswith("sqlite_")
+            ]
+            for table in tables:
+                self._conn.execute(f"DROP TABLE IF EXISTS {quote_ident(table)}")
+            self._tables.clear()
+            self._indexes.clear()
+            self._unique.clear()
+            self._create_schema_table()
+
+    # -- tables -----------------------------------------------------------------
+
+    def _table(self, resource: str, create: bool = True) -> str:
+        table = f"r:{resource}"
+        if table not in self._tables:
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            if not exists:
+                if not create:
+                    raise StandInError(404, f"Collection '{resource}' not found")
+                self._conn.execute(
+                    f"CREATE TABLE {quote_ident(table)} (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " parent TEXT, data TEXT NOT NULL)"
+                )
+                self._conn.execute(f"CREATE INDEX {quote_ident(table + ':parent')} ON {quote_ident(table)} (parent)")
+            self._tables.add(table)
+        return table
+
+    def _ensure_index(self, table: str, field: str) -> None:
+        key = (table, field)
+        if key in self._indexes or field == "id":
+            return
+        name = f"{table}:ix:{hashlib.sha1(field.encode()).hexdigest()[:12]}"
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {quote_ident(name)} ON {quote_ident(table)} ({json_path(field)})")
+        self._indexes.add(key)
+
+    def _known(self, resource: str) -> bool:
+        if resource in ("collections", "roles", "desktopRoutes", "collections.fields", "roles.resources"):
+            return True
+        row = self._conn.execute(
+            f"SELECT 1 FROM {quote_ident(self._table('collections'))} WHERE {json_path('name')} = ?", (resource,)
+        ).fetchone()
+        return row is not None
+
+    def table_for(self, resource: str) -> str:
+        if self.strict and not self._known(resource):
+            raise StandInError(404, f"Collection '{resource}' not found")
+        return self._table(resource)
+
+    def unique_fields(self, resource: str) -> List[str]:
+        if "." in resource:
+            return ["name"]
+        if resource not in self._unique:
+            rows = self._conn.execute(
+                f"SELECT data FROM {quote_ident(self._table('collections.fields'))} WHERE parent = ?", (resource,)
+            ).fetchall()
+            self._unique[resource] = [
+                f["name"] for f in (json.loads(r[0]) for r in rows) if f.get("unique") or f.get("primaryKey")
+            ]
+            if resource in NAME_KEYED and "name" not in self._unique[resource]:
+                self._unique[resource].append("name")
+        return self._unique[resource]
+
+    # -- queries ----------------------------------------------------------------
+
+    def _where(
+        self, table: str, parent: Optional[str], flt: Any, tk: Any, resource: str
+    ) -> Tuple[str, List[Any]]:
+        args: List[Any] = []
+        fields: set = set()
+        clauses = [filter_sql(flt, args, fields)]
+        if parent is not None:
+            clauses.append("parent = ?")
+            args.append(parent)
+        if tk is not None:
+            if resource in NAME_KEYED:
+                clauses.append(f"{json_path('name')} = ?")
+                fields.add("name")
+            else:
+                clauses.append("id = ?")
+            args.append(tk)
+        for field in fields:
+            self._ensure_index(table, field)
+        return " AND ".join(clauses), args
+
+    def list(
+        self,
+        resource: str,
+        parent: Optional[str] = None,
+        flt: Any = None,
+        tk: Any = None,
+        sort: Any = None,
+        page: int = 1,
+        page_size: Optional[int] = DEFAULT_PAGE_SIZE,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        with self._lock:
+            table = self.table_for(resource)
+            where, args = self._where(table, parent, flt, tk, resource)
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {quote_ident(table)} WHERE {where}", args).fetchone()[0]
+            sql = f"SELECT id, data FROM {quote_ident(table)} WHERE {where} {order_sql(sort)}"
+            if page_size:
+                sql += f" LIMIT {int(page_size)} OFFSET {int((max(page, 1) - 1) * page_size)}"
+            rows = self._conn.execute(sql, args).fetchall()
+        return [{"id": row_id, **json.loads(data)} for row_id, data in rows], count
+
+    def get(self, resource: str, parent: Optional[str] = None, flt: Any = None, tk: Any = None) -> Optional[Dict[str, Any]]:
+        rows, _ = self.list(resource, parent, flt, tk, page_size=1)
+        return rows[0] if rows else None
+
+    def _check_unique(self, table: str, resource: str, parent: Optional[str], record: Dict[str, Any], own_id: Any) -> None:
+        for field in self.unique_fields(resource):
+            if record.get(field) is None:
+                continue
+            self._ensure_index(table, field)
+            sql = f"SELECT id FROM {quote_ident(table)} WHERE {json_path(field)} = ?"
+            args: List[Any] = [record[field]]
+            if parent is not None:
+                sql += " AND parent = ?"
+                args.append(parent)
+            row = self._conn.execute(sql, args).fetchone()
+            if row is not None and row[0] != own_id:
+                raise StandInError(400, f"{field} must be unique ({resource}.{field} = {record[field]!r} already exists)")
+
+    def create(self, resource: str, values: Dict[str, Any], parent: Optional[str] = None) -> Dict[str, Any]:
+        if not isinstance(values, dict):
+            raise StandInError(400, "create expects a JSON object")
+        with self._lock:
+            table = self.table_for(resource)
+            record = {k: v for k, v in values.items() if k != "id"}
+            stamp = now_iso()
+            record.setdefault("createdAt", stamp)
+            record["updatedAt"] = stamp
+            if resource == "collections.fields":
+                record["collectionName"] = parent
+            if resource == "roles.resources":
+                record["roleName"] = parent
+            self._check_unique(table, resource, parent, record, None)
+            cur = self._conn.execute(
+                f"INSERT INTO {quote_ident(table)} (parent, data) VALUES (?, ?)", (parent, json.dumps(record))
+            )
+            if resource == "collections.fields":
+                self._unique.pop(parent or "", None)
+        return {"id": cur.lastrowid, **record}
+
+    def create_many(self, resource: str, rows: List[Any], parent: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All-or-nothing insert, like NocoBase's create with an array body (one transaction)."""
+        with self._lock:
+            table = self.table_for(resource)
+            self._conn.execute("SAVEPOINT create_many")
+            try:
+                created = [self.create(resource, row, parent) for row in rows]
+            except BaseException:
+                self._conn.execute("ROLLBACK TO create_many")
+                self._conn.execute("RELEASE create_many")
+                # Indexes created inside the savepoint were rolled back too
+                self._indexes = {key for key in self._indexes if key[0] != table}
+                raise
+            self._conn.execute("RELEASE create_many")
+        return created
+
+    def update(
+        self, resource: str, values: Dict[str, Any], parent: Optional[str] = None, flt: Any = None, tk: Any = None
+    ) -> List[Dict[str, Any]]:
+        if not isinstance(values, dict):
+            raise StandInError(400, "update expects a JSON object")
+        if not flt and tk is None:
+            raise StandInError(400, "update requires filterByTk or filter")
+        with self._lock:
+            table = self.table_for(resource)
+            where, args = self._where(table, parent, flt, tk, resource)
+            rows = self._conn.execute(f"SELECT id, data FROM {quote_ident(table)} WHERE {where}", args).fetchall()
+            updated = []
+            stamp = now_iso()
+            for row_id, data in rows:
+                record = {**json.loads(data), **{k: v for k, v in values.items() if k != "id"}, "updatedAt": stamp}
+                self._check_unique(table, resource, parent, record, row_id)
+                self._conn.execute(f"UPDATE {quote_ident(table)} SET data = ? WHERE id = ?", (json.dumps(record), row_id))
+                updated.append({"id": row_id, **record})
+            if resource == "collections.fields":
+                self._unique.pop(parent or "", None)
+        return updated
+
+    def destroy(self, resource: str, parent: Optional[str] = None, flt: Any = None, tk: Any = None) -> int:
+        if not flt and tk is None:
+            raise StandInError(400, "destroy requires filterByTk or filter")
+        with self._lock:
+            table = self.table_for(resource)
+            where, args = self._where(table, parent, flt, tk, resource)
+            cur = self._conn.execute(f"DELETE FROM {quote_ident(table)} WHERE {where}", args)
+            if resource == "collections.fields":
+                self._unique.pop(parent or "", None)
+        return cur.rowcount
+
+    # -- uiSchemas --------------------------------------------------------------
+
+    def insert_schema(
+        self, schema: Dict[str, Any], parent: Optional[str] = None, sort: Optional[float] = None, name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if not isinstance(schema, dict):
+            raise StandInError(400, "schema must be an object")
+        with self._lock:
+            uid = schema.get("x-uid") or uuid.uuid4().hex[:11]
+            node = {k: v for k, v in schema.items() if k != "properties"}
+            node["x-uid"] = uid
+            node_name = name or schema.get("name") or uid
+            node["name"] = node_name
+            if sort is None:
+                row = self._conn.execute("SELECT MAX(sort) FROM ui_schemas WHERE parent IS ?", (parent,)).fetchone()
+                sort = (row[0] or 0) + 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ui_schemas (uid, parent, sort, name, data) VALUES (?, ?, ?, ?, ?)",
+                (uid, parent, sort, node_name, json.dumps(node)),
+            )
+            for index, (child_name, child) in enumerate((schema.get("properties") or {}).items(), start=1):
+                self.insert_schema(child, uid, float(child.get("x-index", index)), child_name)
+        return self.schema_tree(uid)
+
+    def insert_adjacent(self, target: str, position: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT parent, sort FROM ui_schemas WHERE uid = ?", (target,)).fetchone()
+            if row is None:
+                raise StandInError(404, f"uiSchema '{target}' not found")
+            parent, sort = row
+            if position == "beforeEnd":
+                return self.insert_schema(schema, target)
+            if position == "afterBegin":
+                first = self._conn.execute("SELECT MIN(sort) FROM ui_schemas WHERE parent = ?", (target,)).fetchone()[0]
+                return self.insert_schema(schema, target, (first or 1) - 1)
+            if position in ("beforeBegin", "afterEnd"):
+                return self.insert_schema(schema, parent, sort + (-0.5 if position == "beforeBegin" else 0.5))
+        raise StandInError(400, f"Unsupported position: {position}")
+
+    def schema_tree(self, uid: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM ui_schemas WHERE uid = ?", (uid,)).fetchone()
+            if row is None:
+                raise StandInError(404, f"uiSchema '{uid}' not found")
+            node = json.loads(row[0])
+            properties = self.schema_properties(uid)
+        if properties:
+            node["properties"] = properties
+        return node
+
+    def schema_properties(self, uid: str) -> Dict[str, Any]:
+        with self._lock:
+            children = self._conn.execute(
+                "SELECT uid, name FROM ui_schemas WHERE parent = ? ORDER BY sort", (uid,)
+            ).fetchall()
+            return {name: self.schema_tree(child_uid) for child_uid, name in children}
+
+    def patch_schema(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        uid = values.get("x-uid")
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM ui_schemas WHERE uid = ?", (uid,)).fetchone()
+            if row is None:
+                raise StandInError(404, f"uiSchema '{uid}' not found")
+            node = {**json.loads(row[0]), **{k: v for k, v in values.items() if k != "properties"}}
+            self._conn.execute("UPDATE ui_schemas SET data = ? WHERE uid = ?", (json.dumps(node), uid))
+        return self.schema_tree(uid)
+
+    def remove_schema(self, uid: str) -> None:
+        with self._lock:
+            for (child,) in self._conn.execute("SELECT uid FROM ui_schemas WHERE parent = ?", (uid,)).fetchall():
+                self.remove_schema(child)
+            self._conn.execute("DELETE FROM ui_schemas WHERE uid = ?", (uid,))
+
+
+# -- swagger ----------------------------------------------------------------------
+
+FIELD_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "integer": {"type": "integer"},
+    "bigInt": {"type": "integer"},
+    "double": {"type": "number"},
+    "float": {"type": "number"},
+    "decimal": {"type": "number"},
+    "boolean": {"type": "boolean"},
+    "date": {"type": "string", "format": "date"},
+    "datetime": {"type": "string", "format": "date-time"},
+    "json": {"type": "object"},
+    "belongsTo": {"type": "object"},
+}
+
+
+def swagger_document(store: Store, ns: Optional[str]) -> Dict[str, Any]:
+    collections, _ = store.list("collections", page_size=None)
+    if ns and ns.startswith("collections/"):
+        wanted = ns.split("/", 1)[1]
+        collections = [c for c in collections if c.get("name") == wanted]
+    elif ns and ns != "collections":
+        collections = []
+    paths: Dict[str, Any] = {}
+    schemas: Dict[str, Any] = {}
+    for coll in collections:
+        name = coll["name"]
+        fields, _ = store.list("collections.fields", parent=name, page_size=None)
+        properties: Dict[str, Any] = {"id": {"type": "integer"}}
+        required: List[str] = []
+        for field in fields:
+            properties[field["name"]] = dict(FIELD_SCHEMAS.get(field.get("type", "string"), {"type": "string"}))
+            if field.get("type") == "belongsTo" and field.get("foreignKey"):
+                properties.setdefault(field["foreignKey"], {"type": "integer"})
+            if field.get("required"):
+                required.append(field["name"])
+        schema: Dict[str, Any] = {"type": "object", "properties": properties}
+        if required:
+            schema["required"] = required
+        schemas[name] = schema
+        ref = {"$ref": f"#/components/schemas/{name}"}
+        body = {"content": {"application/json": {"schema": ref}}}
+        tk = [{"name": "filterByTk", "in": "query", "schema": {"type": "integer"}}]
+        paths[f"/{name}:list"] = {"get": {"tags": [name], "parameters": [
+            {"name": n, "in": "query", "schema": {"type": t}}
+            for n, t in (("filter", "object"), ("sort", "string"), ("page", "integer"), ("pageSize", "integer"))
+        ]}}
+        paths[f"/{name}:get"] = {"get": {"tags": [name], "parameters": tk}}
+        paths[f"/{name}:create"] = {"post": {"tags": [name], "requestBody": body}}
+        paths[f"/{name}:update"] = {"post": {"tags": [name], "parameters": tk, "requestBody": body}}
+        paths[f"/{name}:destroy"] = {"post": {"tags": [name], "parameters": tk}}
+    return {
+        "openapi": "3.0.2",
+        "info": {"title": "NocoBase API (stand-in)", "version": "1.0.0"},
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+# -- HTTP layer -------------------------------------------------------------------
+
+
+class Faults:
+    """Injected latency and error responses."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Optional[List[int]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [503]
+        self.rng = random.Random(seed)
+
+    def delay_s(self) -> float:
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return 0.0
+        return max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+
+    def error_status(self) -> Optional[int]:
+        if self.error_rate > 0 and self.rng.random() < self.error_rate:
+            return self.rng.choice(self.error_statuses)
+        return None
+
+
+def json_response(request: Request, payload: Any, status: int = 200) -> Response:
+    content = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    headers: Dict[str, str] = {}
+    if request.method == "GET" and status == 200:
+        etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+        headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+    return Response(content=content, status_code=status, media_type="application/json", headers=headers)
+
+
+def parse_json_param(value: Optional[str]) -> Any:
+    if value is None or value == "":
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def split_path(path: str) -> Tuple[str, Optional[str], str, str]:
+    """'collections/x/fields:create' -> ('collections.fields', 'x', 'create', '')."""
+    if ":" not in path:
+        raise StandInError(404, f"Not a Resource:Action path: /{path}")
+    resource_part, rest = path.split(":", 1)
+    action, _, tail = rest.partition("/")
+    segments = [s for s in resource_part.split("/") if s]
+    if len(segments) == 1:
+        return segments[0], None, action, tail
+    if len(segments) == 3:
+        return f"{segments[0]}.{segments[2]}", segments[1], action, tail
+    raise StandInError(404, f"Unsupported resource path: /{path}")
+
+
+def handle(store: Store, path: str, query: Dict[str, str], body: Any) -> Tuple[int, Any]:
+    resource, parent, action, tail = split_path(path)
+    values = dict(body) if isinstance(body, dict) else body
+    tk = query.get("filterByTk")
+    if tk is None and isinstance(values, dict) and "filterByTk" in values:
+        tk = values.pop("filterByTk")
+    if tk is not None and resource not in NAME_KEYED:
+        with contextlib.suppress(TypeError, ValueError):
+            tk = int(tk)
+    flt = parse_json_param(query.get("filter"))
+    if flt is None and isinstance(values, dict) and isinstance(values.get("filter"), dict) and action != "create":
+        flt = values.pop("filter")
+
+    if resource == "uiSchemas":
+        if action == "insert":
+            return 200, {"data": store.insert_schema(values or {})}
+        if action == "insertAdjacent":
+            schema = (values or {}).get("schema", values)
+            return 200, {"data": store.insert_adjacent(tail, query.get("position", "beforeEnd"), schema)}
+        if action == "getJsonSchema":
+            return 200, {"data": store.schema_tree(tail)}
+        if action == "getProperties":
+            return 200, {"data": {"type": "void", "properties": store.schema_properties(tail)}}
+        if action == "patch":
+            return 200, {"data": store.patch_schema(values or {})}
+        if action == "remove":
+            store.remove_schema(tail)
+            return 200, {"data": None}
+        raise StandInError(404, f"Unsupported uiSchemas action: {action}")
+
+    if resource == "swagger" and action == "get":
+        return 200, swagger_document(store, query.get("ns"))
+
+    if action in ("list", "listAccessible"):
+        paginate = query.get("paginate", "true").lower() != "false"
+        page = int(query.get("page", "1") or 1)
+        page_size = int(query.get("pageSize", str(DEFAULT_PAGE_SIZE)) or DEFAULT_PAGE_SIZE)
+        sort = parse_json_param(query.get("sort"))
+        rows, count = store.list(resource, parent, flt, tk, sort, page, page_size if paginate else None)
+        if resource == "collections" and "fields" in (query.get("appends") or query.get("appends[]") or ""):
+            for row in rows:
+                row["fields"], _ = store.list("collections.fields", row["name"], page_size=None)
+        projection = [f for f in (query.get("fields") or query.get("fields[]") or "").split(",") if f]
+        if projection:
+            rows = [{f: row[f] for f in projection if f in row} for row in rows]
+        if not paginate:
+            return 200, {"data": rows}
+        return 200, {
+            "data": rows,
+            "meta": {"count": count, "page": page, "pageSize": page_size, "totalPage": math.ceil(count / page_size)},
+        }
+    if action == "get":
+        return 200, {"data": store.get(resource, parent, flt, tk)}
+    if action == "create" and isinstance(values, list):
+        return 200, {"data": store.create_many(resource, values, parent)}
+    if action == "create":
+        fields = values.pop("fields", None) if resource == "collections" and isinstance(values, dict) else None
+        if fields is not None and any(not isinstance(f, dict) or not f.get("name") for f in fields):
+            raise StandInError(400, "every field in collections:create needs a name")
+        record = store.create(resource, values or {}, parent)
+        if fields is not None:
+            record["fields"] = [store.create("collections.fields", field, record["name"]) for field in fields]
+        return 200, {"data": record}
+    if action == "update":
+        updated = store.update(resource, values or {}, parent, flt, tk)
+        return 200, {"data": updated[0] if tk is not None and updated else updated}
+    if action == "destroy":
+        return 200, {"data": store.destroy(resource, parent, flt, tk)}
+    if action in ("firstOrCreate", "updateOrCreate"):
+        keys = parse_json_param(query.get("filterKeys")) or []
+        keys = [keys] if isinstance(keys, str) else keys
+        if not keys or not isinstance(values, dict):
+            raise StandInError(400, f"{action} requires filterKeys and a JSON object body")
+        match = {k: values.get(k) for k in keys}
+        existing = store.get(resource, parent, match)
+        if existing is None:
+            return 200, {"data": store.create(resource, values, parent)}
+        if action == "updateOrCreate":
+            return 200, {"data": store.update(resource, values, parent, match)[0]}
+        return 200, {"data": existing}
+    raise StandInError(404, f"Unsupported action: {resource}:{action}")
+
+
+def create_app(store: Optional[Store] = None, faults: Optional[Faults] = None, api_key: str = "") -> FastAPI:
+    store = store or Store()
+    faults = faults or Faults()
+    stats: Counter = Counter()
+    app = FastAPI(title="NocoBase stand-in", docs_url=None, redoc_url=None, openapi_url=None)
+    app.state.store = store
+    app.state.faults = faults
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next: Any) -> Response:
+        if not request.url.path.startswith("/api/"):
+            return await call_next(request)
+        delay = faults.delay_s()
+        if delay:
+            await asyncio.sleep(delay)
+        status = faults.error_status()
+        if status is not None:
+            stats["!fault"] += 1
+            return Response(
+                content=json.dumps({"errors": [{"message": f"Injected fault ({status})"}]}),
+                status_code=status,
+                media_type="application/json",
+            )
+        return await call_next(request)
+
+    @app.get("/__standin/stats")
+    async def standin_stats() -> Dict[str, Any]:
+        return {"requests": sum(v for k, v in stats.items() if not k.startswith("!")), "by_endpoint": dict(stats)}
+
+    @app.post("/__standin/reset")
+    async def standin_reset() -> Dict[str, Any]:
+        store.reset()
+        stats.clear()
+        return {"ok": True}
+
+    @app.api_route("/api/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    async def dispatch(path: str, request: Request) -> Response:
+        if api_key and request.headers.get("authorization") != f"Bearer {api_key}":
+            return json_response(request, {"errors": [{"message": "Unauthenticated"}]}, 401)
+        raw = await request.body()
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            return json_response(request, {"errors": [{"message": "Invalid JSON body"}]}, 400)
+        try:
+            resource, _, action, _ = split_path(path)
+            stats[f"{resource.replace('.', '/*/')}:{action}"] += 1
+            # Repeated keys (fields=a&fields=b, appends[]=...) arrive comma-joined
+            query = {key: ",".join(request.query_params.getlist(key)) for key in request.query_params}
+            status, payload = handle(store, path, query, body)
+        except StandInError as e:
+            return json_response(request, {"errors": [{"message": e.message}]}, e.status)
+        return json_response(request, payload, status)
+
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local NocoBase Resource:Action stand-in server")
+    parser.add_argument("--host", default=os.getenv("NOCOBASE_STANDIN_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("NOCOBASE_STANDIN_PORT", str(DEFAULT_PORT))))
+    parser.add_argument("--db", default=os.getenv("NOCOBASE_STANDIN_DB", ":memory:"), help="SQLite file (default in-memory)")
+    parser.add_argument("--strict", action="store_true", help="404 for collections not created through collections:create")
+    parser.add_argument("--api-key", default="", help="Require this Bearer token (default: accept any)")
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("NOCOBASE_STANDIN_LATENCY_MS", "0")))
+    parser.add_argument("--jitter-ms", type=float, default=float(os.getenv("NOCOBASE_STANDIN_JITTER_MS", "0")))
+    parser.add_argument("--error-rate", type=float, default=float(os.getenv("NOCOBASE_STANDIN_ERROR_RATE", "0")))
+    parser.add_argument("--error-status", default=os.getenv("NOCOBASE_STANDIN_ERROR_STATUS", "503"),
+                        help="Comma-separated statuses for injected errors")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible fault injection")
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_statuses=[int(s) for s in args.error_status.split(",") if s.strip()],
+        seed=args.seed,
+    )
+    app = create_app(Store(args.db, strict=args.strict), faults, api_key=args.api_key)
+    print(f"NocoBase stand-in on http://{args.host}:{args.port}/api (db={args.db})")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
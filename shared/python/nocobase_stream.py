@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Incremental JSON decoding for large NocoBase responses.
+
+A NocoBase response is an envelope like ``{"data": [...], "meta": {...}}``.
+``iter_events`` walks it chunk by chunk and hands out each element of the
+top-level ``data`` array as soon as it is complete, so memory use is bounded by
+the largest single record rather than by the response size. Other top-level
+members (``meta``, a non-list ``data``) are small and decoded whole.
+
+Events:
+  ("value", key, value)   a top-level member decoded in one piece
+  ("start", "data", None) the ``data`` array begins
+  ("item", "data", value) one element of the ``data`` array
+  ("end", "data", None)   the ``data`` array is complete
+  ("document", None, value) the body is not a JSON object (decoded whole)
+
+Only the standard library is used: values are decoded with
+``json.JSONDecoder.raw_decode`` over a sliding text buffer.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Iterable, Iterator, Optional, Tuple
+
+Event = Tuple[str, Optional[str], Any]
+
+WHITESPACE = " \t\r\n"
+NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonStreamReader:
+    """Pulls JSON tokens and values out of an iterable of text chunks."""
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Append chunks until the unread buffer holds ``min_size`` chars; False at end of stream."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        grew = False
+        while not grew or len(self._buf) < min_size:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                return grew
+            self._buf += chunk
+            grew = grew or bool(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it ('' at end of stream)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed JSON: expected {char!r}, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value: at least double the unread buffer so large values
+                # are not re-parsed once per chunk.
+                if not self._fill(2 * (len(self._buf) - self._pos)):
+                    raise
+                continue
+            # A number is only complete once a delimiter follows it: "3." or "1e"
+            # at the end of a chunk decodes as 3 or 1 and stops short of the
+            # rest, which is still in the next chunk.
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                tail = end
+                while tail < len(self._buf) and self._buf[tail] in NUMBER_CHARS:
+                    tail += 1
+                if tail == len(self._buf) and self._fill():
+                    continue
+            self._pos = end
+            return value
+
+
+def iter_events(chunks: Iterable[str]) -> Iterator[Event]:
+    """Parse a NocoBase response envelope incrementally; see the module docstring."""
+    reader = JsonStreamReader(chunks)
+    if reader.peek() != "{":
+        yield "document", None, reader.value()
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "data" and reader.peek() == "[":
+            reader.expect("[")
+            yield "start", key, None
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield "item", key, reader.value()
+                    if reader.peek() != ",":
+                        reader.expect("]")
+                        break
+                    reader.expect(",")
+            yield "end", key, None
+        else:
+            yield "value", key, reader.value()
+        if reader.peek() != ",":
+            reader.expect("}")
+            return
+        reader.expect(",")
+
+
+def iter_data_records(events: Iterable[Event]) -> Iterator[Any]:
+    """Only the records: each ``data`` array element, or a non-list ``data`` value as one record."""
+    for kind, key, value in events:
+        if kind == "item" or (kind == "value" and key == "data"):
+            yield value
+
+
+def _indent(text: str, spaces: int) -> str:
+    # json.dumps never emits raw newlines inside strings, so this only touches layout.
+    return text.replace("\n", "\n" + " " * spaces)
+
+
+def write_pretty(events: Iterable[Event], out: IO[str]) -> None:
+    """Write the events exactly as ``json.dumps(body, indent=2)`` would, one record at a time."""
+    members = 0
+    items = 0
+    for kind, key, value in events:
+        if kind == "document":
+            out.write(json.dumps(value, indent=2) + "\n")
+            return
+        if kind in ("value", "start"):
+            out.write(("{\n  " if members == 0 else ",\n  ") + json.dumps(key) + ": ")
+            members += 1
+            if kind == "value":
+                out.write(_indent(json.dumps(value, indent=2), 2))
+            else:
+                out.write("[")
+                items = 0
+        elif kind == "item":
+            out.write(("\n    " if items == 0 else ",\n    ") + _indent(json.dumps(value, indent=2), 4))
+            items += 1
+        elif kind == "end":
+            out.write("\n  ]" if items else "]")
+    out.write("\n}\n" if members else "{}\n")
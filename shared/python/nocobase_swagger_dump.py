@@ -9,18 +9,37 @@ Typical endpoints (version dependent):
   /api/swagger:get?ns=collections/{name}
 
 Use this to discover what exists in YOUR instance.
+
+--all takes the whole inventory in one sweep: it lists the collections, then
+fetches core, plugins, collections and every collections/{name} namespace
+concurrently (--jobs). Documents are stored content-addressed under --store
+(objects/<sha256[:2]>/<sha256>.json, the name being the sha256 of the file),
+and a per-instance manifest maps namespace -> sha256. A namespace whose
+document did not change is neither rewritten nor diffed; the summary lists
+what was added, changed (paths/schemas added, removed or modified) and
+removed since the previous dump.
+
+  python nocobase_swagger_dump.py --all
+  python nocobase_swagger_dump.py --all --jobs 16 --store .nocobase/swagger
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import sys
-from typing import Any, Dict
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 
-import requests
+from nocobase_client import NocoBaseClient
+from nocobase_spec import STATE_DIR
 
 try:
     from dotenv import load_dotenv
@@ -29,10 +48,172 @@ except ImportError:
     pass
 
 
+DEFAULT_JOBS = 8
+DEFAULT_STORE = STATE_DIR / "swagger"
+BASE_NAMESPACES = ("core", "plugins", "collections")
+
+
 def str_to_bool(s: str) -> bool:
     return s.strip().lower() in ("1", "true", "yes", "y", "on")
 
 
+def api_root(base_url: str) -> str:
+    """The /api root, whether or not NOCOBASE_BASE_URL already ends in /api."""
+    base = base_url.rstrip("/")
+    return base if base.endswith("/api") else f"{base}/api"
+
+
+def swagger_url(base_url: str, ns: Optional[str]) -> str:
+    query = f"?{urlencode({'ns': ns})}" if ns else ""
+    return f"{api_root(base_url)}/swagger:get{query}"
+
+
+# ── Content-addressed store ───────────────────────────────────────────────────
+
+def document_text(doc: Any) -> str:
+    """Canonical file content of a document: sorted keys, so the same spec always hashes the same."""
+    return json.dumps(doc, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+
+
+def object_path(store: Path, digest: str) -> Path:
+    return store / "objects" / digest[:2] / f"{digest}.json"
+
+
+def manifest_path(store: Path, base_url: str) -> Path:
+    """One manifest per NocoBase instance; objects are shared."""
+    tag = hashlib.sha1(api_root(base_url).encode("utf-8")).hexdigest()[:12]
+    return store / f"manifest-{tag}.json"
+
+
+def write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def store_document(store: Path, doc: Any) -> Tuple[str, bool]:
+    """Save ``doc`` under its sha256; returns (digest, written). An existing object is left alone."""
+    text = document_text(doc)
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    path = object_path(store, digest)
+    if path.exists():
+        return digest, False
+    write_atomic(path, text)
+    return digest, True
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"namespaces": {}}
+    return manifest if isinstance(manifest.get("namespaces"), dict) else {"namespaces": {}}
+
+
+def load_document(store: Path, digest: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(object_path(store, digest), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def describe_change(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> str:
+    """'+2 -0 paths, 1 schema(s) changed' between two versions of a namespace."""
+    if old is None:
+        return "previous version not in the store"
+    old_paths, new_paths = set(old.get("paths") or {}), set(new.get("paths") or {})
+    old_schemas = (old.get("components") or {}).get("schemas") or {}
+    new_schemas = (new.get("components") or {}).get("schemas") or {}
+    parts = [f"+{len(new_paths - old_paths)} -{len(old_paths - new_paths)} paths"]
+    modified = sum(1 for p in old_paths & new_paths if old["paths"][p] != new["paths"][p])
+    if modified:
+        parts.append(f"{modified} path(s) modified")
+    schemas = (
+        len(set(new_schemas) ^ set(old_schemas))
+        + sum(1 for name in set(old_schemas) & set(new_schemas) if old_schemas[name] != new_schemas[name])
+    )
+    if schemas:
+        parts.append(f"{schemas} schema(s) changed")
+    return ", ".join(parts)
+
+
+# ── --all ─────────────────────────────────────────────────────────────────────
+
+def list_collection_names(client: NocoBaseClient, base_url: str) -> List[str]:
+    resp = client.get(f"{api_root(base_url)}/collections:list", params={"paginate": "false"})
+    resp.raise_for_status()
+    return sorted(c["name"] for c in resp.json().get("data") or [] if isinstance(c, dict) and c.get("name"))
+
+
+def fetch_namespace(client: NocoBaseClient, base_url: str, ns: str) -> Dict[str, Any]:
+    resp = client.get(swagger_url(base_url, ns))
+    if not 200 <= resp.status_code < 300:
+        raise RuntimeError(f"HTTP {resp.status_code}")
+    doc = resp.json()
+    if not isinstance(doc, dict):
+        raise RuntimeError("response is not a JSON object")
+    return doc
+
+
+def dump_all(client: NocoBaseClient, base_url: str, store: Path, jobs: int) -> int:
+    started = time.perf_counter()
+    try:
+        names = list_collection_names(client, base_url)
+    except Exception as e:
+        print(f"ERROR: cannot list collections: {e}", file=sys.stderr)
+        return 1
+    namespaces = list(BASE_NAMESPACES) + [f"collections/{name}" for name in names]
+
+    mpath = manifest_path(store, base_url)
+    previous = load_manifest(mpath)["namespaces"]
+    entries: Dict[str, Dict[str, Any]] = {}
+    changes: List[Tuple[str, str, str]] = []  # (status, ns, detail)
+    failed = written = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(fetch_namespace, client, base_url, ns): ns for ns in namespaces}
+        for future in as_completed(futures):
+            ns = futures[future]
+            try:
+                doc = future.result()
+            except Exception as e:
+                failed += 1
+                changes.append(("failed", ns, str(e)))
+                if ns in previous:
+                    entries[ns] = previous[ns]  # keep the last good version
+                continue
+            digest, new_object = store_document(store, doc)
+            written += new_object
+            entries[ns] = {"sha256": digest, "paths": len(doc.get("paths") or {})}
+            old = previous.get(ns)
+            if old is None:
+                changes.append(("added", ns, f"{entries[ns]['paths']} paths"))
+            elif old.get("sha256") != digest:
+                changes.append(("changed", ns, describe_change(load_document(store, old["sha256"]), doc)))
+
+    for ns in sorted(set(previous) - set(entries)):
+        changes.append(("removed", ns, ""))
+    manifest = {
+        "base_url": api_root(base_url),
+        "dumped_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "namespaces": {ns: entries[ns] for ns in sorted(entries)},
+    }
+    write_atomic(mpath, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+
+    unchanged = len(namespaces) - sum(1 for status, _, _ in changes if status != "removed")
+    print(f"[swagger] {len(namespaces)} namespace(s) in {time.perf_counter() - started:.1f}s, "
+          f"{max(1, jobs)} at a time; {written} new object(s)")
+    for status, ns, detail in sorted(changes, key=lambda c: (c[0], c[1])):
+        print(f"  {status:<8} {ns}" + (f"  ({detail})" if detail else ""))
+    print(f"  unchanged {unchanged}")
+    print(f"Manifest: {mpath}")
+    return 0 if failed == 0 else 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--base-url", default=os.getenv("NOCOBASE_BASE_URL", "").strip())
@@ -42,6 +223,9 @@ def main() -> int:
     parser.add_argument("--out", default="swagger.json")
     parser.add_argument("--timeout", type=int, default=int(os.getenv("NOCOBASE_TIMEOUT_SECONDS", "30")))
     parser.add_argument("--verify-ssl", default=os.getenv("NOCOBASE_VERIFY_SSL", "true"))
+    parser.add_argument("--all", action="store_true", help="Dump every namespace concurrently into --store")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help=f"Concurrent requests for --all (default {DEFAULT_JOBS})")
+    parser.add_argument("--store", default=str(DEFAULT_STORE), help="Content-addressed store for --all")
     args = parser.parse_args()
 
     if not args.base_url:
@@ -54,15 +238,21 @@ def main() -> int:
     verify_ssl = str_to_bool(args.verify_ssl)
 
     base = args.base_url.rstrip("/")
+    if args.all:
+        with NocoBaseClient.from_env(
+            base_url=base, api_key=args.api_key, role="", timeout_s=args.timeout, verify_ssl=verify_ssl
+        ) as client:
+            return dump_all(client, base, Path(args.store), args.jobs)
+
     if args.ns == "collections" and args.name:
-        path = f"/api/swagger:get?{urlencode({'ns': f'collections/{args.name}'})}"
+        url = swagger_url(base, f"collections/{args.name}")
     else:
-        path = f"/api/swagger:get?{urlencode({'ns': args.ns})}" if args.ns else "/api/swagger:get"
-
-    url = f"{base}{path}"
-    headers = {"Authorization": f"Bearer {args.api_key}", "Accept": "application/json"}
+        url = swagger_url(base, args.ns)
 
-    resp = requests.get(url, headers=headers, timeout=args.timeout, verify=verify_ssl)
+    with NocoBaseClient.from_env(
+        base_url=base, api_key=args.api_key, role="", timeout_s=args.timeout, verify_ssl=verify_ssl
+    ) as client:
+        resp = client.get(url)
     try:
         data: Dict[str, Any] = resp.json()
     except Exception:
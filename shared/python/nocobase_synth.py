@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Blueprint-driven synthetic data for load testing, written as NDJSON or Parquet.
+
+Values follow the compiled blueprint (nocobase_spec.py): field type, enum,
+unique and required flags, plus the naming conventions of this app. A ``rut``
+gets a valid módulo-11 check digit, ``nombre`` a person name, and date/time
+fields are anchored per row so that ``f_probable_alta`` follows ``f_ingreso``
+and ``hora_fin`` follows ``hora_inicio`` by ``duracion_min``. Columns are
+generated in vectorized NumPy batches from one seeded generator, so the same
+--seed and row counts always produce the same files.
+
+belongsTo fields hold the parent's natural key, which nocobase_seed.py resolves
+to an id. Keys come from the parent's rows in this run, else from its spec
+seed. Parents with neither are generated too (--parent-rows). A parent without
+a natural key is referenced by id, which assumes it is loaded into an empty
+collection.
+
+One file per collection is written to --out-dir; the summary prints the
+nocobase_seed.py command that loads them (it orders them by dependency).
+
+Usage:
+  python nocobase_synth.py et_pacientes_censo=500000 et_entrega_paciente=200000
+  python nocobase_synth.py ag_bloques_agenda --rows 1000000 --format parquet --seed 7
+
+Needs numpy (pip install numpy); --format parquet needs pyarrow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from nocobase_seed import natural_key, seed_levels
+from nocobase_spec import STATE_DIR, SpecError, load_ir
+
+try:
+    import numpy as np
+except ImportError:  # reported by main()
+    np = None  # type: ignore[assignment]
+
+DEFAULT_OUT_DIR = STATE_DIR / "synth"
+DEFAULT_ROWS = 100_000
+DEFAULT_PARENT_ROWS = 100
+BATCH_ROWS = 100_000
+EPOCH = "2026-01-01T00:00"
+SPAN_MINUTES = 365 * 24 * 60
+RUT_MIN, RUT_MAX = 5_000_000, 26_000_000
+
+NOMBRES = [
+    "Juan", "María", "Pedro", "Ana", "Luis", "Carmen", "José", "Rosa", "Diego", "Elena",
+    "Camila", "Matías", "Valentina", "Benjamín", "Francisca", "Tomás", "Javiera", "Vicente",
+    "Constanza", "Sebastián", "Fernanda", "Cristóbal", "Catalina", "Felipe", "Isidora", "Joaquín",
+]
+APELLIDOS = [
+    "Pérez", "González", "Rodríguez", "Soto", "Muñoz", "Rojas", "Díaz", "Castro", "López", "Silva",
+    "Contreras", "Sepúlveda", "Morales", "Fuentes", "Araya", "Espinoza", "Valenzuela", "Tapia",
+    "Reyes", "Gutiérrez", "Castillo", "Pizarro", "Álvarez", "Vásquez", "Cortés", "Núñez",
+]
+SALAS = ["MQ1-A", "MQ1-B", "MQ2-A", "MQ2-B", "MQ3-A", "UCI", "UTI", "PED-A", "GIN-B", "OBST-A"]
+TEXTOS = [
+    "Paciente estable, sin eventos en el turno.",
+    "Evoluciona con dolor controlado con analgesia.",
+    "Pendiente resultado de exámenes de laboratorio.",
+    "Se ajusta tratamiento antibiótico según cultivo.",
+    "Control de signos vitales cada 4 horas.",
+    "Interconsulta a especialidad solicitada.",
+    "Alta programada para mañana si evoluciona favorable.",
+    "Sin alergias conocidas.",
+    "Requiere evaluación por kinesiología.",
+    "Familia informada de la evolución.",
+]
+LATER_HINTS = ("alta", "fin", "egreso", "termino", "cierre", "sync", "firma")
+
+
+class SynthError(ValueError):
+    """A collection cannot be generated (unknown name, missing optional dependency)."""
+
+
+# ── RUT ───────────────────────────────────────────────────────────────────────
+
+def rut_check_digits(bodies: "np.ndarray") -> "np.ndarray":
+    """Módulo-11 check digit ('0'-'9' or 'K') of each RUT body."""
+    total = np.zeros(len(bodies), dtype=np.int64)
+    rest = bodies.astype(np.int64)
+    for position in range(9):
+        total += (rest % 10) * (2 + position % 6)
+        rest //= 10
+    digits = np.array(["", "1", "2", "3", "4", "5", "6", "7", "8", "9", "K", "0"])
+    return digits[11 - total % 11]
+
+
+def ruts(bodies: "np.ndarray") -> "np.ndarray":
+    """Bodies -> '12345678-5' strings (the format ALMA and the census use)."""
+    return np.char.add(np.char.add(bodies.astype(str), "-"), rut_check_digits(bodies))
+
+
+def unique_rut_bodies(start: int, n: int, seed: int) -> "np.ndarray":
+    """Distinct, scattered RUT bodies for rows start..start+n: an affine permutation of the range."""
+    span = RUT_MAX - RUT_MIN
+    multiplier = 7_368_787  # prime, coprime with span
+    offset = (seed * 1_000_003) % span
+    index = np.arange(start, start + n, dtype=np.int64)
+    return RUT_MIN + (index * multiplier + offset) % span
+
+
+# ── Collection plans ──────────────────────────────────────────────────────────
+
+class CollectionPlan:
+    """What to generate for one collection and how its rows are referenced."""
+
+    def __init__(self, ir: Dict[str, Any], name: str, rows: int) -> None:
+        entry = ir["collections"][name]
+        definitions = {f["name"]: f for f in entry["definition"].get("fields") or [] if isinstance(f, dict)}
+        self.name = name
+        self.rows = rows
+        self.fields: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = [
+            (field_name, payload, definitions.get(field_name, {}))
+            for field_name, payload in entry["fields"].items()
+            if payload.get("type") != "json"
+        ]
+        self.key = natural_key(ir, name, None, {})
+        self.keys: List["np.ndarray"] = []  # natural-key values generated so far
+
+    def key_pool(self) -> "np.ndarray":
+        return np.concatenate(self.keys) if self.keys else np.array([], dtype=str)
+
+
+def spec_seed(ir: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    seed = dict(ir["seed"])
+    for module in ir["modules"].values():
+        seed.update(module["seed"])
+    return {name: rows for name, rows in seed.items() if isinstance(rows, list)}
+
+
+def plan_collections(
+    ir: Dict[str, Any], requested: Dict[str, int], parent_rows: int
+) -> Tuple[List[CollectionPlan], Dict[str, Any]]:
+    """Plans in dependency order (requested collections plus parents that have no spec seed) and FK pools."""
+    seed = spec_seed(ir)
+    counts = dict(requested)
+    pending = list(requested)
+    while pending:
+        name = pending.pop()
+        for target in ir["collections"][name]["depends_on"]:
+            if target not in counts and not seed.get(target):
+                counts[target] = parent_rows
+                pending.append(target)
+
+    pools: Dict[str, Any] = {}
+    for name, rows in seed.items():
+        if name in counts or name not in ir["collections"]:
+            continue
+        key = natural_key(ir, name, None, {})
+        values = [row.get(key) for row in rows if isinstance(row, dict) and row.get(key) is not None] if key else []
+        pools[name] = np.array([str(v) for v in values]) if values else len(rows)
+
+    order = [name for level in seed_levels(list(counts), ir) for name in level]
+    return [CollectionPlan(ir, name, counts[name]) for name in order], pools
+
+
+# ── Columns ───────────────────────────────────────────────────────────────────
+
+def labels(prefix: str, numbers: "np.ndarray") -> "np.ndarray":
+    return np.char.add(prefix, numbers.astype(str))
+
+
+def person_names(rng: "np.random.Generator", n: int) -> "np.ndarray":
+    first = np.array(NOMBRES)[rng.integers(0, len(NOMBRES), n)]
+    last = np.array(APELLIDOS)[rng.integers(0, len(APELLIDOS), (2, n))]
+    return np.char.add(np.char.add(np.char.add(np.char.add(first, " "), last[0]), " "), last[1])
+
+
+def string_column(
+    name: str, definition: Dict[str, Any], rng: "np.random.Generator",
+    start: int, n: int, seed: int,
+) -> "np.ndarray":
+    lowered = name.lower()
+    if lowered == "rut" or lowered.endswith("_rut") or lowered.startswith("rut_"):
+        if definition.get("unique"):
+            return ruts(unique_rut_bodies(start, n, seed))
+        return ruts(rng.integers(RUT_MIN, RUT_MAX, n))
+    if definition.get("unique"):
+        return np.char.add(f"SYN{seed}-", np.char.zfill(np.arange(start + 1, start + n + 1).astype(str), 8))
+    if lowered.startswith("cod") or lowered == "code":
+        return labels(name.upper()[:3], rng.integers(1000, 10000, n))
+    if lowered in ("nombre", "name") or "medico" in lowered or "responsable" in lowered:
+        names = person_names(rng, n)
+        return np.char.add("Dr. ", names) if "medico" in lowered else names
+    if "email" in lowered:
+        return np.char.add(labels("usuario", np.arange(start + 1, start + n + 1)), "@example.cl")
+    if "telefono" in lowered or "fono" in lowered:
+        return labels("+569", rng.integers(10_000_000, 100_000_000, n))
+    if lowered == "sexo":
+        return np.array(["M", "F"])[rng.integers(0, 2, n)]
+    if lowered == "sala":
+        return np.array(SALAS)[rng.integers(0, len(SALAS), n)]
+    if lowered == "cama":
+        return rng.integers(100, 400, n).astype(str)
+    if "ficha" in lowered:
+        return labels("F-", rng.integers(1, 10_000_000, n))
+    if lowered == "color":
+        return np.array([f"#{v:06X}" for v in rng.integers(0, 0x1000000, n).tolist()])
+    title = (definition.get("uiSchema") or {}).get("title") or name.replace("_", " ").capitalize()
+    return labels(f"{title} ", rng.integers(1, 51, n))
+
+
+class RowContext:
+    """Per-row anchors shared by the date/time columns of a batch, so they stay consistent."""
+
+    def __init__(self, rng: "np.random.Generator", n: int) -> None:
+        self.anchor = np.datetime64(EPOCH) + rng.integers(0, SPAN_MINUTES, n).astype("timedelta64[m]")
+        self.later = self.anchor + (rng.integers(1, 30 * 24 * 60, n)).astype("timedelta64[m]")
+        self.start_minute = 7 * 60 + 15 * rng.integers(0, 44, n)  # 07:00-17:45 slots
+        self.duration = 15 * rng.integers(1, 9, n)
+
+
+def moment(name: str, ctx: RowContext) -> "np.ndarray":
+    return ctx.later if any(hint in name.lower() for hint in LATER_HINTS) else ctx.anchor
+
+
+def clock(minutes: "np.ndarray") -> "np.ndarray":
+    hours, mins = np.divmod(minutes % (24 * 60), 60)
+    return np.char.add(np.char.add(np.char.zfill(hours.astype(str), 2), ":"), np.char.add(np.char.zfill(mins.astype(str), 2), ":00"))
+
+
+def generate_batch(
+    plan: CollectionPlan, pools: Dict[str, Any], rng: "np.random.Generator", start: int, n: int, seed: int
+) -> Dict[str, "np.ndarray"]:
+    ctx = RowContext(rng, n)
+    columns: Dict[str, "np.ndarray"] = {}
+    for name, payload, definition in plan.fields:
+        kind = payload.get("type")
+        lowered = name.lower()
+        enum = definition.get("enum")
+        if kind == "belongsTo":
+            pool = pools[payload["target"]]
+            if isinstance(pool, int):
+                columns[name] = rng.integers(1, max(pool, 1) + 1, n)
+            else:
+                columns[name] = pool[rng.integers(0, len(pool), n)]
+        elif enum and lowered == "periodo" and set(enum) == {"AM", "PM"}:
+            columns[name] = np.where(ctx.start_minute < 12 * 60, "AM", "PM")
+        elif enum:
+            columns[name] = np.array([str(v) for v in enum])[rng.integers(0, len(enum), n)]
+        elif kind == "string":
+            columns[name] = string_column(name, definition, rng, start, n, seed)
+        elif kind == "text":
+            columns[name] = np.array(TEXTOS)[rng.integers(0, len(TEXTOS), n)]
+        elif kind == "integer":
+            if lowered == "edad":
+                columns[name] = rng.integers(0, 100, n)
+            elif lowered.startswith("duracion"):
+                columns[name] = ctx.duration
+            elif lowered.startswith("dias"):
+                columns[name] = rng.integers(0, 60, n)
+            elif lowered == "orden":
+                columns[name] = np.arange(start + 1, start + n + 1)
+            else:
+                columns[name] = rng.integers(0, 1000, n)
+        elif kind == "double":
+            columns[name] = np.round(rng.uniform(0, 100, n), 2)
+        elif kind == "boolean":
+            share = 0.1 if definition.get("default") is False else 0.3
+            columns[name] = rng.random(n) < share
+        elif kind == "date":
+            columns[name] = moment(name, ctx).astype("datetime64[D]").astype(str)
+        elif kind == "datetime":
+            columns[name] = moment(name, ctx).astype("datetime64[s]").astype(str)
+        elif kind == "time":
+            fin = any(hint in lowered for hint in LATER_HINTS)
+            columns[name] = clock(ctx.start_minute + ctx.duration if fin else ctx.start_minute)
+    return columns
+
+
+# ── Writers ───────────────────────────────────────────────────────────────────
+
+class NdjsonWriter:
+    suffix = ".ndjson"
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def __enter__(self) -> NdjsonWriter:
+        self._file = open(self._path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._file.close()
+
+    def write(self, columns: Dict[str, "np.ndarray"]) -> None:
+        names = list(columns)
+        values = [column.tolist() for column in columns.values()]
+        encode = self._encode
+        rows = zip(*values, strict=True)
+        self._file.write("".join(encode(dict(zip(names, row, strict=True))) + "\n" for row in rows))
+
+
+class ParquetWriter:
+    suffix = ".parquet"
+
+    def __init__(self, path: Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SynthError("--format parquet needs pyarrow (pip install pyarrow)") from None
+        self._pa, self._pq, self._path, self._writer = pa, pq, path, None
+
+    def __enter__(self) -> ParquetWriter:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    def write(self, columns: Dict[str, "np.ndarray"]) -> None:
+        table = self._pa.table({name: self._pa.array(column) for name, column in columns.items()})
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+
+WRITERS = {"ndjson": NdjsonWriter, "parquet": ParquetWriter}
+
+
+def write_collection(
+    plan: CollectionPlan, pools: Dict[str, Any], out_dir: Path, fmt: str, seed: int
+) -> Tuple[Path, float]:
+    """Generate ``plan.rows`` rows into one file; returns the path and the seconds taken."""
+    writer_class = WRITERS[fmt]
+    path = out_dir / f"{plan.name}{writer_class.suffix}"
+    # One generator per collection: adding a collection to the run does not change the others.
+    rng = np.random.default_rng([seed, zlib.crc32(plan.name.encode("utf-8"))])
+    started = time.perf_counter()
+    with writer_class(path) as writer:
+        for start in range(0, plan.rows, BATCH_ROWS):
+            columns = generate_batch(plan, pools, rng, start, min(BATCH_ROWS, plan.rows - start), seed)
+            if plan.key:
+                plan.keys.append(columns[plan.key].astype(str))
+            writer.write(columns)
+    pools[plan.name] = plan.key_pool() if plan.key else plan.rows
+    return path, time.perf_counter() - started
+
+
+def parse_requests(items: List[str], default_rows: int) -> Dict[str, int]:
+    """['et_pacientes_censo=500000', 'ag_bloques_agenda'] -> {name: rows}"""
+    requested: Dict[str, int] = {}
+    for item in items:
+        name, sep, rows = item.partition("=")
+        try:
+            requested[name.strip()] = int(rows.replace("_", "")) if sep else default_rows
+        except ValueError:
+            raise SynthError(f"expected COLLECTION[=ROWS], got {item!r}") from None
+    return requested
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate blueprint-shaped synthetic rows for load testing")
+    parser.add_argument("collections", nargs="+", metavar="COLLECTION[=ROWS]")
+    parser.add_argument("--spec", default="app-spec/app.yaml")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help=f"Rows per collection (default {DEFAULT_ROWS})")
+    parser.add_argument(
+        "--parent-rows", type=int, default=DEFAULT_PARENT_ROWS,
+        help=f"Rows for referenced collections that have no spec seed (default {DEFAULT_PARENT_ROWS})",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; same seed and counts, same files")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="ndjson")
+    parser.add_argument("--out-dir", default=str(DEFAULT_OUT_DIR))
+    args = parser.parse_args()
+
+    if np is None:
+        print("ERROR: nocobase_synth.py needs numpy (pip install numpy).", file=sys.stderr)
+        return 2
+    try:
+        ir = load_ir(args.spec)
+        requested = parse_requests(args.collections, args.rows)
+        unknown = [name for name in requested if name not in ir["collections"]]
+        if unknown:
+            raise SynthError(f"unknown collection(s) {', '.join(unknown)}")
+        plans, pools = plan_collections(ir, requested, args.parent_rows)
+    except (OSError, SpecError, SynthError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    total_rows, total_seconds = 0, 0.0
+    for plan in plans:
+        if plan.key is None and any(
+            payload.get("target") == plan.name for other in plans for _, payload, _ in other.fields
+        ):
+            print(f"WARNING: {plan.name} has no natural key; rows referencing it use ids 1..{plan.rows}, "
+                  f"so load it into an empty collection.", file=sys.stderr)
+        try:
+            path, seconds = write_collection(plan, pools, out_dir, args.format, args.seed)
+        except SynthError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
+        files.append((plan.name, path))
+        total_rows += plan.rows
+        total_seconds += seconds
+        rate = plan.rows / seconds * 60 if seconds else 0
+        print(f"[{plan.name}] {plan.rows:,} rows -> {path} ({seconds:.1f}s, {rate:,.0f} rows/min)")
+
+    print(f"{total_rows:,} rows in {total_seconds:.1f}s ({total_rows / max(total_seconds, 1e-9) * 60:,.0f} rows/min)")
+    print("Load with:")
+    print("  python scripts/nocobase_seed.py " + " ".join(f"--from-file {name}={path}" for name, path in files))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""Per-request latency tracing for the NocoBase Python clients.
+
+With a ``Tracer`` attached, every HTTP attempt is timed phase by phase through
+httpx's ``trace`` extension and tagged by Resource:Action, e.g.
+``collections:create``, ``et_pacientes_censo:list`` or
+``collections/*/fields:create`` (record keys inside nested resources become ``*``).
+
+Each attempt records:
+  connect_ms   TCP connect for a new connection, name resolution included
+  tls_ms       TLS handshake for a new connection
+  ttfb_ms      request start until the response headers arrived
+  download_ms  response body transfer
+  total_ms     request start until the body was read
+  bytes_out / bytes_in  request body size / response bytes on the wire
+
+Records are appended as JSON lines (the same shape as the log kept by
+shared/scripts/ApiClient.ts, plus timings) to
+``.claude/logs/nocobase-trace-YYYYMMDD.log`` by a background thread, so the
+request path only enqueues a dict. When the client is closed, a JSON report with
+count, errors, p50/p95/p99 and throughput per endpoint is printed to stderr or
+written to a file.
+
+httpcore resolves the host inside its own connect step and emits no separate
+event for it, so DNS time is not reported on its own: it is part of
+``connect_ms``. (Timing a second lookup would only add latency to the request
+and measure the probe, not the connection.)
+
+Configuration (read by ``tracer_from_env``):
+  NOCOBASE_TRACE         true|false (default false)
+  NOCOBASE_TRACE_LOG     JSONL file (default .claude/logs/nocobase-trace-YYYYMMDD.log)
+  NOCOBASE_TRACE_REPORT  Write the JSON report here instead of stderr
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+LOG_DIR = Path(__file__).resolve().parents[2] / ".claude" / "logs"
+PHASES = ("connect_ms", "tls_ms", "ttfb_ms", "download_ms", "total_ms")
+PERCENTILES = (50, 95, 99)
+
+
+def endpoint_tag(url: str) -> str:
+    """Resource:Action tag of a NocoBase URL, e.g. 'collections/*/fields:list'."""
+    path = urlsplit(url).path
+    segments = [s for s in path.split("/") if s]
+    if "api" in segments:
+        segments = segments[segments.index("api") + 1:]
+    if not segments:
+        return "/"
+    # uiSchemas:getJsonSchema/<uid> -> uiSchemas:getJsonSchema
+    for i, segment in enumerate(segments):
+        if ":" in segment:
+            segments = segments[: i + 1]
+            break
+    return "/".join(s if i % 2 == 0 else "*" for i, s in enumerate(segments))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def default_log_path() -> Path:
+    return LOG_DIR / f"nocobase-trace-{datetime.now().strftime('%Y%m%d')}.log"
+
+
+class JsonlWriter:
+    """Appends dicts as JSON lines from a daemon thread; ``write`` never blocks on I/O."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="nocobase-trace-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._queue.put_nowait(record)
+
+    def _run(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8", buffering=64 * 1024) as out:
+                self._drain(out)
+            return
+        except OSError as e:
+            print(f"WARNING: trace log disabled, cannot write {self.path}: {e}", file=sys.stderr)
+        self._drain(None)  # keep consuming so write() and close() never block
+
+    def _drain(self, out: Optional[IO[str]]) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            if out is not None:
+                out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                if self._queue.empty():
+                    out.flush()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+
+class RequestTrace:
+    """Phase timestamps of one HTTP attempt, filled in by httpcore trace events."""
+
+    def __init__(self, method: str, url: str, attempt: int) -> None:
+        self.method = method
+        self.url = url
+        self.attempt = attempt
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def hook(self, event: str, _info: Dict[str, Any]) -> None:
+        # "connection.connect_tcp.started" -> "connect_tcp.started"
+        name = event.split(".", 1)[1] if event.count(".") > 1 else event
+        self.marks.setdefault(name, time.perf_counter())
+
+    async def async_hook(self, event: str, info: Dict[str, Any]) -> None:
+        self.hook(event, info)
+
+    def span_ms(self, start: str, end: str) -> Optional[float]:
+        if start in self.marks and end in self.marks:
+            return (self.marks[end] - self.marks[start]) * 1000.0
+        return None
+
+    def since_start_ms(self, mark: str) -> Optional[float]:
+        if mark in self.marks:
+            return (self.marks[mark] - self.started) * 1000.0
+        return None
+
+
+class Tracer:
+    """Collects per-attempt timings, logs them in the background and aggregates a report."""
+
+    def __init__(self, log_path: Optional[Path] = None, report_path: Optional[str] = None) -> None:
+        self.report_path = report_path
+        self._writer = JsonlWriter(log_path) if log_path is not None else None
+        self._samples: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+        self._closed = False
+        self._script = Path(sys.argv[0]).name if sys.argv and sys.argv[0] else ""
+
+    def start(self, method: str, url: str, attempt: int = 0) -> RequestTrace:
+        return RequestTrace(method, url, attempt)
+
+    def finish(
+        self,
+        trace: RequestTrace,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        ended = time.perf_counter()
+        timings = {
+            "connect_ms": trace.span_ms("connect_tcp.started", "connect_tcp.complete"),
+            "tls_ms": trace.span_ms("start_tls.started", "start_tls.complete"),
+            "ttfb_ms": trace.since_start_ms("receive_response_headers.complete"),
+            "download_ms": trace.span_ms("receive_response_body.started", "receive_response_body.complete"),
+            "total_ms": (ended - trace.started) * 1000.0,
+        }
+        bytes_out = len(response.request.content) if response is not None else 0
+        bytes_in = response.num_bytes_downloaded if response is not None else 0
+        status = response.status_code if response is not None else None
+        failed = error is not None or (status is not None and status >= 400)
+        tag = endpoint_tag(trace.url)
+
+        with self._lock:
+            if self._first_start is None or trace.started < self._first_start:
+                self._first_start = trace.started
+            if self._last_end is None or ended > self._last_end:
+                self._last_end = ended
+            bucket = self._samples.setdefault(
+                tag, {"count": 0, "errors": 0, "bytes_out": 0, "bytes_in": 0, **{p: [] for p in PHASES}}
+            )
+            bucket["count"] += 1
+            bucket["errors"] += int(failed)
+            bucket["bytes_out"] += bytes_out
+            bucket["bytes_in"] += bytes_in
+            for phase, value in timings.items():
+                if value is not None:
+                    bucket[phase].append(value)
+
+        if self._writer is not None:
+            record: Dict[str, Any] = {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "action": trace.method,
+                "endpoint": tag,
+                "method": trace.method,
+                "url": trace.url,
+                "status": status,
+                "attempt": trace.attempt,
+                "bytes_out": bytes_out,
+                "bytes_in": bytes_in,
+                **{k: round(v, 3) for k, v in timings.items() if v is not None},
+                "script": self._script,
+            }
+            if error is not None:
+                record["error"] = f"{type(error).__name__}: {error}"
+            else:
+                record["result"] = "success" if not failed else f"HTTP {status}"
+            self._writer.write(record)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed_s = (self._last_end - self._first_start) if self._first_start is not None else 0.0
+            endpoints: Dict[str, Any] = {}
+            for tag in sorted(self._samples):
+                bucket = self._samples[tag]
+                entry: Dict[str, Any] = {
+                    "count": bucket["count"],
+                    "errors": bucket["errors"],
+                    "throughput_rps": round(bucket["count"] / elapsed_s, 3) if elapsed_s > 0 else None,
+                    "bytes_out": bucket["bytes_out"],
+                    "bytes_in": bucket["bytes_in"],
+                }
+                for phase in PHASES:
+                    values = sorted(bucket[phase])
+                    if values:
+                        entry[phase] = {f"p{p}": round(percentile(values, p), 3) for p in PERCENTILES}
+                        entry[phase]["max"] = round(values[-1], 3)
+                endpoints[tag] = entry
+            total = sum(b["count"] for b in self._samples.values())
+        return {
+            "requests": total,
+            "elapsed_s": round(elapsed_s, 3),
+            "throughput_rps": round(total / elapsed_s, 3) if elapsed_s > 0 else None,
+            "endpoints": endpoints,
+        }
+
+    def close(self) -> None:
+        """Flush the JSONL log and emit the report (once)."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer is not None:
+            self._writer.close()
+        text = json.dumps(self.report(), indent=2, ensure_ascii=False)
+        if self.report_path:
+            Path(self.report_path).write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text, file=sys.stderr)
+
+
+def tracer_from_env(force: bool = False, report_path: Optional[str] = None) -> Optional[Tracer]:
+    """Build the tracer described by NOCOBASE_TRACE_* variables, or None when tracing is off.
+
+    ``force`` turns tracing on regardless of NOCOBASE_TRACE (used by ``--trace``);
+    ``report_path`` ("-" for stderr) overrides NOCOBASE_TRACE_REPORT.
+    """
+    enabled = os.getenv("NOCOBASE_TRACE", "false").strip().lower() in ("1", "true", "yes", "y", "on")
+    if not (enabled or force):
+        return None
+    log_env = os.getenv("NOCOBASE_TRACE_LOG", "").strip()
+    report = report_path or os.getenv("NOCOBASE_TRACE_REPORT", "").strip() or None
+    return Tracer(
+        log_path=Path(log_env) if log_env else default_log_path(),
+        report_path=None if report == "-" else report,
+    )
+
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""Opt-in local pre-flight validation of request bodies.
+
+Validators are compiled from two sources:
+  - the OpenAPI documents saved by ``nocobase_swagger_dump.py --all``
+    (``components.schemas`` of the collections namespaces): what the instance
+    actually has, system fields included;
+  - the field definitions of app.yaml (through the compiled IR), which win
+    where both describe a field and add what Swagger does not say: enums,
+    required flags and relation targets.
+
+The compiled rules are cached as JSON under .nocobase/validators/, keyed by the
+blueprint hash and the Swagger manifest digests, so a run only recompiles after
+a new dump or a blueprint edit. Each field rule is turned into a small checker
+function once, when the validator is built.
+
+With a validator, ``NocoBaseClient`` checks every POST/PUT/PATCH body bound for
+  {collection}:create, :update, :updateOrCreate, :firstOrCreate
+  collections:create, collections/{name}/fields:create, fields:update
+before it touches the network. A body that fails is answered locally with an
+HTTP 400 in NocoBase's own error format, ``{"errors": [{"message": ...}]}``,
+tagged ``X-Local-Validation: rejected``, so callers report (and nocobase_seed
+bisects) it exactly like a server rejection. Value checks follow what the
+server's model layer accepts (e.g. "12" for an integer), so a local rejection
+is one the server would have made; fields neither source knows are left to
+the server.
+
+Configuration (read by ``validator_from_env``):
+  NOCOBASE_VALIDATE        true|false (default false)
+  NOCOBASE_SWAGGER_STORE   Swagger dump store (default .nocobase/swagger)
+  NOCOBASE_VALIDATE_SPEC   Blueprint (default app-spec/app.yaml)
+
+  python nocobase_validate.py          # compile (or load) the rules and list them
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from datetime import time as dtime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from nocobase_spec import FIELD_TYPES, REPO_ROOT, STATE_DIR, SpecError, content_hash, load_ir
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+RULES_VERSION = 1
+DEFAULT_RULES_DIR = STATE_DIR / "validators"
+DEFAULT_STORE = STATE_DIR / "swagger"
+DEFAULT_SPEC = REPO_ROOT / "app-spec" / "app.yaml"
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+INTEGER = re.compile(r"^\s*[+-]?\d+\s*$")
+RELATION_TYPES = {"belongsTo", "hasOne", "hasMany", "belongsToMany"}
+KNOWN_FIELD_TYPES = set(FIELD_TYPES) | RELATION_TYPES | {
+    "bigInt", "float", "double", "decimal", "real", "dateOnly", "time", "unixTimestamp",
+    "json", "jsonb", "array", "set", "uid", "uuid", "nanoid", "password", "sort",
+    "point", "lineString", "polygon", "circle", "virtual", "context", "formula",
+    "sequence", "encryption", "createdBy", "updatedBy",
+}
+RECORD_ACTIONS = {"create": True, "update": False, "updateOrCreate": True, "firstOrCreate": True}
+
+# Blueprint field type -> value kind
+IR_KINDS = {
+    "string": "string",
+    "text": "string",
+    "integer": "integer",
+    "bigInt": "integer",
+    "float": "number",
+    "double": "number",
+    "decimal": "number",
+    "boolean": "boolean",
+    "date": "date",
+    "dateOnly": "date",
+    "datetime": "datetime",
+    "time": "time",
+    "belongsTo": "relation",
+}
+SWAGGER_FORMATS = {"date": "date", "date-time": "datetime", "time": "time"}
+
+Checker = Callable[[Any], Optional[str]]
+
+
+def str_to_bool(s: str) -> bool:
+    return s.strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+# ── Compiler ──────────────────────────────────────────────────────────────────
+
+def swagger_kind(prop: Dict[str, Any]) -> str:
+    kind = prop.get("type")
+    if kind == "integer":
+        return "integer"
+    if kind == "number":
+        return "number"
+    if kind == "boolean":
+        return "boolean"
+    if kind == "string":
+        return SWAGGER_FORMATS.get(prop.get("format"), "string")
+    if kind == "array":
+        return "array"
+    return "any"  # objects are JSON fields or relations; the server decides
+
+
+def compile_rules(ir: Dict[str, Any], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge Swagger schemas and blueprint fields into {collection: {"fields": {...}, "required": [...]}}."""
+    collections: Dict[str, Dict[str, Any]] = {}
+    for doc in documents:
+        for name, schema in ((doc.get("components") or {}).get("schemas") or {}).items():
+            if not isinstance(schema, dict) or not isinstance(schema.get("properties"), dict):
+                continue
+            entry = collections.setdefault(name, {"fields": {}, "required": []})
+            for field, prop in schema["properties"].items():
+                rule: Dict[str, Any] = {"kind": swagger_kind(prop) if isinstance(prop, dict) else "any"}
+                if isinstance(prop, dict) and isinstance(prop.get("enum"), list):
+                    rule["enum"] = prop["enum"]
+                entry["fields"][field] = rule
+            entry["required"] = sorted(set(entry["required"]) | set(schema.get("required") or []))
+
+    for name, coll in (ir.get("collections") or {}).items():
+        entry = collections.setdefault(name, {"fields": {}, "required": []})
+        enums = {
+            f["name"]: f["enum"] for f in (coll.get("definition") or {}).get("fields") or []
+            if isinstance(f, dict) and isinstance(f.get("enum"), list)
+        }
+        required = set(entry["required"])
+        for field, payload in coll["fields"].items():
+            rule = {"kind": IR_KINDS.get(payload.get("type"), "any")}
+            if field in enums:
+                rule["enum"] = enums[field]
+            foreign_key = payload.get("foreignKey")
+            if payload.get("type") in RELATION_TYPES and foreign_key and foreign_key != field:
+                rule["foreignKey"] = foreign_key
+                entry["fields"][foreign_key] = {"kind": "integer"}
+            entry["fields"][field] = rule
+            if payload.get("required"):
+                required.add(field)
+        entry["required"] = sorted(required)
+    return {"version": RULES_VERSION, "collections": collections}
+
+
+# ── Checkers ──────────────────────────────────────────────────────────────────
+
+def _is_number(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+def _is_datetime(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+def _is_time(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        dtime.fromisoformat(value.strip())
+    except ValueError:
+        return False
+    return True
+
+
+KIND_CHECKS: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+    "string": (lambda v: isinstance(v, (str, int, float)) and not isinstance(v, bool), "a string"),
+    "integer": (
+        lambda v: (isinstance(v, int) and not isinstance(v, bool))
+        or (isinstance(v, float) and v.is_integer())
+        or (isinstance(v, str) and INTEGER.match(v) is not None),
+        "an integer",
+    ),
+    "number": (_is_number, "a number"),
+    "boolean": (
+        lambda v: isinstance(v, bool) or v in (0, 1)
+        or (isinstance(v, str) and v.strip().lower() in ("true", "false", "1", "0")),
+        "a boolean",
+    ),
+    "date": (_is_datetime, "an ISO date"),
+    "datetime": (_is_datetime, "an ISO date-time"),
+    "time": (_is_time, "an ISO time"),
+    "relation": (
+        lambda v: isinstance(v, dict)
+        or (isinstance(v, int) and not isinstance(v, bool))
+        or (isinstance(v, str) and INTEGER.match(v) is not None),
+        "a record id or object",
+    ),
+    "array": (lambda v: isinstance(v, list), "a list"),
+}
+
+
+def build_checker(collection: str, field: str, rule: Dict[str, Any]) -> Optional[Checker]:
+    """A function returning an error message for a bad (non-null) value, or None for 'anything goes'."""
+    test, expected = KIND_CHECKS.get(rule.get("kind"), (None, ""))
+    allowed = rule.get("enum")
+    if test is None and not allowed:
+        return None
+    allowed_set = set(allowed) if allowed else None
+    shown = ", ".join(repr(v) for v in allowed or [])
+
+    def check(value: Any) -> Optional[str]:
+        if test is not None and not test(value):
+            return f"{collection}.{field}: {value!r} is not {expected}"
+        if allowed_set is not None:
+            try:
+                ok = value in allowed_set
+            except TypeError:  # unhashable
+                ok = False
+            if not ok:
+                return f"{collection}.{field}: {value!r} is not one of {shown}"
+        return None
+
+    return check
+
+
+class CollectionValidator:
+    """Precompiled checks for the records of one collection."""
+
+    def __init__(self, name: str, entry: Dict[str, Any]) -> None:
+        self.name = name
+        self.checkers: Dict[str, Checker] = {}
+        for field, rule in entry["fields"].items():
+            checker = build_checker(name, field, rule)
+            if checker is not None:
+                self.checkers[field] = checker
+        foreign_keys = {field: rule.get("foreignKey") for field, rule in entry["fields"].items()}
+        self.required = [(field, foreign_keys.get(field)) for field in entry["required"]]
+
+    def check(self, record: Any, create: bool) -> List[str]:
+        if not isinstance(record, dict):
+            return [f"{self.name}: expected an object, got {type(record).__name__}"]
+        errors = []
+        for field, value in record.items():
+            if value is None:
+                continue
+            checker = self.checkers.get(field)
+            if checker is not None:
+                message = checker(value)
+                if message is not None:
+                    errors.append(message)
+        for field, foreign_key in self.required:
+            missing = record.get(field) in (None, "") and (foreign_key is None or record.get(foreign_key) is None)
+            if (field in record or create) and missing:
+                errors.append(f"{self.name}.{field} is required")
+        return errors
+
+
+# ── Validator ─────────────────────────────────────────────────────────────────
+
+def route_of(url: str) -> Tuple[str, str]:
+    """('collections/x/fields', 'create') for '.../api/collections/x/fields:create'."""
+    path = urlsplit(url).path
+    path = path.split("/api/", 1)[1] if "/api/" in path else path.lstrip("/")
+    if ":" not in path:
+        return path, ""
+    resource, action = path.rsplit(":", 1)
+    return resource, action.split("/", 1)[0]
+
+
+class Validator:
+    """Checks request bodies against compiled rules; see the module docstring."""
+
+    def __init__(self, rules: Dict[str, Any]) -> None:
+        self.rules = rules
+        self.collections = {
+            name: CollectionValidator(name, entry) for name, entry in (rules.get("collections") or {}).items()
+        }
+        self.checked = 0
+        self.rejected = 0
+
+    def check(self, url: str, body: Any) -> List[str]:
+        """Error messages for ``body`` sent to ``url``; empty when it passes or the endpoint is not covered."""
+        resource, action = route_of(url)
+        if resource == "collections":
+            errors = self.check_collection(body) if action == "create" else []
+        elif resource.startswith("collections/") and resource.endswith("/fields") and action in ("create", "update"):
+            errors = self.check_field(resource.split("/")[1], body, action == "create")
+        elif resource in self.collections and action in RECORD_ACTIONS:
+            if action in ("updateOrCreate", "firstOrCreate") and isinstance(body, dict) and "values" in body:
+                body = body["values"]
+            errors = self.check_records(self.collections[resource], body, RECORD_ACTIONS[action])
+        else:
+            return []
+        self.checked += 1
+        if errors:
+            self.rejected += 1
+        return errors
+
+    def check_records(self, validator: CollectionValidator, body: Any, create: bool) -> List[str]:
+        if not isinstance(body, list):
+            return validator.check(body, create)
+        errors = []
+        for i, record in enumerate(body, start=1):
+            errors.extend(f"record {i}: {message}" for message in validator.check(record, create))
+        return errors
+
+    def check_field(self, collection: str, payload: Any, create: bool, known: Optional[set] = None) -> List[str]:
+        """A fields:create/update payload (also the inline fields of collections:create)."""
+        if not isinstance(payload, dict):
+            return [f"{collection}: field payload must be an object"]
+        name = payload.get("name")
+        label = f"field {collection}.{name}" if name else f"field of {collection}"
+        errors = []
+        if create and not name:
+            errors.append(f"{label}: name is required")
+        elif name is not None and not (isinstance(name, str) and IDENTIFIER.match(name)):
+            errors.append(f"{label}: {name!r} is not a valid field name")
+        field_type = payload.get("type")
+        if create and not field_type:
+            errors.append(f"{label}: type is required")
+        elif field_type is not None and field_type not in KNOWN_FIELD_TYPES:
+            errors.append(f"{label}: unknown type {field_type!r}")
+        if field_type in RELATION_TYPES and (create or "target" in payload):
+            target = payload.get("target")
+            if not target:
+                errors.append(f"{label}: {field_type} needs a target")
+            elif target not in self.collections and target not in (known or ()):
+                errors.append(f"{label}: target collection {target!r} does not exist")
+        return errors
+
+    def check_collection(self, payload: Any) -> List[str]:
+        if not isinstance(payload, dict):
+            return ["collections:create: payload must be an object"]
+        name = payload.get("name")
+        if not (isinstance(name, str) and IDENTIFIER.match(name)):
+            return [f"collections:create: {name!r} is not a valid collection name"]
+        fields = payload.get("fields") or []
+        if not isinstance(fields, list):
+            return [f"collection {name}: fields must be a list"]
+        errors = []
+        seen: set = set()
+        for field in fields:
+            errors.extend(self.check_field(name, field, True, known={name}))
+            field_name = field.get("name") if isinstance(field, dict) else None
+            if field_name in seen:
+                errors.append(f"field {name}.{field_name}: declared twice")
+            seen.add(field_name)
+        return errors
+
+    def rejection(self, method: str, url: str, errors: List[str]) -> httpx.Response:
+        """The 400 NocoBase would have sent, built locally."""
+        return httpx.Response(
+            400,
+            headers={"X-Local-Validation": "rejected"},
+            json={"errors": [{"message": message} for message in errors]},
+            request=httpx.Request(method, url),
+        )
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+
+def load_validator(
+    spec_path: Path,
+    store: Path,
+    base_url: str,
+    rules_dir: Path = DEFAULT_RULES_DIR,
+) -> Validator:
+    """Validator for one instance, from the cached rules when neither source changed."""
+    # Imported here: nocobase_swagger_dump imports nocobase_client, which imports this module
+    from nocobase_swagger_dump import load_document, load_manifest, manifest_path, write_atomic
+
+    ir: Dict[str, Any] = {"collections": {}, "source": {}}
+    if spec_path.exists():
+        ir = load_ir(str(spec_path))
+    else:
+        print(f"WARNING: {spec_path} not found; validating against the Swagger dump only.", file=sys.stderr)
+    namespaces = load_manifest(manifest_path(store, base_url))["namespaces"]
+    digests = {
+        ns: entry["sha256"] for ns, entry in sorted(namespaces.items())
+        if (ns == "collections" or ns.startswith("collections/")) and entry.get("sha256")
+    }
+    if not digests:
+        print(f"WARNING: no Swagger dump of {base_url} in {store} (run nocobase_swagger_dump.py --all); "
+              "validating against the blueprint only.", file=sys.stderr)
+
+    key = content_hash({"version": RULES_VERSION, "ir": ir["source"].get("sha256"), "swagger": digests})
+    path = Path(rules_dir) / f"rules-{key[:16]}.json"
+    rules = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if not isinstance(rules, dict) or rules.get("key") != key:
+        documents = [load_document(store, digest) for digest in digests.values()]
+        rules = compile_rules(ir, [doc for doc in documents if isinstance(doc, dict)])
+        rules["key"] = key
+        try:
+            write_atomic(path, json.dumps(rules, ensure_ascii=False, separators=(",", ":")))
+        except OSError as e:
+            print(f"WARNING: could not cache the validator rules at {path}: {e}", file=sys.stderr)
+    return Validator(rules)
+
+
+def validator_from_env(base_url: str) -> Optional[Validator]:
+    if not str_to_bool(os.getenv("NOCOBASE_VALIDATE", "false")):
+        return None
+    spec = Path(os.getenv("NOCOBASE_VALIDATE_SPEC", "").strip() or DEFAULT_SPEC)
+    store = Path(os.getenv("NOCOBASE_SWAGGER_STORE", "").strip() or DEFAULT_STORE)
+    try:
+        return load_validator(spec, store, base_url)
+    except (OSError, SpecError) as e:
+        print(f"WARNING: local validation disabled: {e}", file=sys.stderr)
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile the local pre-flight validators and list them")
+    parser.add_argument("--base-url", default=os.getenv("NOCOBASE_BASE_URL", "").strip())
+    parser.add_argument("--spec", default=os.getenv("NOCOBASE_VALIDATE_SPEC", "").strip() or str(DEFAULT_SPEC))
+    parser.add_argument("--store", default=os.getenv("NOCOBASE_SWAGGER_STORE", "").strip() or str(DEFAULT_STORE))
+    args = parser.parse_args()
+
+    if not args.base_url:
+        print("ERROR: Missing NOCOBASE_BASE_URL (or --base-url)", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    try:
+        validator = load_validator(Path(args.spec), Path(args.store), args.base_url)
+    except (OSError, SpecError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for name in sorted(validator.collections):
+        coll = validator.collections[name]
+        print(f"{name}: {len(coll.checkers)} checked field(s), {len(coll.required)} required")
+    print(f"{len(validator.collections)} collection(s) in {elapsed_ms:.0f} ms (rules {validator.rules['key'][:16]})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,9 +13,10 @@ Uso:
     python shared/scripts/sync_entrega_turno.py --dry-run
     python shared/scripts/sync_entrega_turno.py --service MQ1
     python shared/scripts/sync_entrega_turno.py --verbose
+    python shared/scripts/sync_entrega_turno.py --from-file censo.ndjson   # censo desde archivo
 
 Requiere:
-    pip install requests python-dotenv
+    pip install requests httpx python-dotenv
 
 Variables de entorno (.env):
     NOCOBASE_BASE_URL  - URL base de NocoBase (ej: https://mira.hospitaldeovalle.cl/api)
@@ -31,16 +32,23 @@ Nota cross-project:
 import os
 import sys
 import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+# Cliente NocoBase compartido (pool de conexiones keep-alive)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python"))
 
 try:
     import requests
     from dotenv import load_dotenv
+    from nocobase_client import NocoBaseClient as PooledClient
+    from nocobase_sources import SourceError, iter_source
 except ImportError:
-    print("ERROR: Dependencias faltantes. Ejecutar: pip install requests python-dotenv")
+    print("ERROR: Dependencias faltantes. Ejecutar: pip install requests httpx python-dotenv")
     sys.exit(1)
 
 # ── Configuracion ────────────────────────────────────────────────────────────
@@ -57,10 +65,28 @@ ALMA_API_TOKEN = os.getenv("ALMA_API_TOKEN", "")
 DRY_RUN = "--dry-run" in sys.argv
 VERBOSE = "--verbose" in sys.argv
 SERVICE_FILTER = None
+FROM_FILE = None
 
 for i, arg in enumerate(sys.argv):
     if arg == "--service" and i + 1 < len(sys.argv):
         SERVICE_FILTER = sys.argv[i + 1]
+    if arg == "--from-file" and i + 1 < len(sys.argv):
+        FROM_FILE = sys.argv[i + 1]
+
+CENSO_COLLECTION = "et_pacientes_censo"
+CENSO_KEY = "id_episodio"
+INDEX_PAGE_SIZE = 1000   # registros por pagina al leer el indice id_episodio -> id
+CREATE_BATCH = 100       # filas por :create (cuerpo array)
+UPDATE_WORKERS = 8       # :update concurrentes (uno por registro)
+BULK_IDS = 300           # ids por :update masivo (filtro id $in, va en la URL)
+
+# Huella por registro sobre los campos clinicos; un paciente cuya huella no
+# cambio no se reescribe. Los campos volatiles (cambian en cada corrida o cada
+# dia sin que cambie nada clinico) quedan fuera: dias_hospitalizacion se
+# refresca en masa solo donde cambio, y ultima_sync marca la ultima vez que el
+# sync escribio el registro (no cada corrida).
+FINGERPRINT_FIELD = "sync_hash"
+VOLATILE_FIELDS = ("dias_hospitalizacion", "ultima_sync")
 
 # Logging
 logging.basicConfig(
@@ -74,35 +100,68 @@ logger = logging.getLogger("sync_entrega_turno")
 
 
 class NocoBaseClient:
-    """Cliente simple para API NocoBase."""
+    """Cliente simple para API NocoBase (sobre el cliente compartido con pool)."""
 
     def __init__(self, base_url: str, api_key: str):
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "X-Role": "root",
-            }
+        self.http = PooledClient.from_env(
+            base_url=self.base_url, api_key=api_key, role="root", timeout_s=30
         )
-        self.session.timeout = 30
 
     def get(self, endpoint: str, params: dict | None = None) -> dict[str, Any]:
         """GET request a NocoBase."""
-        url = f"{self.base_url}{endpoint}"
-        resp = self.session.get(url, params=params)
+        resp = self.http.get(endpoint, params=params)
         resp.raise_for_status()
         return resp.json()
 
-    def post(self, endpoint: str, data: dict[str, Any]) -> dict[str, Any]:
+    def iter_records(
+        self, endpoint: str, params: dict | None = None, page_size: int = 200
+    ) -> Iterator[dict[str, Any]]:
+        """Recorre todas las paginas de un :list, registro a registro."""
+        return self.http.iter_records(endpoint, params=params, page_size=page_size)
+
+    def post(self, endpoint: str, data: dict[str, Any] | list[dict[str, Any]]) -> dict[str, Any]:
         """POST request a NocoBase."""
-        url = f"{self.base_url}{endpoint}"
-        resp = self.session.post(url, json=data)
+        resp = self.http.post(endpoint, json=data)
         resp.raise_for_status()
         return resp.json()
 
+    def key_index(
+        self, collection: str, unique_field: str, fields: list[str] | None = None
+    ) -> dict[Any, dict[str, Any]]:
+        """
+        {valor del campo unico: registro} de toda la coleccion, en un recorrido
+        paginado que solo trae id, el campo unico y ``fields``.
+        """
+        return {
+            record.get(unique_field): record
+            for record in self.iter_records(
+                f"/{collection}:list",
+                params={"fields": ["id", unique_field] + (fields or [])},
+                page_size=INDEX_PAGE_SIZE,
+            )
+        }
+
+    def create_many(self, collection: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+        """Crea varios registros en un solo :create (cuerpo array, todos o ninguno)."""
+        return self.post(f"/{collection}:create", rows)
+
+    def update(self, collection: str, record_id: Any, data: dict[str, Any]) -> dict[str, Any]:
+        resp = self.http.post(f"/{collection}:update", params={"filterByTk": record_id}, json=data)
+        resp.raise_for_status()
+        return resp.json()
+
+    def update_many(self, collection: str, ids: list[Any], data: dict[str, Any]) -> dict[str, Any]:
+        """Aplica los mismos valores a todos los registros ``ids`` en un solo :update."""
+        resp = self.http.post(
+            f"/{collection}:update", params={"filter": {"id": {"$in": ids}}}, json=data
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def close(self) -> None:
+        self.http.close()
+
     def upsert(
         self, collection: str, data: dict[str, Any], unique_field: str
     ) -> dict[str, Any]:
@@ -141,9 +200,19 @@ def extract_censo_alma(client_alma: requests.Session | None = None) -> list[dict
     """
     Extraer censo de pacientes hospitalizados desde ALMA/TrakCare.
 
+    Con --from-file lee el censo de un archivo CSV/NDJSON/XLSX/Parquet (por
+    ejemplo el generado por nocobase_synth.py para pruebas de carga).
     Si ALMA_API_URL esta configurado, consulta la API directamente.
     Si no, retorna datos de ejemplo para pruebas (modo mock).
     """
+    if FROM_FILE:
+        logger.info(f"Leyendo censo desde archivo: {FROM_FILE}")
+        try:
+            return list(iter_source(FROM_FILE))
+        except (OSError, SourceError, ValueError) as e:
+            logger.error(f"  Error leyendo {FROM_FILE}: {e}")
+            return []
+
     if ALMA_API_URL and client_alma:
         logger.info(f"Extrayendo censo desde ALMA: {ALMA_API_URL}")
         try:
@@ -200,9 +269,19 @@ def extract_censo_alma(client_alma: requests.Session | None = None) -> list[dict
 # ── Transformacion ───────────────────────────────────────────────────────────
 
 
+def fingerprint(pac: dict[str, Any]) -> str:
+    """Huella de los campos clinicos de un paciente (sin volatiles ni la propia huella)."""
+    clinical = {k: v for k, v in pac.items() if k not in VOLATILE_FIELDS and k != FINGERPRINT_FIELD}
+    text = json.dumps(clinical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 def transform_paciente(raw: dict[str, Any]) -> dict[str, Any]:
     """
     Transforma un registro de ALMA al formato de et_pacientes_censo.
+    Acepta tambien registros que ya vienen con los nombres de NocoBase
+    (medico_tratante_alma, especialidad_clinica), como los de nocobase_synth.py.
+    El resultado lleva su huella en sync_hash.
     """
     # Calcular dias de hospitalizacion
     dias_hosp = 0
@@ -214,7 +293,7 @@ def transform_paciente(raw: dict[str, Any]) -> dict[str, Any]:
         except (ValueError, TypeError):
             pass
 
-    return {
+    pac = {
         "id_episodio": raw.get("id_episodio", ""),
         "rut": raw.get("rut", ""),
         "nro_ficha": raw.get("nro_ficha", ""),
@@ -223,47 +302,170 @@ def transform_paciente(raw: dict[str, Any]) -> dict[str, Any]:
         "sexo": raw.get("sexo", ""),
         "sala": raw.get("sala", ""),
         "cama": raw.get("cama", ""),
-        "medico_tratante_alma": raw.get("medico_tratante", ""),
-        "especialidad_clinica": raw.get("especialidad", ""),
+        "medico_tratante_alma": raw.get("medico_tratante", raw.get("medico_tratante_alma", "")),
+        "especialidad_clinica": raw.get("especialidad", raw.get("especialidad_clinica", "")),
         "f_ingreso": f_ingreso,
         "dias_hospitalizacion": dias_hosp,
         "dx_principal": raw.get("dx_principal", ""),
         "alta_confirmada": False,
         "ultima_sync": datetime.now().isoformat(),
     }
+    pac[FINGERPRINT_FIELD] = fingerprint(pac)
+    return pac
 
 
 # ── Carga a NocoBase ────────────────────────────────────────────────────────
 
 
-def load_to_nocobase(
-    nb_client: NocoBaseClient, pacientes: list[dict[str, Any]]
-) -> tuple[int, int, int]:
+def partition_censo(
+    pacientes: list[dict[str, Any]], index: dict[Any, dict[str, Any]]
+) -> tuple[
+    list[dict[str, Any]],
+    list[tuple[Any, dict[str, Any]]],
+    list[tuple[dict[str, Any], dict[str, Any]]],
+    int,
+]:
     """
-    Carga pacientes transformados a et_pacientes_censo via upsert.
-    Retorna (creados, actualizados, errores).
+    Separa el censo en (a crear, a actualizar [(id, paciente)], sin cambios
+    [(existente, paciente)], errores) segun el indice id_episodio -> registro
+    ya existente en NocoBase y la huella guardada en cada registro.
     """
-    created = 0
-    updated = 0
+    creates: list[dict[str, Any]] = []
+    updates: list[tuple[Any, dict[str, Any]]] = []
+    unchanged: list[tuple[dict[str, Any], dict[str, Any]]] = []
     errors = 0
-
+    seen: set = set()
     for pac in pacientes:
-        try:
-            if DRY_RUN:
-                logger.info(
-                    f"  [DRY RUN] Upsert: {pac['nombre']} ({pac['id_episodio']})"
+        key = pac.get(CENSO_KEY)
+        if not key:
+            logger.error(f"  Paciente sin {CENSO_KEY}: {pac.get('nombre')}")
+            errors += 1
+            continue
+        if key in seen:
+            logger.warning(f"  {CENSO_KEY} repetido en el censo: {key}; se usa la primera fila")
+            continue
+        seen.add(key)
+        existing = index.get(key)
+        if existing is None:
+            creates.append(pac)
+        elif existing.get(FINGERPRINT_FIELD) != pac[FINGERPRINT_FIELD]:
+            updates.append((existing.get("id"), pac))
+        else:
+            unchanged.append((existing, pac))
+    return creates, updates, unchanged, errors
+
+
+def create_batch(nb_client: NocoBaseClient, batch: list[dict[str, Any]]) -> int:
+    """
+    Crea un lote en un solo request; si el servidor lo rechaza (es todo o
+    nada), reintenta fila a fila para aislar las malas. Retorna errores.
+    """
+    try:
+        nb_client.create_many(CENSO_COLLECTION, batch)
+        logger.debug(f"  Creados {len(batch)}: {batch[0][CENSO_KEY]} .. {batch[-1][CENSO_KEY]}")
+        return 0
+    except Exception as e:
+        if len(batch) == 1:
+            logger.error(f"  Error creando {batch[0][CENSO_KEY]}: {e}")
+            return 1
+        logger.warning(f"  Lote de {len(batch)} rechazado ({e}); reintentando fila a fila")
+    return sum(create_batch(nb_client, [pac]) for pac in batch)
+
+
+def update_one(nb_client: NocoBaseClient, record_id: Any, pac: dict[str, Any]) -> int:
+    try:
+        nb_client.update(CENSO_COLLECTION, record_id, pac)
+        logger.debug(f"  Actualizado: {pac['nombre']} ({pac[CENSO_KEY]})")
+        return 0
+    except Exception as e:
+        logger.error(f"  Error actualizando {pac[CENSO_KEY]}: {e}")
+        return 1
+
+
+def refresh_volatile(
+    nb_client: NocoBaseClient, unchanged: list[tuple[dict[str, Any], dict[str, Any]]]
+) -> int:
+    """
+    Refresca dias_hospitalizacion de los pacientes sin cambios clinicos solo
+    donde cambio (al cambiar el dia), con :update masivos (filtro id $in)
+    agrupados por valor; ultima_sync se escribe junto con ese cambio. Los
+    pacientes sin ningun cambio no se tocan: no se reescriben ni disparan
+    hooks ni workflows de update. Retorna errores.
+    """
+    now = datetime.now().isoformat()
+    groups: dict[Any, list[Any]] = {}
+    for existing, pac in unchanged:
+        if existing.get("dias_hospitalizacion") != pac["dias_hospitalizacion"]:
+            groups.setdefault(pac["dias_hospitalizacion"], []).append(existing.get("id"))
+
+    errors = 0
+    for dias, ids in groups.items():
+        for i in range(0, len(ids), BULK_IDS):
+            chunk = ids[i:i + BULK_IDS]
+            try:
+                nb_client.update_many(
+                    CENSO_COLLECTION, chunk, {"dias_hospitalizacion": dias, "ultima_sync": now}
                 )
-                continue
+            except Exception as e:
+                logger.error(f"  Error refrescando dias_hospitalizacion de {len(chunk)} pacientes: {e}")
+                errors += len(chunk)
+    return errors
 
-            nb_client.upsert("et_pacientes_censo", pac, "id_episodio")
-            logger.debug(f"  Upsert OK: {pac['nombre']} ({pac['id_episodio']})")
-            # Contamos como creado/actualizado (API no distingue)
-            created += 1
-        except Exception as e:
-            logger.error(f"  Error upsert {pac.get('id_episodio')}: {e}")
-            errors += 1
 
-    return created, updated, errors
+def load_to_nocobase(
+    nb_client: NocoBaseClient, pacientes: list[dict[str, Any]]
+) -> tuple[int, int, int, int]:
+    """
+    Carga pacientes transformados a et_pacientes_censo.
+
+    Lee una sola vez el indice id_episodio -> registro existente (paginado,
+    solo id, id_episodio, sync_hash y dias_hospitalizacion), separa
+    localmente altas, actualizaciones y pacientes sin cambios y las envia en
+    lote: las altas en :create de CREATE_BATCH filas, las actualizaciones en
+    paralelo (UPDATE_WORKERS) y, para los sin cambios, solo
+    dias_hospitalizacion donde cambio, en :update masivos. Retorna (creados, actualizados, sin
+    cambios, errores).
+    """
+    try:
+        index = nb_client.key_index(
+            CENSO_COLLECTION, CENSO_KEY, [FINGERPRINT_FIELD, "dias_hospitalizacion"]
+        )
+    except Exception as e:
+        if not DRY_RUN:
+            logger.error(f"  Error leyendo {CENSO_KEY} existentes: {e}")
+            return 0, 0, 0, len(pacientes)
+        logger.warning(f"  [DRY RUN] No se pudo leer {CENSO_KEY} existentes ({e}); se asumen altas")
+        index = {}
+    logger.info(f"  Existentes en {CENSO_COLLECTION}: {len(index)}")
+    if index and not any(record.get(FINGERPRINT_FIELD) for record in index.values()):
+        logger.warning(
+            f"  Ningun registro tiene {FINGERPRINT_FIELD}: si el campo no esta desplegado "
+            f"(nocobase_configure.py) todos los pacientes se reescriben en cada corrida"
+        )
+
+    creates, updates, unchanged, errors = partition_censo(pacientes, index)
+
+    if DRY_RUN:
+        for pac in creates:
+            logger.info(f"  [DRY RUN] Crear: {pac['nombre']} ({pac[CENSO_KEY]})")
+        for record_id, pac in updates:
+            logger.info(f"  [DRY RUN] Actualizar id={record_id}: {pac['nombre']} ({pac[CENSO_KEY]})")
+        return len(creates), len(updates), len(unchanged), errors
+
+    create_errors = sum(
+        create_batch(nb_client, creates[i:i + CREATE_BATCH])
+        for i in range(0, len(creates), CREATE_BATCH)
+    )
+    with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as pool:
+        update_errors = sum(pool.map(lambda item: update_one(nb_client, *item), updates))
+    refresh_errors = refresh_volatile(nb_client, unchanged) if unchanged else 0
+
+    return (
+        len(creates) - create_errors,
+        len(updates) - update_errors,
+        len(unchanged) - refresh_errors,
+        errors + create_errors + update_errors + refresh_errors,
+    )
 
 
 # ── Main ─────────────────────────────────────────────────────────────────────
@@ -292,7 +494,8 @@ def main():
     # Filtrar por servicio si se especifico
     if SERVICE_FILTER:
         raw_pacientes = [
-            p for p in raw_pacientes if p.get("servicio_codigo") == SERVICE_FILTER
+            p for p in raw_pacientes
+            if p.get("servicio_codigo", p.get("servicio_id")) == SERVICE_FILTER
         ]
         logger.info(
             f"  Filtrado por servicio '{SERVICE_FILTER}': {len(raw_pacientes)} registros"
@@ -310,14 +513,22 @@ def main():
     # 3. LOAD — cargar a NocoBase
     logger.info("\n--- FASE 3: LOAD (NocoBase) ---")
     nb_client = NocoBaseClient(NOCOBASE_BASE_URL, NOCOBASE_API_KEY)
-    created, updated, errors = load_to_nocobase(nb_client, transformed)
+    created, updated, unchanged, errors = load_to_nocobase(nb_client, transformed)
+    nb_client.close()
+    logger.info(f"  HTTP: {nb_client.http.stats.summary()}")
 
     # Resumen
     logger.info("\n" + "=" * 60)
     if DRY_RUN:
-        logger.info(f"  [DRY RUN] {len(transformed)} registros simulados")
+        logger.info(
+            f"  [DRY RUN] {len(transformed)} registros simulados: "
+            f"{created} a crear, {updated} a actualizar, {unchanged} sin cambios, {errors} errores"
+        )
     else:
-        logger.info(f"  Sync completado: {created} upserts, {errors} errores")
+        logger.info(
+            f"  Sync completado: {created} creados, {updated} actualizados, "
+            f"{unchanged} sin cambios, {errors} errores"
+        )
     logger.info("=" * 60)
 
 
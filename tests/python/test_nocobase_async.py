@@ -0,0 +1,112 @@
+"""Unit tests for shared/python/nocobase_async.py against a local fake server."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from nocobase_async import AsyncNocoBaseClient
+from nocobase_client import NocoBaseClient
+from nocobase_ratelimit import SqliteTokenBucket
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers every request with an empty list after ``delay_s``, tracking requests in flight."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        time.sleep(server.delay_s)
+        with server.lock:
+            server.in_flight -= 1
+        body = json.dumps({"data": []}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.in_flight = httpd.peak = 0
+    httpd.delay_s = 0.05
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base_url(httpd):
+    return f"http://127.0.0.1:{httpd.server_address[1]}/api"
+
+
+def test_concurrency_is_capped_per_host(server):
+    async def run():
+        async with AsyncNocoBaseClient(base_url(server), "k", max_concurrency=3) as client:
+            responses = await asyncio.gather(*(client.get("todos:list") for _ in range(12)))
+        return [resp.status_code for resp in responses]
+
+    assert asyncio.run(run()) == [200] * 12
+    assert server.peak == 3
+
+
+def test_tokens_are_shared_with_the_sync_client(server, tmp_path):
+    # Two buckets on one file stand for two processes; the rate is low enough
+    # that no token refills during the test.
+    path = str(tmp_path / "bucket.db")
+    sync_bucket = SqliteTokenBucket(path, rate=0.01, burst=3)
+    async_bucket = SqliteTokenBucket(path, rate=0.01, burst=3)
+
+    with NocoBaseClient(base_url(server), "k", rate_limiter=sync_bucket) as client:
+        client.get("todos:list")
+        client.get("todos:list")
+
+    async def run():
+        async with AsyncNocoBaseClient(base_url(server), "k", rate_limiter=async_bucket) as client:
+            await client.get("todos:list")
+
+    asyncio.run(run())
+    assert sync_bucket.try_acquire() > 0
+
+
+def test_token_reservation_does_not_block_the_event_loop(server, tmp_path):
+    path = str(tmp_path / "bucket.db")
+    bucket = SqliteTokenBucket(path, rate=100, burst=10)
+    locker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    locker.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.5, lambda: locker.execute("COMMIT")).start()
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        tick_task = asyncio.ensure_future(ticker())
+        async with AsyncNocoBaseClient(base_url(server), "k", rate_limiter=bucket) as client:
+            resp = await client.get("todos:list")
+        tick_task.cancel()
+        return resp.status_code, ticks
+
+    try:
+        status, ticks = asyncio.run(run())
+    finally:
+        locker.close()
+    assert status == 200
+    assert ticks >= 5
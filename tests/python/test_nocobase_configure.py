@@ -0,0 +1,175 @@
+"""Unit tests for the plan side of shared/python/nocobase_configure.py."""
+
+import copy
+
+import pytest
+from nocobase_configure import (
+    apply_plan,
+    build_plan,
+    diff_payload,
+    op_key,
+    plan_dependencies,
+    topological_order,
+)
+from nocobase_spec import compile_spec
+
+SPEC = {
+    "data_model": {
+        "collections": [
+            {
+                "name": "departments",
+                "fields": [
+                    {"name": "code", "type": "string", "unique": True},
+                    {"name": "name", "type": "string"},
+                ],
+            },
+            {
+                "name": "staff",
+                "fields": [
+                    {"name": "full_name", "type": "string", "required": True},
+                    {"name": "department_id", "type": "bigInt"},
+                    {"name": "department", "type": "belongsTo", "target": "departments", "foreignKey": "department_id"},
+                ],
+            },
+        ],
+    },
+}
+
+
+@pytest.fixture
+def collections():
+    ir = compile_spec(copy.deepcopy(SPEC))
+    return [ir["collections"][name] for name in ("departments", "staff")]
+
+
+def deployed(collections):
+    """The live schema NocoBase reports once ``collections`` are fully applied."""
+    return {
+        entry["definition"]["name"]: {
+            "collection": {**copy.deepcopy(entry["payload"]), "key": "k-" + entry["definition"]["name"]},
+            "fields": {name: {**copy.deepcopy(payload), "key": "f-" + name} for name, payload in entry["fields"].items()},
+        }
+        for entry in collections
+    }
+
+
+def test_diff_payload_ignores_none_and_extra_live_keys():
+    assert diff_payload({"a": 1, "b": None}, {"a": 1, "b": 2, "c": 3}) == []
+
+
+def test_diff_payload_reports_nested_paths():
+    changes = diff_payload({"uiSchema": {"title": "Code"}}, {"uiSchema": {"title": "Codigo", "x": 1}})
+    assert changes == ["uiSchema.title: 'Codigo' -> 'Code'"]
+
+
+def test_empty_instance_creates_everything(collections):
+    plan, in_sync = build_plan(collections, {})
+    assert in_sync == 0
+    assert [(op["op"], op["kind"], op["collection"], op.get("name")) for op in plan] == [
+        ("create", "collection", "departments", None),
+        ("create", "field", "departments", "code"),
+        ("create", "field", "departments", "name"),
+        ("create", "collection", "staff", None),
+        ("create", "field", "staff", "full_name"),
+        ("create", "field", "staff", "department_id"),
+        ("create", "field", "staff", "department"),
+    ]
+
+
+def test_rerun_on_a_deployed_instance_is_a_no_op(collections):
+    plan, in_sync = build_plan(collections, deployed(collections))
+    assert plan == []
+    assert in_sync == 2 + 5
+
+
+def test_changed_field_becomes_one_update(collections):
+    live = deployed(collections)
+    live["departments"]["fields"]["name"]["uiSchema"]["title"] = "Nombre"
+    plan, in_sync = build_plan(collections, live)
+    assert len(plan) == 1
+    op = plan[0]
+    assert (op["op"], op["kind"], op["collection"], op["name"]) == ("update", "field", "departments", "name")
+    assert op["changes"] == ["uiSchema.title: 'Nombre' -> 'Name'"]
+    assert in_sync == 2 + 4
+
+
+def test_missing_field_on_a_live_collection_is_created(collections):
+    live = deployed(collections)
+    del live["staff"]["fields"]["full_name"]
+    plan, _ = build_plan(collections, live)
+    assert [(op["op"], op["kind"], op.get("name")) for op in plan] == [("create", "field", "full_name")]
+
+
+def test_bulk_inlines_plain_fields_but_not_relations(collections):
+    plan, _ = build_plan(collections, {}, bulk=True)
+    creates = {op["collection"]: op for op in plan if op["kind"] == "collection"}
+    assert [f["name"] for f in creates["departments"]["payload"]["fields"]] == ["code", "name"]
+    assert [f["name"] for f in creates["staff"]["payload"]["fields"]] == ["full_name", "department_id"]
+    assert [(op["collection"], op["name"]) for op in plan if op["kind"] == "field"] == [("staff", "department")]
+
+
+def labels(plan):
+    return [".".join(op_key(op)[1:]) for op in plan]
+
+
+def test_topological_order_puts_dependencies_first(collections):
+    # Blueprint order reversed: staff and its relation come before departments
+    plan, _ = build_plan(list(reversed(collections)), {})
+    ordered = labels(topological_order(plan, plan_dependencies(plan)))
+    assert ordered.index("departments") < ordered.index("staff.department")
+    assert ordered.index("staff.department_id") < ordered.index("staff.department")
+    for name in ("full_name", "department_id", "department"):
+        assert ordered.index("staff") < ordered.index(f"staff.{name}")
+
+
+def test_topological_order_keeps_blueprint_order_among_ready_ops(collections):
+    plan, _ = build_plan(collections, {})
+    ordered = labels(topological_order(plan, plan_dependencies(plan)))
+    assert ordered[:2] == ["departments", "staff"]
+    assert sorted(ordered) == sorted(labels(plan))
+
+
+def test_live_targets_are_no_dependency(collections):
+    live = deployed(collections[:1])
+    plan, _ = build_plan(collections, live)
+    deps = plan_dependencies(plan)
+    assert deps[("field", "staff", "department")] == [("collection", "staff"), ("field", "staff", "department_id")]
+
+
+def test_topological_order_rejects_a_cycle():
+    plan = [
+        {"op": "create", "kind": "field", "collection": "a", "name": "x", "payload": {}},
+        {"op": "create", "kind": "field", "collection": "a", "name": "y", "payload": {}},
+    ]
+    deps = {("field", "a", "x"): [("field", "a", "y")], ("field", "a", "y"): [("field", "a", "x")]}
+    with pytest.raises(ValueError, match="dependency cycle between: a.x, a.y"):
+        topological_order(plan, deps)
+
+
+class FailingClient:
+    """Rejects every collections:create; anything else succeeds."""
+
+    def __init__(self):
+        self.paths = []
+
+    def post(self, path, **_kwargs):
+        self.paths.append(path)
+        return FakeResponse(400 if path == "collections:create" else 200)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = "{}"
+
+    def json(self):
+        return {"data": {}}
+
+
+def test_dependents_of_a_failed_op_are_skipped(collections, capsys):
+    plan, _ = build_plan(collections[:1], {})
+    client = FailingClient()
+    failed = apply_plan(client, plan, jobs=4)
+    assert client.paths == ["collections:create"]
+    assert failed == {("collection", "departments"), ("field", "departments", "code"), ("field", "departments", "name")}
+    assert "[SKIP] field departments.code: depends on failed departments" in capsys.readouterr().out
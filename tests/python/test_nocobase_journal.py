@@ -0,0 +1,111 @@
+"""Unit tests for shared/python/nocobase_journal.py and resuming in nocobase_configure.py."""
+
+import pytest
+from nocobase_configure import settle_in_flight
+from nocobase_journal import DeployJournal, request_hash
+
+COLLECTION = {"op": "create", "kind": "collection", "collection": "departments", "definition": {"name": "departments"}}
+CODE = {"op": "create", "kind": "field", "collection": "departments", "name": "code",
+        "definition": {"name": "code", "type": "string"}, "payload": {"name": "code", "type": "string"}}
+NAME = {"op": "create", "kind": "field", "collection": "departments", "name": "name",
+        "definition": {"name": "name", "type": "string"}, "payload": {"name": "name", "type": "string"}}
+TITLE = {"op": "update", "kind": "collection", "collection": "departments", "payload": {"title": "Deptos"}}
+PLAN = [COLLECTION, CODE, NAME, TITLE]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = DeployJournal(tmp_path / "journal" / "configure.jsonl")
+    yield journal
+    journal.close()
+
+
+def crashed_run(journal):
+    """A run that applied the collection, then died with two operations in flight."""
+    journal.begin({"spec_sha256": "abc"}, PLAN)
+    journal.started(COLLECTION)
+    journal.done(COLLECTION, "departments")
+    journal.started(CODE)
+    journal.started(TITLE)
+    journal.close()
+
+
+def test_replay_of_a_crashed_run(journal):
+    crashed_run(journal)
+    replay = DeployJournal.load(journal.path)
+    assert replay.meta == {"spec_sha256": "abc"}
+    assert replay.done == {request_hash(COLLECTION): "departments"}
+    assert replay.in_flight == {request_hash(CODE), request_hash(TITLE)}
+    assert not replay.ended
+    assert replay.remaining() == [CODE, NAME, TITLE]
+
+
+def test_torn_last_line_is_ignored(journal):
+    crashed_run(journal)
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "done", "hash": "')
+    assert DeployJournal.load(journal.path).remaining() == [CODE, NAME, TITLE]
+
+
+def test_missing_journal_loads_as_none(tmp_path):
+    assert DeployJournal.load(tmp_path / "nothing.jsonl") is None
+
+
+def test_edited_operation_is_not_mistaken_for_a_finished_one():
+    edited = {**CODE, "payload": {**CODE["payload"], "unique": True}}
+    assert request_hash(edited) != request_hash(CODE)
+
+
+def test_resumed_run_reopens_an_ended_journal(journal):
+    journal.begin({}, PLAN)
+    journal.end(2)
+    journal.started(NAME)
+    replay = DeployJournal.load(journal.path)
+    assert not replay.ended
+    assert replay.failures == 2
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return {"data": self._data}
+
+
+class SchemaClient:
+    """Answers :get for what exists on the server; records every request."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.requests = []
+
+    def get(self, path, params=None):
+        self.requests.append((path, params["filterByTk"]))
+        record = self.existing.get((path, params["filterByTk"]))
+        return FakeResponse(200, record) if record else FakeResponse(404)
+
+
+def test_settle_in_flight_journals_creates_that_reached_the_server(journal, capsys):
+    crashed_run(journal)
+    replay = DeployJournal.load(journal.path)
+    client = SchemaClient({("collections/departments/fields:get", "code"): {"key": "f-code", "name": "code"}})
+
+    remaining = settle_in_flight(client, journal, replay.remaining(), replay)
+
+    # The in-flight create landed, so it is journaled done; the in-flight update
+    # is resent (idempotent) without asking the server, NAME was never started.
+    assert client.requests == [("collections/departments/fields:get", "code")]
+    assert remaining == [NAME, TITLE]
+    assert replay.done[request_hash(CODE)] == "f-code"
+    assert "field departments.code was applied before the interruption" in capsys.readouterr().out
+    journal.close()
+    assert DeployJournal.load(journal.path).remaining() == [NAME, TITLE]
+
+
+def test_settle_in_flight_keeps_creates_the_server_never_saw(journal):
+    crashed_run(journal)
+    replay = DeployJournal.load(journal.path)
+    remaining = settle_in_flight(SchemaClient({}), journal, replay.remaining(), replay)
+    assert remaining == [CODE, NAME, TITLE]
@@ -0,0 +1,158 @@
+"""Unit tests for chunked seeding in shared/python/nocobase_seed.py."""
+
+import threading
+
+from nocobase_seed import KeyLookup, iter_chunks, natural_key, send_chunk, upsert_key_usable
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class AllOrNothingClient:
+    """Creates a chunk in one transaction, rejecting it whole when any row has ``bad``."""
+
+    def __init__(self):
+        self.bodies = []
+        self.created = []
+
+    def post(self, _endpoint, json):
+        self.bodies.append(json)
+        rows = json if isinstance(json, list) else [json]
+        if any(row.get("bad") for row in rows):
+            return FakeResponse(400, {"errors": [{"message": "bad row"}]})
+        records = [{"id": len(self.created) + n + 1, **row} for n, row in enumerate(rows)]
+        self.created.extend(records)
+        return FakeResponse(200, {"data": records if isinstance(json, list) else records[0]})
+
+
+def chunk_of(n, bad=()):
+    return [(idx, {"code": f"C{idx}", "bad": idx in bad}) for idx in range(1, n + 1)]
+
+
+def test_good_chunk_is_one_request(capsys):
+    client = AllOrNothingClient()
+    assert send_chunk(client, "things:create", "things", chunk_of(8)) == 0
+    assert len(client.bodies) == 1
+    assert "[things #1-8] HTTP 200 OK (8 rows)" in capsys.readouterr().out
+
+
+def test_one_bad_row_is_isolated_and_the_rest_created(capsys):
+    client = AllOrNothingClient()
+    assert send_chunk(client, "things:create", "things", chunk_of(8, bad={5})) == 1
+    assert sorted(record["code"] for record in client.created) == [f"C{i}" for i in (1, 2, 3, 4, 6, 7, 8)]
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: one failed request per level plus the good halves
+    assert len(client.bodies) == 7
+    out = capsys.readouterr().out
+    assert "[things #5] HTTP 400 FAIL: bad row" in out
+    assert out.count("FAIL") == 1
+
+
+def test_several_bad_rows_are_each_reported():
+    client = AllOrNothingClient()
+    assert send_chunk(client, "things:create", "things", chunk_of(10, bad={1, 2, 9}), quiet=True) == 3
+    assert len(client.created) == 7
+
+
+def test_single_row_is_sent_as_an_object():
+    client = AllOrNothingClient()
+    send_chunk(client, "things:create", "things", chunk_of(1))
+    assert client.bodies == [{"code": "C1", "bad": False}]
+
+
+def test_created_records_reach_the_callback():
+    client = AllOrNothingClient()
+    seen = []
+    send_chunk(client, "things:create", "things", chunk_of(4, bad={2}), quiet=True, on_created=seen.extend)
+    assert sorted(record["code"] for record in seen) == ["C1", "C3", "C4"]
+
+
+def test_transport_error_is_bisected_like_a_rejection(capsys):
+    class DroppingClient(AllOrNothingClient):
+        def post(self, endpoint, json):
+            rows = json if isinstance(json, list) else [json]
+            if any(row["code"] == "C3" for row in rows):
+                raise ConnectionError("reset by peer")
+            return super().post(endpoint, json)
+
+    client = DroppingClient()
+    assert send_chunk(client, "things:create", "things", chunk_of(4), quiet=True) == 1
+    assert [record["code"] for record in client.created] == ["C1", "C2", "C4"]
+    assert "[things #3] ERROR FAIL: reset by peer" in capsys.readouterr().out
+
+
+def test_iter_chunks():
+    assert [len(chunk) for chunk in iter_chunks(chunk_of(7), 3)] == [3, 3, 1]
+
+
+class SlowIndexClient:
+    """Serves ``:list`` key indexes; the one for ``slow`` waits until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.listed = []
+
+    def iter_records(self, path, **_kwargs):
+        self.listed.append(path)
+        if path == "slow:list":
+            assert self.release.wait(5)
+        return iter([{"id": 10, "code": "A"}])
+
+
+def test_cached_lookups_do_not_wait_for_another_collections_fetch():
+    client = SlowIndexClient()
+    lookup = KeyLookup(client, {"slow": "code", "cached": "code"})
+    lookup.add("cached", [{"id": 7, "code": "B"}])
+    results = {}
+    fetching = threading.Thread(target=lambda: results.setdefault("slow", lookup.resolve("slow", "A")))
+    fetching.start()
+    try:
+        assert lookup.resolve("cached", "B") == 7
+        assert "slow" not in results
+    finally:
+        client.release.set()
+        fetching.join()
+    assert results["slow"] == 10
+
+
+def test_key_index_is_fetched_once_per_collection():
+    client = SlowIndexClient()
+    client.release.set()
+    lookup = KeyLookup(client, {"slow": "code"})
+    threads = [threading.Thread(target=lookup.resolve, args=("slow", "A")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert lookup.resolve("slow", "missing") is None
+    assert client.listed == ["slow:list"]
+
+
+IR = {
+    "collections": {
+        "departments": {"fields": {"code": {"type": "string", "unique": True}, "name": {"type": "string"}}},
+        "et_servicios": {"fields": {"codigo": {"type": "string", "unique": True}, "nombre": {"type": "string"}}},
+    }
+}
+
+
+def test_global_upsert_key_falls_back_to_each_collections_natural_key():
+    assert natural_key(IR, "et_servicios", "codigo", {}) == "codigo"
+    assert natural_key(IR, "departments", "codigo", {}) == "code"
+    assert natural_key(IR, "departments", "codigo", {"departments": "name"}) == "name"
+
+
+def test_upsert_key_must_identify_the_rows():
+    rows = [{"code": "ONCO", "name": "Oncologia"}]
+    assert upsert_key_usable(IR, "departments", "code", rows)
+    assert not upsert_key_usable(IR, "departments", "codigo", rows)
+    assert not upsert_key_usable(IR, "departments", None, rows)
+    # File sources are checked against the blueprint; without one anything goes
+    assert upsert_key_usable(IR, "departments", "code", None)
+    assert not upsert_key_usable(IR, "departments", "rut", None)
+    assert upsert_key_usable(None, "departments", "rut", None)
@@ -0,0 +1,53 @@
+"""Unit tests for shared/python/nocobase_stream.py."""
+
+import json
+
+import pytest
+from nocobase_stream import iter_data_records, iter_events
+
+BODIES = [
+    '{"data":[3.14159]}',
+    '{"data":[1e5, 2]}',
+    '{"data":[-12.5E-3,0,7],"meta":{"count":3}}',
+    '{"data":{"id":42},"meta":{"page":1}}',
+    '{"data":[{"id":1,"score":98.6},{"id":22,"tags":["a","b"]}]}',
+    '{"data":[true,false,null,"x"]}',
+]
+DOCUMENTS = ['[1.5, 20]', '123456', '-0.25e+2']
+
+
+def records(chunks):
+    return list(iter_data_records(iter_events(chunks)))
+
+
+def expected(body):
+    data = json.loads(body)["data"]
+    return data if isinstance(data, list) else [data]
+
+
+@pytest.mark.parametrize("body", BODIES)
+def test_split_at_every_offset(body):
+    for offset in range(len(body) + 1):
+        assert records([body[:offset], body[offset:]]) == expected(body), offset
+
+
+@pytest.mark.parametrize("body", BODIES)
+def test_one_char_per_chunk(body):
+    assert records(list(body)) == expected(body)
+
+
+@pytest.mark.parametrize("body", DOCUMENTS)
+def test_document_split_at_every_offset(body):
+    for offset in range(len(body) + 1):
+        events = list(iter_events([body[:offset], body[offset:]]))
+        assert events == [("document", None, json.loads(body))], offset
+
+
+def test_number_split_across_chunks():
+    assert records(["{", '"data":[3.', "14159]}"]) == [3.14159]
+    assert records(['{"data":[1e', "5, 2]}"]) == [1e5, 2]
+
+
+def test_truncated_body_is_an_error():
+    with pytest.raises(ValueError):
+        records(['{"data":[1,', "2"])
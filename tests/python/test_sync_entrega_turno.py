@@ -0,0 +1,108 @@
+"""Unit tests for the census load in shared/scripts/sync_entrega_turno.py."""
+
+import sync_entrega_turno as etl
+
+RAW = [
+    {"id_episodio": "EP1", "rut": "1-9", "nombre": "Ana", "f_ingreso": "2026-02-20T10:00:00", "dx_principal": "Neumonia"},
+    {"id_episodio": "EP2", "rut": "2-7", "nombre": "Luis", "f_ingreso": "2026-02-25T08:00:00", "dx_principal": "Fractura"},
+    {"id_episodio": "EP3", "rut": "3-5", "nombre": "Rosa", "f_ingreso": "2026-02-27T22:00:00", "dx_principal": "Colecistitis"},
+]
+
+
+def census():
+    return [etl.transform_paciente(raw) for raw in RAW]
+
+
+class FakeCensus:
+    """et_pacientes_censo in memory, with the calls load_to_nocobase makes."""
+
+    def __init__(self):
+        self.records = {}
+        self.writes = []
+
+    def key_index(self, collection, unique_field, fields=None):
+        assert collection == etl.CENSO_COLLECTION
+        return {
+            record[unique_field]: {k: record.get(k) for k in ["id", unique_field] + (fields or [])}
+            for record in self.records.values()
+        }
+
+    def create_many(self, collection, rows):
+        assert collection == etl.CENSO_COLLECTION
+        self.writes.append(("create", [row[etl.CENSO_KEY] for row in rows]))
+        for row in rows:
+            record_id = len(self.records) + 1
+            self.records[record_id] = {**row, "id": record_id}
+
+    def update(self, collection, record_id, data):
+        assert collection == etl.CENSO_COLLECTION
+        self.writes.append(("update", [record_id]))
+        self.records[record_id].update(data)
+
+    def update_many(self, collection, ids, data):
+        assert collection == etl.CENSO_COLLECTION
+        self.writes.append(("update_many", sorted(ids), sorted(data)))
+        for record_id in ids:
+            self.records[record_id].update(data)
+
+
+def test_fingerprint_ignores_volatile_fields():
+    pac = census()[0]
+    later = {**pac, "dias_hospitalizacion": pac["dias_hospitalizacion"] + 1, "ultima_sync": "2030-01-01T00:00:00"}
+    assert etl.fingerprint(later) == etl.fingerprint(pac) == pac[etl.FINGERPRINT_FIELD]
+
+
+def test_fingerprint_changes_with_clinical_fields():
+    pac = census()[0]
+    assert etl.fingerprint({**pac, "dx_principal": "Sepsis"}) != pac[etl.FINGERPRINT_FIELD]
+
+
+def test_partition_sorts_new_changed_and_unchanged_rows():
+    stored = census()
+    index = {
+        "EP1": {"id": 1, **stored[0]},
+        "EP2": {"id": 2, **stored[1], etl.FINGERPRINT_FIELD: "stale"},
+    }
+    incoming = census() + [{**census()[0]}, {**census()[2], etl.CENSO_KEY: ""}]
+
+    creates, updates, unchanged, errors = etl.partition_censo(incoming, index)
+
+    assert [pac[etl.CENSO_KEY] for pac in creates] == ["EP3"]
+    assert [(record_id, pac[etl.CENSO_KEY]) for record_id, pac in updates] == [(2, "EP2")]
+    assert [(existing["id"], pac[etl.CENSO_KEY]) for existing, pac in unchanged] == [(1, "EP1")]
+    assert errors == 1  # the row without id_episodio; the repeated EP1 is dropped with a warning
+
+
+def test_rerun_with_the_same_census_writes_nothing():
+    server = FakeCensus()
+    assert etl.load_to_nocobase(server, census()) == (3, 0, 0, 0)
+    server.writes.clear()
+
+    assert etl.load_to_nocobase(server, census()) == (0, 0, 3, 0)
+    assert server.writes == []
+
+
+def test_only_changed_rows_are_written():
+    server = FakeCensus()
+    etl.load_to_nocobase(server, census())
+    server.writes.clear()
+    changed = census()
+    changed[1] = etl.transform_paciente({**RAW[1], "dx_principal": "Fractura expuesta"})
+
+    assert etl.load_to_nocobase(server, changed) == (0, 1, 2, 0)
+    assert server.writes == [("update", [2])]
+    assert server.records[2]["dx_principal"] == "Fractura expuesta"
+
+
+def test_day_rollover_refreshes_only_the_rows_whose_days_changed():
+    server = FakeCensus()
+    etl.load_to_nocobase(server, census())
+    server.records[1]["dias_hospitalizacion"] -= 1
+    server.records[3]["dias_hospitalizacion"] -= 1
+    server.writes.clear()
+
+    assert etl.load_to_nocobase(server, census()) == (0, 0, 3, 0)
+    expected_days = {server.records[1]["dias_hospitalizacion"], server.records[3]["dias_hospitalizacion"]}
+    assert len(server.writes) == len(expected_days)
+    assert sorted(i for _, ids, _ in server.writes for i in ids) == [1, 3]
+    assert all(fields == ["dias_hospitalizacion", "ultima_sync"] for _, _, fields in server.writes)